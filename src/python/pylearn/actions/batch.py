@@ -0,0 +1,140 @@
+import argparse
+import shlex
+import sys
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Iterable
+
+from ..cli import build_parser, dispatch
+from ..db import get_connection, grouped
+
+# Commands committed together per group. Larger groups amortise more commits;
+# interrupting a batch rolls back only the group in progress.
+BATCH_GROUP_SIZE = 500
+# Commands that only touch the database through `with get_connection()`
+# blocks. Anything else (ingest, snapshots, katas) manages its own
+# transactions, so the open group is committed before it runs.
+GROUPED_COMMANDS = {"list", "show", "status", "progress", "search"}
+NESTED_COMMANDS = {"shell", "batch"}
+
+
+def _quiet_parser() -> argparse.ArgumentParser:
+    """
+    build_parser(), but a bad line raises ValueError instead of printing the
+    usage and exiting, so one typo does not end the session.
+    """
+    parser = build_parser()
+
+    def error(message: str):
+        raise ValueError(message)
+
+    parser.error = error
+    return parser
+
+
+def parse_line(parser: argparse.ArgumentParser, line: str) -> argparse.Namespace | None:
+    """
+    One command line as the CLI would parse it, or None for a blank or
+    comment line. A leading `pylearn` is optional. Raises ValueError for a
+    line that is not a valid command.
+    """
+    argv = shlex.split(line, comments=True)
+    if argv and argv[0] == "pylearn":
+        argv = argv[1:]
+    if not argv:
+        return None
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit:
+        # --help prints and exits; nothing to run.
+        return None
+    if args.command in NESTED_COMMANDS:
+        raise ValueError(f"'{args.command}' cannot run inside a shell or batch")
+    return args
+
+
+def run_commands(lines: Iterable[str], group_size: int = BATCH_GROUP_SIZE) -> tuple[int, int]:
+    """
+    Run each line through the CLI dispatch on one connection, so the
+    statement cache and name indexes stay warm. Runs of GROUPED_COMMANDS
+    commit together, up to `group_size` at a time; a command that fails only
+    rolls back its own writes. Returns (commands run, lines that failed).
+    """
+    parser = _quiet_parser()
+    db = get_connection()
+    ran = failed = pending = 0
+    with ExitStack() as group:
+        for lineno, line in enumerate(lines, 1):
+            try:
+                args = parse_line(parser, line)
+            except ValueError as exc:
+                print(f"❌ line {lineno}: {exc}")
+                failed += 1
+                continue
+            if args is None:
+                continue
+
+            groupable = args.command in GROUPED_COMMANDS
+            if pending and (not groupable or pending >= group_size):
+                group.close()
+                pending = 0
+            if groupable and not pending:
+                group.enter_context(grouped(db))
+
+            try:
+                dispatch(args)
+            except Exception as exc:
+                print(f"❌ line {lineno}: {exc}")
+                failed += 1
+            ran += 1
+            pending += groupable
+    return ran, failed
+
+
+def run_batch(source: str = "-") -> None:
+    """
+    Run the commands in file `source`, one per line (`-` reads stdin).
+    """
+    if source == "-":
+        ran, failed = run_commands(sys.stdin)
+    else:
+        path = Path(source)
+        if not path.is_file():
+            print(f"❌ Batch file not found: {path}")
+            return
+        with path.open(encoding="utf-8") as f:
+            ran, failed = run_commands(f)
+    print(f"✅ Batch complete: {ran} commands run, {failed} failed.")
+
+
+def shell() -> None:
+    """
+    Read commands interactively and run each as it is entered, committing
+    after every command. `exit`, `quit` or Ctrl-D leaves.
+    """
+    try:
+        import readline  # noqa: F401  (line editing and history for input())
+    except ImportError:
+        pass
+
+    parser = _quiet_parser()
+    print("pylearn shell: enter commands without the `pylearn` prefix; `exit` to leave.")
+    while True:
+        try:
+            line = input("pylearn> ")
+        except EOFError:
+            print()
+            return
+        except KeyboardInterrupt:
+            print()
+            continue
+        if line.strip() in ("exit", "quit"):
+            return
+        try:
+            args = parse_line(parser, line)
+            if args is not None:
+                dispatch(args)
+        except KeyboardInterrupt:
+            print()
+        except Exception as exc:
+            print(f"❌ {exc}")
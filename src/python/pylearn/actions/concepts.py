@@ -1,11 +1,32 @@
 from ..db import get_connection
+from .name_resolver import resolve_trackable
+from .output import Page, write_rows
 
-def show_concept(concept_name: str, language: str | None = None):
+
+def _render_example(i: int, row: tuple) -> str:
+    lang, concept, code, explanation = row
+    return "\n".join([
+        f"\n=== [{i}] {concept} in {lang} ===",
+        "-------- CODE --------",
+        code,
+        "----- EXPLANATION ----",
+        explanation or "(no explanation yet)",
+        "----------------------",
+    ])
+
+
+def show_concept(concept_name: str, language: str | None = None, page: Page = Page(), fmt: str = "text"):
     """
     Show examples for a given concept or kata trackable, optionally filtered by language.
 
     Uses examples.language_trackable_id / concept_trackable_id joined to trackables.
+    A mistyped name is corrected when one concept or kata clearly matches.
+    Examples are streamed; `page` takes --limit and --offset.
     """
+    with get_connection() as db:
+        concept_name = resolve_trackable(db, concept_name, ("concept", "kata"), "concept or kata")
+    if concept_name is None:
+        return
     params: list[str] = [concept_name]
 
     query = """
@@ -28,19 +49,17 @@ def show_concept(concept_name: str, language: str | None = None):
         query += " AND l.name = ?"
         params.append(language)
 
-    query += " ORDER BY l.name"
+    limit, limit_params = page.clause()
+    query += " ORDER BY l.name, e.id" + limit
 
     with get_connection() as db:
-        rows = db.execute(query, tuple(params)).fetchall()
+        cursor = db.execute(query, (*params, *limit_params))
+        count, _ = write_rows(
+            cursor,
+            ("language", "concept", "code", "explanation"),
+            fmt,
+            lambda i, row: _render_example(page.offset + i, row),
+        )
 
-    if not rows:
+    if not count and fmt == "text":
         print("No examples found for that concept (and language, if specified).")
-        return
-
-    for i, (lang, concept, code, explanation) in enumerate(rows, start=1):
-        print(f"\n=== [{i}] {concept} in {lang} ===")
-        print("-------- CODE --------")
-        print(code)
-        print("----- EXPLANATION ----")
-        print(explanation or "(no explanation yet)")
-        print("----------------------")
@@ -0,0 +1,203 @@
+"""
+History of passing kata attempts and their measured cost.
+
+Every passing submission is recorded in `solution_attempts` with its test-run
+usage and, when the kata has a benchmark spec, the benchmark's input-size
+profile. An attempt's cost is its projected benchmark time at the spec's
+largest size; katas without a spec fall back to the test run's CPU time.
+Attempts are only compared against attempts measured the same way.
+"""
+from __future__ import annotations
+
+import json
+
+from ...config import REGRESSION_MARGIN
+from ...db import get_connection
+from .bench import kata_language_ids, print_benchmark, run_benchmark, store_benchmark
+from .limits import ResourceLimits
+from .results import KataResult
+
+
+def _cost_column(runtime_seconds: float | None) -> str:
+    return "runtime_seconds" if runtime_seconds is not None else "cpu_seconds"
+
+
+def best_attempt(db, kata_id: int, language_id: int, column: str, before_id: int | None = None):
+    """
+    (id, cost, created_at) of the cheapest attempt by `column`, optionally
+    only among attempts older than `before_id`.
+    """
+    query = f"""
+        SELECT id, {column}, created_at
+        FROM solution_attempts
+        WHERE kata_trackable_id = ? AND language_trackable_id = ?
+          AND {column} IS NOT NULL
+    """
+    params: list[int] = [kata_id, language_id]
+    if before_id is not None:
+        query += " AND id < ?"
+        params.append(before_id)
+    query += f" ORDER BY {column}, id LIMIT 1"
+    return db.execute(query, params).fetchone()
+
+
+def is_regression(cost: float, best_cost: float, margin: float = REGRESSION_MARGIN) -> bool:
+    return cost > best_cost * (1 + margin)
+
+
+def record_attempt(
+    kata_name: str,
+    language: str,
+    user_code: str,
+    test_result: KataResult,
+    limits: ResourceLimits | None = None,
+    margin: float = REGRESSION_MARGIN,
+) -> int | None:
+    """
+    Store a passing attempt, benchmarking it first when the kata has a spec,
+    and warn when it is slower than the best earlier attempt by more than
+    `margin` (a fraction: 0.2 means 20% slower).
+
+    Returns the attempt id, or None if the kata or language has no trackable.
+    """
+    bench = run_benchmark(kata_name, user_code, limits) if language.lower() == "python" else None
+    if bench is not None:
+        print_benchmark(bench)
+        benchmark_id = store_benchmark(kata_name, language, user_code, bench) if bench.reason is None else None
+        runtime = bench.projected_seconds if bench.reason is None else None
+        profile = json.dumps(bench.points) if bench.points else None
+    else:
+        benchmark_id = runtime = profile = None
+
+    with get_connection() as db:
+        ids = kata_language_ids(db, kata_name, language)
+        if not ids:
+            print("⚠️ Could not find trackable entries for kata or language; attempt not recorded.")
+            return None
+        kata_id, language_id = ids
+
+        cursor = db.execute(
+            """
+            INSERT INTO solution_attempts
+                (kata_trackable_id, language_trackable_id, code_snippet, runtime_seconds,
+                 test_seconds, cpu_seconds, peak_rss_kb, profile, benchmark_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                kata_id,
+                language_id,
+                user_code,
+                runtime,
+                test_result.duration,
+                test_result.cpu_seconds,
+                test_result.peak_rss_kb,
+                profile,
+                benchmark_id,
+            ),
+        )
+        attempt_id = cursor.lastrowid
+
+        column = _cost_column(runtime)
+        cost = runtime if runtime is not None else test_result.cpu_seconds
+        best = best_attempt(db, kata_id, language_id, column, before_id=attempt_id)
+
+    if cost is None or best is None:
+        print("📝 Attempt recorded (first measured attempt for this kata).")
+    elif is_regression(cost, best[1], margin):
+        print(
+            f"⚠️ Slower than your best attempt #{best[0]} ({best[2]}): "
+            f"{_format_cost(cost, column)} vs {_format_cost(best[1], column)} "
+            f"(+{(cost / best[1] - 1) * 100:.0f}%, margin {margin * 100:.0f}%)."
+        )
+    elif cost < best[1]:
+        print(f"🏆 New best: {_format_cost(cost, column)} (was {_format_cost(best[1], column)}).")
+    else:
+        print(f"📝 Attempt recorded: {_format_cost(cost, column)} (best {_format_cost(best[1], column)}).")
+    return attempt_id
+
+
+def _format_cost(seconds: float, column: str) -> str:
+    unit = "bench" if column == "runtime_seconds" else "cpu"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms {unit}"
+    return f"{seconds:.2f} s {unit}"
+
+
+# Cheapest attempt per kata and language by `column`, as (id, cost,
+# created_at) columns prefixed with the column name.
+_BEST_BY = """
+    {column} AS (
+        SELECT kata_trackable_id, language_trackable_id, id, {column}, created_at,
+               ROW_NUMBER() OVER (
+                   PARTITION BY kata_trackable_id, language_trackable_id
+                   ORDER BY {column}, id
+               ) AS rank
+        FROM solution_attempts
+        WHERE {column} IS NOT NULL
+    )
+"""
+
+
+def _best_join(column: str) -> str:
+    return f"""
+        LEFT JOIN {column}
+          ON {column}.kata_trackable_id = g.kata_trackable_id
+         AND {column}.language_trackable_id = g.language_trackable_id
+         AND {column}.rank = 1
+    """
+
+
+def show_perf_status(margin: float = REGRESSION_MARGIN) -> None:
+    """
+    Fastest attempt per kata and language, with the latest attempt flagged when
+    it is slower than that best by more than `margin`.
+
+    One query returns, per kata and language, the latest attempt and the best
+    attempt by both measures; the latest attempt's measure picks which best
+    applies.
+    """
+    with get_connection() as db:
+        rows = db.execute(
+            f"""
+            WITH groups AS (
+                SELECT kata_trackable_id, language_trackable_id, COUNT(*) AS attempts, MAX(id) AS latest_id
+                FROM solution_attempts
+                GROUP BY kata_trackable_id, language_trackable_id
+            ),
+            {_BEST_BY.format(column="runtime_seconds")},
+            {_BEST_BY.format(column="cpu_seconds")}
+            SELECT k.name, l.name, g.attempts, g.latest_id,
+                   latest.runtime_seconds, latest.cpu_seconds,
+                   runtime_seconds.id, runtime_seconds.runtime_seconds, runtime_seconds.created_at,
+                   cpu_seconds.id, cpu_seconds.cpu_seconds, cpu_seconds.created_at
+            FROM groups g
+            JOIN solution_attempts latest ON latest.id = g.latest_id
+            JOIN trackables AS k ON k.id = g.kata_trackable_id
+            JOIN trackables AS l ON l.id = g.language_trackable_id
+            {_best_join("runtime_seconds")}
+            {_best_join("cpu_seconds")}
+            ORDER BY k.name, l.name
+            """
+        ).fetchall()
+
+    if not rows:
+        print("No solution attempts recorded yet.")
+        return
+
+    for kata_name, language, count, latest_id, runtime, cpu, *bests in rows:
+        column = _cost_column(runtime)
+        cost = runtime if runtime is not None else cpu
+        best = bests[:3] if column == "runtime_seconds" else bests[3:]
+
+        line = f"[kata] {kata_name} ({language}): {count} attempt{'s' if count != 1 else ''}"
+        if best[0] is None or cost is None:
+            print(f"{line}, no measurements")
+            continue
+        line += f", best #{best[0]} {_format_cost(best[1], column)} ({best[2]})"
+        if is_regression(cost, best[1], margin):
+            print(
+                f"{line}\n   ⚠️ latest #{latest_id} {_format_cost(cost, column)} "
+                f"is {(cost / best[1] - 1) * 100:.0f}% slower"
+            )
+        else:
+            print(line)
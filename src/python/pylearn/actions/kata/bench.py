@@ -0,0 +1,239 @@
+"""
+Empirical performance benchmarks for Python kata solutions.
+
+A kata opts in with a spec module at BENCH_DIR / bench_<kata>.py:
+
+    ENTRY_POINT = "binary_search"      # function in katas.<kata>
+    EXPECTED = "O(log n)"              # key of COMPLEXITY_EXPONENTS
+    SIZES = [2**k for k in range(10, 21)]   # optional
+
+    def make_args(n):                  # fresh arguments for one call at size n
+        ...
+        return (target, arr)
+
+The solution is timed at each size (after warmup, median of repeats), a
+power law t ~ n**k is fitted over the sizes, and the run is flagged when k
+exceeds what EXPECTED allows.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import importlib
+import importlib.util
+import json
+import math
+import multiprocessing
+import os
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from types import ModuleType
+from typing import Any, Dict, List
+
+from ...config import BENCH_DIR
+from ...db import get_connection
+from .limits import LimitExceeded, ResourceLimits, enforce_limits
+from .solution_loader import install_solution
+
+# Largest exponent each complexity class may show before a run is flagged.
+# Logarithmic curves are never flat in practice (cache misses grow with n).
+COMPLEXITY_EXPONENTS = {
+    "O(1)": 0.0,
+    "O(log n)": 0.25,
+    "O(n)": 1.0,
+    "O(n log n)": 1.0,
+    "O(n^2)": 2.0,
+    "O(n^3)": 3.0,
+}
+EXPONENT_TOLERANCE = 0.35
+
+DEFAULT_SIZES = [2**k for k in range(6, 17)]
+WARMUP = 1
+REPEATS = 5
+# Stop growing n once one call takes this long; the curve is clear by then.
+MAX_CALL_SECONDS = 0.25
+
+
+@dataclass
+class BenchResult:
+    kata_name: str
+    expected: str
+    points: List[List[float]] = field(default_factory=list)  # [n, median seconds]
+    exponent: float | None = None
+    flagged: bool = False
+    reason: str | None = None
+    max_size: int | None = None
+    # Time at max_size, extrapolated along the fitted curve when measuring
+    # stopped early; comparable across attempts at the same kata.
+    projected_seconds: float | None = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def spec_path(kata_name: str):
+    return BENCH_DIR / f"bench_{kata_name}.py"
+
+
+def load_spec(kata_name: str) -> ModuleType | None:
+    path = spec_path(kata_name)
+    if not path.exists():
+        return None
+    spec = importlib.util.spec_from_file_location(f"bench_{kata_name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def fit_exponent(points: List[List[float]]) -> float | None:
+    """
+    Least-squares slope of log(t) against log(n).
+    """
+    usable = [(math.log(n), math.log(t)) for n, t in points if t > 0]
+    if len(usable) < 3:
+        return None
+    xs, ys = zip(*usable)
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+def measure(func, make_args, sizes: List[int]) -> List[List[float]]:
+    points: List[List[float]] = []
+    for n in sizes:
+        for _ in range(WARMUP):
+            func(*make_args(n))
+        timings = []
+        for _ in range(REPEATS):
+            args = make_args(n)  # built outside the timed region
+            start = time.perf_counter()
+            func(*args)
+            timings.append(time.perf_counter() - start)
+        median = statistics.median(timings)
+        points.append([n, median])
+        if median > MAX_CALL_SECONDS:
+            break
+    return points
+
+
+def _bench_child(kata_name: str, user_code: str, limits: ResourceLimits, conn) -> None:
+    result = BenchResult(kata_name=kata_name, expected="")
+    try:
+        spec = load_spec(kata_name)
+        result.expected = spec.EXPECTED
+        enforce_limits(limits)
+        install_solution(kata_name, user_code)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            module = importlib.import_module(f"katas.{kata_name}")
+            func = getattr(module, spec.ENTRY_POINT)
+            sizes = getattr(spec, "SIZES", DEFAULT_SIZES)
+            result.max_size = max(sizes)
+            result.points = measure(func, spec.make_args, sizes)
+    except (LimitExceeded, MemoryError) as exc:
+        result.reason = exc.reason if isinstance(exc, LimitExceeded) else "out of memory"
+    except BaseException as exc:
+        result.reason = f"{type(exc).__name__}: {exc}"
+    conn.send(result.to_dict())
+    conn.close()
+
+
+def run_benchmark(
+    kata_name: str,
+    user_code: str,
+    limits: ResourceLimits | None = None,
+) -> BenchResult | None:
+    """
+    Benchmark `user_code` in a forked child under `limits`. Returns None when
+    the kata has no benchmark spec.
+    """
+    if not spec_path(kata_name).exists():
+        return None
+    limits = limits or ResourceLimits()
+
+    ctx = multiprocessing.get_context("fork")
+    receiver, sender = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_bench_child, args=(kata_name, user_code, limits, sender))
+    proc.start()
+    sender.close()
+
+    wait = limits.wall_seconds + 5 if limits.wall_seconds else None
+    data = receiver.recv() if receiver.poll(wait) else None
+    if data is None and proc.is_alive():
+        proc.kill()
+    proc.join()
+
+    if data is None:
+        return BenchResult(kata_name=kata_name, expected="", reason="killed")
+    result = BenchResult(**data)
+
+    if result.reason is None and result.points:
+        result.exponent = fit_exponent(result.points)
+        allowed = COMPLEXITY_EXPONENTS.get(result.expected)
+        if result.exponent is not None and allowed is not None:
+            result.flagged = result.exponent > allowed + EXPONENT_TOLERANCE
+        last_n, last_seconds = result.points[-1]
+        growth = max(result.exponent or 0.0, 0.0)
+        result.projected_seconds = last_seconds * (result.max_size / last_n) ** growth
+    return result
+
+
+def kata_language_ids(db, kata_name: str, language: str) -> tuple[int, int] | None:
+    return db.execute(
+        """
+        SELECT k.id, l.id
+        FROM trackables AS k, trackables AS l
+        WHERE k.name = ? AND k.type = 'kata'
+          AND LOWER(l.name) = ? AND l.type = 'language'
+        """,
+        (kata_name, language.lower()),
+    ).fetchone()
+
+
+def store_benchmark(kata_name: str, language: str, user_code: str, result: BenchResult) -> int | None:
+    """
+    Persist a benchmark run; returns its id, or None if the kata or language
+    has no trackable.
+    """
+    with get_connection() as db:
+        row = kata_language_ids(db, kata_name, language)
+        if not row:
+            print("⚠️ Could not find trackable entries for kata or language; benchmark not stored.")
+            return None
+
+        cursor = db.execute(
+            """
+            INSERT INTO kata_benchmarks
+                (kata_trackable_id, language_trackable_id, code_hash, expected, exponent, flagged, profile)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                row[0],
+                row[1],
+                hashlib.sha256(user_code.encode()).hexdigest(),
+                result.expected,
+                result.exponent,
+                int(result.flagged),
+                json.dumps(result.points),
+            ),
+        )
+        return cursor.lastrowid
+
+
+def print_benchmark(result: BenchResult) -> None:
+    print(f"\n📈 Benchmark for '{result.kata_name}' (expected {result.expected or '?'})")
+    for n, seconds in result.points:
+        print(f"  n={int(n):>9}  {seconds * 1e6:12.1f} µs")
+    if result.reason:
+        print(f"❌ Benchmark stopped: {result.reason}")
+        return
+    if result.exponent is None:
+        print("ℹ️ Not enough sizes to fit a growth curve.")
+        return
+    print(f"  fitted: t ~ n^{result.exponent:.2f}")
+    if result.flagged:
+        print(f"⚠️ Grows faster than {result.expected}; look for a nested loop or repeated slicing.")
+    else:
+        print(f"✅ Consistent with {result.expected}.")
@@ -1,12 +1,49 @@
 from __future__ import annotations
 
-from ...config import KATAS_DIR
+from ...config import KATAS_DIR, PYTHON_KATAS_DIR, TESTS_DIR
 from ...db import get_connection
 from ...editor import open_editor
+from ..name_resolver import TrigramIndex, resolve_name, trackable_index
+from .attempts import record_attempt
+from .limits import ResourceLimits
 from .test_runner import run_tests
 from ..trackables import update_progress
 
 
+def kata_names() -> list[str]:
+    """
+    Katas with instructions in KATAS_DIR, as the dojo offers them.
+    """
+    return sorted(
+        [p.stem for p in KATAS_DIR.glob("*.md") if p.name not in {"index.md"}],
+        key=str.lower,
+    )
+
+
+def runnable_kata_names() -> set[str]:
+    """
+    Katas that can be run: those with a test file in TESTS_DIR or a module
+    in PYTHON_KATAS_DIR. Their names need not match the instruction files.
+    """
+    tests = {p.stem[len("test_"):] for p in TESTS_DIR.glob("test_*.py")}
+    modules = {p.stem for p in PYTHON_KATAS_DIR.glob("*.py") if p.name != "__init__.py"}
+    return tests | modules
+
+
+def resolve_kata(kata_name: str) -> str | None:
+    """
+    `kata_name`, corrected if it is a clear typo of a known kata (one with
+    instructions, a test file, a solution module or a kata trackable). None,
+    with suggestions printed, if nothing matches. With no katas known at all
+    the name is passed through.
+    """
+    with get_connection() as db:
+        names = {*kata_names(), *runnable_kata_names(), *trackable_index(db, ("kata",)).names}
+    if not names:
+        return kata_name
+    return resolve_name(kata_name, TrigramIndex(names), "kata")
+
+
 def fetch_previous_solution(kata_name: str, language: str) -> str | None:
     with get_connection() as db:
         cursor = db.execute(
@@ -132,9 +169,11 @@ def run_kata_once(
     kata_name: str,
     language: str,
     initial_buffer: str,
+    limits: ResourceLimits | None = None,
 ) -> tuple[bool, str]:
     """
-    Open the editor with `initial_buffer`, then run tests on the result.
+    Open the editor with `initial_buffer`, then run tests on the result
+    under `limits`.
 
     Returns (success, final_code).
     """
@@ -142,14 +181,15 @@ def run_kata_once(
     user_code = open_editor(initial_buffer, suffix=".py")
 
     print("\nRunning tests...")
-    success = run_tests(kata_name, language, user_code)
+    result = run_tests(kata_name, language, user_code, limits)
 
-    if success:
+    if result.passed:
         print("✅ Success! Storing your solution.")
         store_successful_solution(kata_name, language, user_code)
+        record_attempt(kata_name, language, user_code, result, limits)
         update_progress(kata_name, "kata", "mastered")
 
-    return success, user_code
+    return result.passed, user_code
 def get_kata_instructions(kata_name: str) -> str:
     path = KATAS_DIR / f"{kata_name}.md"
     if not path.exists():
@@ -1,11 +1,9 @@
-from ...config import KATAS_DIR
-from .common import build_initial_buffer, fetch_previous_solution, run_kata_once
+from ..name_resolver import TrigramIndex, resolve_name
+from .common import build_initial_buffer, fetch_previous_solution, kata_names, run_kata_once
+from .limits import ResourceLimits
 
 def _choose_kata() -> str | None:
-    katas = sorted(
-        [p.stem for p in KATAS_DIR.glob("*.md") if p.name not in {"index.md"}],
-        key=str.lower,
-    )
+    katas = kata_names()
 
     if not katas:
         print("❌ No katas found in KATAS_DIR.")
@@ -28,10 +26,11 @@ def _choose_kata() -> str | None:
             print("⚠️ Invalid index. Try again.")
             continue
 
-        if choice in katas:
-            return choice
+        kata = resolve_name(choice, TrigramIndex(katas), "kata")
+        if kata is not None:
+            return kata
 
-        print("⚠️ Not a valid kata. Try again.")
+        print("⚠️ Try again.")
 
 
 def _choose_language() -> str | None:
@@ -62,7 +61,7 @@ def _choose_language() -> str | None:
         print("⚠️ Not a valid language. Try again.")
 
 
-def enter_dojo() -> None:
+def enter_dojo(limits: ResourceLimits | None = None) -> None:
     """
     Interactive kata loop:
 
@@ -99,6 +98,7 @@ def enter_dojo() -> None:
             kata_name=kata_name,
             language=language,
             initial_buffer=current_buffer,
+            limits=limits,
         )
 
         if success:
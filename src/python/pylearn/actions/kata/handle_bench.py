@@ -0,0 +1,47 @@
+from ...config import BENCH_DIR, PYTHON_KATAS_DIR
+from .bench import print_benchmark, run_benchmark, store_benchmark
+from .common import fetch_previous_solution
+from .limits import ResourceLimits
+
+
+def _solution_for(kata_name: str, language: str, file: bool) -> str | None:
+    if file:
+        path = PYTHON_KATAS_DIR / f"{kata_name}.py"
+        return path.read_text() if path.exists() else None
+    return fetch_previous_solution(kata_name, language)
+
+
+def handle_bench(
+    kata_name: str | None,
+    language: str,
+    file: bool = False,
+    limits: ResourceLimits | None = None,
+) -> None:
+    """
+    Benchmark the stored successful solution (or, with `file`, the canonical
+    src/python/katas/<kata>.py) of one kata, or of every kata with a spec.
+    """
+    language = language.lower()
+    if language != "python":
+        print("Only supporting python at this time")
+        return
+
+    if kata_name:
+        kata_names = [kata_name]
+    else:
+        kata_names = sorted(p.stem.removeprefix("bench_") for p in BENCH_DIR.glob("bench_*.py"))
+
+    for name in kata_names:
+        code = _solution_for(name, language, file)
+        if not code:
+            print(f"ℹ️ No solution to benchmark for '{name}'.")
+            continue
+
+        result = run_benchmark(name, code, limits)
+        if result is None:
+            print(f"ℹ️ No benchmark spec for '{name}' (expected {BENCH_DIR / f'bench_{name}.py'}).")
+            continue
+
+        print_benchmark(result)
+        if not file and result.reason is None:
+            store_benchmark(name, language, code, result)
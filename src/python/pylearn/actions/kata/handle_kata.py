@@ -1,5 +1,6 @@
 from ...config import KATAS_DIR
-from .common import build_initial_buffer, fetch_previous_solution, run_kata_once
+from .common import build_initial_buffer, fetch_previous_solution, resolve_kata, run_kata_once
+from .limits import ResourceLimits
 
 
 def get_kata_code(kata_name: str, language: str) -> str:
@@ -22,7 +23,12 @@ def handle_kata(
     language: str,
     file: bool = False,
     answer: bool = False,
+    limits: ResourceLimits | None = None,
 ):
+    kata_name = resolve_kata(kata_name)
+    if kata_name is None:
+        return
+
     if answer:
         prev = fetch_previous_solution(kata_name, language)
         if prev:
@@ -55,6 +61,7 @@ def handle_kata(
         kata_name=kata_name,
         language=language,
         initial_buffer=buffer_content,
+        limits=limits,
     )
 
     if not success:
@@ -1,8 +1,7 @@
 from pathlib import Path
-from ...config import LANGUAGES_ROOT, PROJECT_ROOT
+from ...config import KATAS_DIR, LANGUAGES_ROOT
 
-if PROJECT_ROOT is not None:
-    README_KATAS_DIR = PROJECT_ROOT / "README" / "katas"
+README_KATAS_DIR = KATAS_DIR
 
 def ensure_dir(path: Path):
     path.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import resource
+import signal
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+from ...config import KATA_CPU_LIMIT, KATA_MEMORY_LIMIT_MB, KATA_TIMEOUT
+
+# Once the wall limit trips, SIGALRM repeats this often until the timer is
+# cancelled, so code that swallows one LimitExceeded (an xfail test, a bare
+# `except BaseException`) is interrupted again instead of running unbounded.
+WALL_REARM_SECONDS = 0.5
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """
+    Limits for one kata test run. A value of None (or 0) disables that limit.
+
+    - wall_seconds: elapsed time before the run is stopped ("timed out")
+    - cpu_seconds:  RLIMIT_CPU for the test process ("cpu limit exceeded")
+    - memory_mb:    RLIMIT_AS for the test process ("out of memory")
+    """
+
+    wall_seconds: float | None = KATA_TIMEOUT
+    cpu_seconds: int | None = KATA_CPU_LIMIT
+    memory_mb: int | None = KATA_MEMORY_LIMIT_MB
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResourceLimits":
+        return cls(**data)
+
+
+class LimitExceeded(BaseException):
+    """
+    Raised inside the test process when a limit trips. Derives from
+    BaseException so user code's `except Exception` cannot swallow it.
+    """
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+# Reason of the last limit that tripped in this process, for runs where the
+# exception surfaced outside a test and never reached a report.
+_tripped_reason: str | None = None
+
+
+def _raise_limit(reason: str):
+    def handler(signum, frame):
+        global _tripped_reason
+        _tripped_reason = reason
+        raise LimitExceeded(reason)
+
+    return handler
+
+
+def tripped_reason() -> str | None:
+    return _tripped_reason
+
+
+def limit_reason(excinfo) -> str | None:
+    """
+    Failure reason for a pytest ExceptionInfo caused by a resource limit.
+    """
+    if excinfo.errisinstance(LimitExceeded):
+        return excinfo.value.reason
+    if excinfo.errisinstance(MemoryError):
+        return "out of memory"
+    return None
+
+
+def enforce_limits(limits: ResourceLimits) -> None:
+    """
+    Apply `limits` to the current process. Only call this in a process that
+    exists for a single run (a forked worker child or a pytest subprocess):
+    rlimits cannot be raised again afterwards.
+    """
+    if limits.memory_mb:
+        limit = limits.memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    if limits.cpu_seconds:
+        used = resource.getrusage(resource.RUSAGE_SELF)
+        soft = int(used.ru_utime + used.ru_stime) + limits.cpu_seconds
+        # SIGXCPU at the soft limit lets us report; the kernel kills at the hard one.
+        signal.signal(signal.SIGXCPU, _raise_limit("cpu limit exceeded"))
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, soft + 2))
+
+    if limits.wall_seconds:
+        signal.signal(signal.SIGALRM, _raise_limit("timed out"))
+        signal.setitimer(signal.ITIMER_REAL, limits.wall_seconds, WALL_REARM_SECONDS)
+
+
+def cancel_wall_timer() -> None:
+    signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def measure_usage() -> tuple[float, int]:
+    """
+    (CPU seconds, peak RSS in KiB) used by the current process so far.
+    """
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime, usage.ru_maxrss
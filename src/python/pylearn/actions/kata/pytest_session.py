@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from ...config import PROJECT_ROOT
+from .limits import (
+    LimitExceeded,
+    ResourceLimits,
+    cancel_wall_timer,
+    enforce_limits,
+    limit_reason,
+    measure_usage,
+    tripped_reason,
+)
+from .results import KataResult
+from .solution_loader import install_solution
+
+# Set by run_kata_tests when it launches pytest as a subprocess: the file
+# descriptor the child writes its outcome summary to, and the limits to
+# enforce on itself (JSON-encoded ResourceLimits).
+RESULT_FD_ENV = "PYLEARN_RESULT_FD"
+LIMITS_ENV = "PYLEARN_LIMITS"
+
+
+def _failure_line(report) -> str:
+    lines = [line.strip() for line in report.longreprtext.splitlines() if line.strip()]
+    errors = [line for line in lines if line.startswith("E ")]
+    if errors:
+        return " ".join(errors[0][1:].split())
+    return lines[-1] if lines else report.outcome
+
+
+class ResultCollector:
+    """
+    pytest plugin that tallies test outcomes so a run can be reported as a
+    KataResult instead of a bare exit code.
+    """
+
+    def __init__(self) -> None:
+        self.outcomes: Counter[str] = Counter()
+        self.failures: list[str] = []
+        self.reason: str | None = None
+
+    def pytest_sessionstart(self, session) -> None:
+        self.session = session
+
+    def _stop(self, reason: str) -> None:
+        # A tripped limit would trip again on every remaining test.
+        self.reason = self.reason or reason
+        self.session.shouldstop = reason
+
+    def pytest_exception_interact(self, node, call, report) -> None:
+        reason = limit_reason(call.excinfo)
+        if reason:
+            self._stop(reason)
+
+    def pytest_collectreport(self, report) -> None:
+        if report.failed:
+            self.outcomes["error"] += 1
+            self.failures.append(f"{report.nodeid or 'collection'}: {_failure_line(report)}")
+
+    def pytest_runtest_logreport(self, report) -> None:
+        # The LimitExceeded may never reach pytest_exception_interact: an
+        # xfail test reports it as an expected failure.
+        if tripped_reason():
+            if report.when == "teardown":
+                # This test is over and the session stops before the next.
+                cancel_wall_timer()
+            self._stop(tripped_reason())
+        if hasattr(report, "wasxfail"):
+            key = "xfailed" if report.skipped else "xpassed"
+        elif report.failed:
+            key = "failed" if report.when == "call" else "error"
+            self.failures.append(f"{report.nodeid}: {_failure_line(report)}")
+        elif report.skipped:
+            key = "skipped"
+        elif report.when == "call":
+            key = "passed"
+        else:
+            return
+        self.outcomes[key] += 1
+
+
+class _FdReporter(ResultCollector):
+    def __init__(self, fd: int, cpu_at_start: float) -> None:
+        super().__init__()
+        self.fd = fd
+        self.cpu_at_start = cpu_at_start
+
+    def pytest_sessionfinish(self, session, exitstatus) -> None:
+        cancel_wall_timer()
+        cpu_seconds, peak_rss_kb = measure_usage()
+        summary = {
+            "outcomes": dict(self.outcomes),
+            "failures": self.failures,
+            "reason": self.reason or tripped_reason(),
+            "cpu_seconds": cpu_seconds - self.cpu_at_start,
+            "peak_rss_kb": peak_rss_kb,
+        }
+        with os.fdopen(self.fd, "w") as out:
+            json.dump(summary, out)
+
+
+def pytest_configure(config) -> None:
+    cpu_at_start, _ = measure_usage()
+    limits = os.environ.get(LIMITS_ENV)
+    if limits:
+        enforce_limits(ResourceLimits.from_dict(json.loads(limits)))
+    fd = os.environ.get(RESULT_FD_ENV)
+    if fd:
+        config.pluginmanager.register(_FdReporter(int(fd), cpu_at_start), "pylearn-result-reporter")
+
+
+def run_pytest_in_process(
+    kata_name: str,
+    user_code: str,
+    test_file: Path,
+    limits: ResourceLimits | None = None,
+) -> KataResult:
+    """
+    Run the kata's test module inside the current interpreter, under `limits`.
+
+    Meant to be called in a throwaway (forked) process: the solution finder,
+    the imported test module and the rlimits are all left behind.
+    """
+    import pytest
+
+    start = time.perf_counter()
+    try:
+        install_solution(kata_name, user_code)
+    except SyntaxError as exc:
+        return KataResult(
+            kata_name=kata_name,
+            passed=False,
+            outcomes={"error": 1},
+            failures=[f"solution: {type(exc).__name__}: {exc}"],
+            duration=time.perf_counter() - start,
+        )
+
+    cpu_at_start, _ = measure_usage()
+    if limits:
+        enforce_limits(limits)
+
+    collector = ResultCollector()
+    buffer = io.StringIO()
+    exit_code = pytest.ExitCode.INTERNAL_ERROR
+    try:
+        with redirect_stdout(buffer):
+            exit_code = pytest.main(
+                [
+                    str(test_file),
+                    "--tb=short",
+                    "-p", "no:cacheprovider",
+                    # A forked run inherits the parent's faulthandler timer
+                    # lock but not its watchdog thread; re-arming it would hang.
+                    "-p", "no:faulthandler",
+                    f"--rootdir={PROJECT_ROOT}",
+                ],
+                plugins=[collector],
+            )
+    except LimitExceeded:
+        pass
+    finally:
+        cancel_wall_timer()
+
+    cpu_seconds, peak_rss_kb = measure_usage()
+    reason = collector.reason or tripped_reason()
+    return KataResult(
+        kata_name=kata_name,
+        passed=reason is None and exit_code == pytest.ExitCode.OK,
+        outcomes=dict(collector.outcomes),
+        failures=collector.failures,
+        duration=time.perf_counter() - start,
+        output=buffer.getvalue(),
+        reason=reason,
+        cpu_seconds=cpu_seconds - cpu_at_start,
+        peak_rss_kb=peak_rss_kb,
+    )
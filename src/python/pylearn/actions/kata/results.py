@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass
+class KataResult:
+    """
+    Structured outcome of one test run for a kata attempt.
+
+    `outcomes` counts pytest report outcomes (passed, failed, error, skipped,
+    xfailed, xpassed); `failures` holds one short line per failing test.
+    `reason` is set when the run did not finish normally ("timed out",
+    "cpu limit exceeded", "out of memory"). `cpu_seconds` and `peak_rss_kb`
+    describe the test process when it reported back.
+    """
+
+    kata_name: str
+    passed: bool
+    outcomes: Dict[str, int] = field(default_factory=dict)
+    failures: List[str] = field(default_factory=list)
+    duration: float = 0.0
+    output: str = ""
+    reason: str | None = None
+    cpu_seconds: float | None = None
+    peak_rss_kb: int | None = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KataResult":
+        return cls(**data)
+
+    def describe(self) -> str:
+        counts = ", ".join(f"{n} {k}" for k, n in sorted(self.outcomes.items()) if n)
+        if self.reason:
+            return f"{self.reason}; {counts}" if counts else self.reason
+        return counts or "no tests"
+
+    def usage(self) -> str:
+        parts = [f"{self.duration:.2f}s wall"]
+        if self.cpu_seconds is not None:
+            parts.append(f"{self.cpu_seconds:.2f}s cpu")
+        if self.peak_rss_kb is not None:
+            parts.append(f"{self.peak_rss_kb / 1024:.1f} MiB peak")
+        return ", ".join(parts)
+
+    def summary(self) -> str:
+        return f"{self.kata_name}: {'passed' if self.passed else 'failed'} ({self.describe()}) in {self.usage()}"
@@ -1,65 +1,175 @@
+import json
 import os
 import subprocess
+import time
+from pathlib import Path
 
-from ...config import PROJECT_ROOT
+from ...config import PACKAGE_ROOT, PROJECT_ROOT, PYTHON_KATAS_DIR, TESTS_DIR
+from .limits import ResourceLimits
+from .pytest_session import LIMITS_ENV, RESULT_FD_ENV
+from .results import KataResult
+from .solution_loader import KATA_NAME_ENV, KATA_SOURCE_ENV
+from .test_worker import request_run
 
-if PROJECT_ROOT:
-    TESTS_DIR = PROJECT_ROOT / "src" / "python" / "tests" / "katas"
-    KATAS_DIR = PROJECT_ROOT / "src" / "python" / "katas"
+# Directory that makes `pylearn` importable, so pytest can load our plugins.
+PYLEARN_IMPORT_ROOT = PACKAGE_ROOT
 
-    ANSWER_DIR = PROJECT_ROOT / "build" / "katas"
-    ANSWER_DIR.mkdir(parents=True, exist_ok=True)
-    (ANSWER_DIR / "__init__.py").touch()
+# Extra seconds the parent waits past the wall limit before killing pytest,
+# in case the child cannot deliver its own timeout (e.g. stuck in C code).
+KILL_GRACE_SECONDS = 5
 
-def run_python_tests(kata_name: str, user_code: str) -> bool:
-    """
-    Run pytest for a kata by writing `user_code` into build/katas/<kata_name>.py.
-    We then put `build/` on PYTHONPATH before src/python so that
-    `from katas.<kata_name> import ...` uses the shadow module.
-    """
-    test_file = TESTS_DIR / f"test_{kata_name}.py"
-    if not test_file.exists():
-        print(f"❌ No test file found at: {test_file}")
-        return False
 
-    solution_file = ANSWER_DIR / f"{kata_name}.py"
-    solution_file.write_text(user_code)
-
-    # Build PYTHONPATH: build/ first, then src/python, then whatever already exists
+def _pytest_env(kata_name: str, user_code: str) -> dict[str, str]:
     env = os.environ.copy()
 
-    if PROJECT_ROOT is None:
-        raise ValueError("Not at project root")
-
-    pythonpath_parts = [
-        str(ANSWER_DIR.parent),  # build/
-        str(PROJECT_ROOT / "src" / "python"),  # src/python
-    ]
+    # src/python first (for the real `katas` package), then pylearn itself
+    pythonpath_parts = [str(PYTHON_KATAS_DIR.parent)]
+    if str(PYLEARN_IMPORT_ROOT) not in pythonpath_parts:
+        pythonpath_parts.append(str(PYLEARN_IMPORT_ROOT))
     existing = env.get("PYTHONPATH")
     if existing:
         pythonpath_parts.append(existing)
     env["PYTHONPATH"] = os.pathsep.join(pythonpath_parts)
+    env[KATA_NAME_ENV] = kata_name
+    env[KATA_SOURCE_ENV] = user_code
+    return env
+
 
+def _run_pytest_subprocess(
+    kata_name: str,
+    user_code: str,
+    test_file: Path,
+    quiet: bool,
+    limits: ResourceLimits,
+) -> KataResult:
+    """
+    Run the kata's tests in a fresh pytest process. The solution_loader plugin
+    serves the solution from the environment; the pytest_session plugin applies
+    `limits` to that process and writes its outcome back through a pipe.
+    """
+    read_fd, write_fd = os.pipe()
+    env = _pytest_env(kata_name, user_code)
+    env[RESULT_FD_ENV] = str(write_fd)
+    env[LIMITS_ENV] = json.dumps(limits.to_dict())
+    timeout = limits.wall_seconds + KILL_GRACE_SECONDS if limits.wall_seconds else None
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [
+            "pytest",
+            str(test_file),
+            "--tb=short",
+            "-p", "pylearn.actions.kata.solution_loader",
+            "-p", "pylearn.actions.kata.pytest_session",
+        ],
+        cwd=PROJECT_ROOT,
+        env=env,
+        pass_fds=(write_fd,),
+        stdout=subprocess.PIPE if quiet else None,
+        stderr=subprocess.STDOUT if quiet else None,
+        text=True,
+    )
+    os.close(write_fd)
+
+    reason = None
     try:
-        subprocess.check_call(
-            ["pytest", str(test_file), "--tb=short"],
-            cwd=PROJECT_ROOT,
-            env=env,
-        )
-        return True
-    except subprocess.CalledProcessError:
-        return False
-    finally:
+        output, _ = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        output, _ = proc.communicate()
+        reason = "timed out"
+    duration = time.perf_counter() - start
+
+    with os.fdopen(read_fd) as pipe:
+        payload = pipe.read()
+    summary = json.loads(payload) if payload else {}
+    reason = reason or summary.get("reason")
+    if reason is None and not summary and proc.returncode < 0:
+        reason = "killed"  # e.g. SIGKILL at the hard RLIMIT_CPU
+
+    return KataResult(
+        kata_name=kata_name,
+        passed=reason is None and proc.returncode == 0,
+        outcomes=summary.get("outcomes", {}),
+        failures=summary.get("failures", []),
+        duration=duration,
+        output=output or "",
+        reason=reason,
+        cpu_seconds=summary.get("cpu_seconds"),
+        peak_rss_kb=summary.get("peak_rss_kb"),
+    )
+
+
+def run_kata_tests(
+    kata_name: str,
+    user_code: str,
+    quiet: bool = False,
+    limits: ResourceLimits | None = None,
+) -> KataResult:
+    """
+    Run pytest for a kata against `user_code` without writing it to disk.
+
+    If a warm test worker (`pylearn worker`) is listening, the run is handed to
+    it. Otherwise a fresh pytest process loads the solution_loader plugin, which
+    serves `katas.<kata_name>` from the source passed in the environment.
+    With `quiet`, pytest output is kept in the result instead of printed.
+    `limits` defaults to the configured ResourceLimits.
+    """
+    limits = limits or ResourceLimits()
+    test_file = TESTS_DIR / f"test_{kata_name}.py"
+    if not test_file.exists():
+        if not quiet:
+            print(f"❌ No test file found at: {test_file}")
+        return KataResult(kata_name, passed=False, reason="no test file")
+
+    result = request_run(kata_name, user_code, test_file, limits=limits)
+    if result is None:
         try:
-            solution_file.unlink()
-        except FileNotFoundError:
-            pass
+            compile(user_code, f"<kata {kata_name}>", "exec")
+        except SyntaxError as exc:
+            result = KataResult(
+                kata_name,
+                passed=False,
+                outcomes={"error": 1},
+                failures=[f"solution: SyntaxError: {exc}"],
+                output=f"❌ Solution does not compile: {exc}\n",
+            )
+        else:
+            # pytest already printed to the terminal unless quiet
+            result = _run_pytest_subprocess(kata_name, user_code, test_file, quiet, limits)
+            if not quiet:
+                _print_outcome(result)
+            return result
+
+    if not quiet:
+        print(result.output, end="")
+        _print_outcome(result)
+    return result
+
+
+def _print_outcome(result: KataResult) -> None:
+    if result.reason:
+        print(f"❌ Tests {result.reason}.")
+    print(f"⏱  {result.usage()}")
+
+
+def run_python_tests(
+    kata_name: str,
+    user_code: str,
+    limits: ResourceLimits | None = None,
+) -> bool:
+    return run_kata_tests(kata_name, user_code, limits=limits).passed
 
 
-def run_tests(kata_name: str, language: str, user_code: str) -> bool:
+def run_tests(
+    kata_name: str,
+    language: str,
+    user_code: str,
+    limits: ResourceLimits | None = None,
+) -> KataResult:
     language = language.lower()
     if language == "python":
-        return run_python_tests(kata_name, user_code)
+        return run_kata_tests(kata_name, user_code, limits=limits)
     else:
         print(f"⚠️ No test runner implemented for language '{language}'.")
-        return False
+        return KataResult(kata_name, passed=False, reason="no test runner")
@@ -0,0 +1,123 @@
+"""
+Warm test worker for Python katas.
+
+`pylearn worker` starts a long-lived process that has pytest imported and
+listens on a Unix socket. Each request forks a child that injects the submitted
+solution as `katas.<name>`, runs the kata's test module in-process and answers
+with a JSON-encoded KataResult. The fork keeps every run in its own module
+namespace while skipping interpreter startup and pytest import.
+
+Wire format: one JSON line per request
+    {"kata_name": ..., "code": ..., "test_file": ..., "limits": {...} | null}
+and one JSON line back with the KataResult fields.
+"""
+from __future__ import annotations
+
+import json
+import socket
+import socketserver
+import sys
+import time
+from pathlib import Path
+
+from ...config import PYTHON_KATAS_DIR, WORKER_SOCKET
+from .limits import ResourceLimits
+from .pytest_session import run_pytest_in_process
+from .results import KataResult
+
+
+class _RunHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline())
+        limits = request.get("limits")
+        # We are the forked child for this request, so the limits only ever
+        # apply to this run.
+        result = run_pytest_in_process(
+            request["kata_name"],
+            request["code"],
+            Path(request["test_file"]),
+            limits=ResourceLimits.from_dict(limits) if limits else None,
+        )
+        self.wfile.write(json.dumps(result.to_dict()).encode() + b"\n")
+
+
+class _WorkerServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    pass
+
+
+def _worker_alive(socket_path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+
+def serve(socket_path: Path = WORKER_SOCKET) -> None:
+    import pytest  # noqa: F401  -- imported once here, inherited by every forked run
+
+    katas_root = str(PYTHON_KATAS_DIR.parent)
+    if katas_root not in sys.path:
+        sys.path.insert(0, katas_root)
+    import katas  # noqa: F401
+
+    if socket_path.exists():
+        if _worker_alive(socket_path):
+            print(f"ℹ️ A test worker is already listening on {socket_path}.")
+            return
+        socket_path.unlink()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with _WorkerServer(str(socket_path), _RunHandler) as server:
+        print(f"🔥 Test worker listening on {socket_path} (Ctrl-C to stop).")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 Stopping test worker.")
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def request_run(
+    kata_name: str,
+    user_code: str,
+    test_file: Path,
+    limits: ResourceLimits | None = None,
+    socket_path: Path = WORKER_SOCKET,
+) -> KataResult | None:
+    """
+    Ask the worker to run `test_file` against `user_code` under `limits`.
+
+    Returns None when no worker is reachable, so the caller can fall back to
+    a cold pytest subprocess.
+    """
+    payload = {
+        "kata_name": kata_name,
+        "code": user_code,
+        "test_file": str(test_file),
+        "limits": limits.to_dict() if limits else None,
+    }
+    timeout = limits.wall_seconds if limits else None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            return None
+        start = time.perf_counter()
+        # The run enforces its own limits; this only guards against a hung worker.
+        sock.settimeout(timeout + 5 if timeout else None)
+        try:
+            sock.sendall(json.dumps(payload).encode() + b"\n")
+            sock.shutdown(socket.SHUT_WR)
+            with sock.makefile("rb") as reply:
+                line = reply.readline()
+        except socket.timeout:
+            return KataResult(kata_name, passed=False, duration=time.perf_counter() - start, reason="timed out")
+
+    if not line:
+        # The run's process died without answering: the kernel enforcing a
+        # hard limit, or the solution crashing the interpreter.
+        return KataResult(kata_name, passed=False, duration=time.perf_counter() - start, reason="killed")
+    return KataResult.from_dict(json.loads(line))
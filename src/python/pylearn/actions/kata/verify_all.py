@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ...config import TESTS_DIR
+from ...db import get_connection
+from .limits import ResourceLimits
+from .results import KataResult
+from .test_runner import run_kata_tests
+
+
+def fetch_successful_solutions(language: str = "python") -> list[tuple[str, str]]:
+    """
+    Latest stored successful solution per kata for `language`, as (kata, code).
+    """
+    with get_connection() as db:
+        rows = db.execute(
+            """
+            SELECT k.name, e.code_snippet
+            FROM examples e
+            JOIN trackables AS k ON k.id = e.concept_trackable_id
+            JOIN trackables AS l ON l.id = e.language_trackable_id
+            WHERE k.type = 'kata'
+              AND LOWER(l.name) = ?
+              AND e.explanation = 'success'
+              AND e.id = (
+                  SELECT MAX(e2.id) FROM examples e2
+                  WHERE e2.concept_trackable_id = e.concept_trackable_id
+                    AND e2.language_trackable_id = e.language_trackable_id
+                    AND e2.explanation = 'success'
+              )
+            ORDER BY k.name
+            """,
+            (language.lower(),),
+        ).fetchall()
+    return [(name, code) for name, code in rows]
+
+
+def _print_report(results: list[KataResult], wall: float) -> None:
+    width = max(len(r.kata_name) for r in results)
+    print()
+    for r in sorted(results, key=lambda r: r.kata_name):
+        mark = "✅" if r.passed else "❌"
+        print(f"{mark} {r.kata_name:<{width}}  {r.duration:6.2f}s  {r.describe()}")
+        if r.cpu_seconds is not None:
+            print(f"     cpu {r.cpu_seconds:.2f}s, peak {r.peak_rss_kb / 1024:.1f} MiB")
+        for failure in r.failures:
+            print(f"     - {failure}")
+
+    passed = sum(r.passed for r in results)
+    slowest = max(results, key=lambda r: r.duration)
+    print(
+        f"\n{passed}/{len(results)} katas passed in {wall:.2f}s "
+        f"(slowest: {slowest.kata_name} {slowest.duration:.2f}s, "
+        f"serial total {sum(r.duration for r in results):.2f}s)."
+    )
+
+
+def verify_all(limits: ResourceLimits | None = None, workers: int | None = None) -> bool:
+    """
+    Re-run every stored successful Python solution against its current test file.
+
+    Each kata already runs in its own child process (a forked worker run or a
+    fresh pytest), so the fan-out only needs threads to launch and wait on them;
+    `workers` defaults to the number of cores.
+    """
+    solutions = fetch_successful_solutions()
+    runnable = []
+    for kata_name, code in solutions:
+        if (TESTS_DIR / f"test_{kata_name}.py").exists():
+            runnable.append((kata_name, code))
+        else:
+            print(f"⚠️ Skipping '{kata_name}': no test file.")
+
+    if not runnable:
+        print("ℹ️ No stored successful Python solutions to verify.")
+        return True
+
+    limits = limits or ResourceLimits()
+    workers = min(workers or os.cpu_count() or 1, len(runnable))
+    print(f"🔁 Verifying {len(runnable)} katas with {workers} parallel runs...")
+
+    start = time.perf_counter()
+    results: list[KataResult] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_kata_tests, kata_name, code, quiet=True, limits=limits)
+            for kata_name, code in runnable
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"  {'✅' if result.passed else '❌'} {result.kata_name}")
+
+    _print_report(results, time.perf_counter() - start)
+    return all(r.passed for r in results)
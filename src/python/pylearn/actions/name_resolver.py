@@ -0,0 +1,117 @@
+"""
+Typo-tolerant lookup of trackable and kata names.
+
+Names are indexed by their trigrams (pg_trgm style: lowercased, padded with
+two leading spaces and one trailing), and a query is scored against every
+name sharing at least one trigram by Jaccard similarity. Only the postings
+of the query's own trigrams are touched, so a lookup costs microseconds
+instead of an edit-distance scan over every name.
+"""
+import math
+import sqlite3
+from collections import defaultdict
+from itertools import chain
+from typing import Dict, Iterable, List, Tuple
+
+# A best match scoring at least this, and ahead of the runner-up by
+# AUTOCORRECT_LEAD, is used in place of the mistyped name.
+AUTOCORRECT_SCORE = 0.5
+AUTOCORRECT_LEAD = 0.1
+# Weaker matches are only offered as suggestions.
+SUGGEST_SCORE = 0.25
+SUGGEST_LIMIT = 5
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    def __init__(self, names: Iterable[str]):
+        self._exact = set(names)
+        self.names: List[str] = sorted(self._exact)
+        self._grams: List[set[str]] = [trigrams(name) for name in self.names]
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for i, grams in enumerate(self._grams):
+            for gram in grams:
+                self._postings[gram].append(i)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._exact
+
+    def candidates(
+        self, query: str, limit: int = SUGGEST_LIMIT, min_score: float = SUGGEST_SCORE
+    ) -> List[Tuple[str, float]]:
+        """
+        Up to `limit` (name, score) pairs, best first, with score in (0, 1].
+        """
+        grams = trigrams(query)
+        # Count shared trigrams per name. A name must share at least this many
+        # to reach min_score, so by pigeonhole it appears in one of the
+        # rarest len(grams) - need + 1 postings; names seen only in the common
+        # ones are never counted.
+        need = max(1, math.ceil(min_score * len(grams)))
+        ordered = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        probe = ordered[: len(grams) - need + 1]
+        candidates = set(chain.from_iterable(self._postings.get(gram, ()) for gram in probe))
+        scored = []
+        for i in candidates:
+            count = len(grams & self._grams[i])
+            scored.append((self.names[i], count / (len(grams) + len(self._grams[i]) - count)))
+        scored = [pair for pair in scored if pair[1] >= min_score]
+        scored.sort(key=lambda pair: (-pair[1], pair[0]))
+        return scored[:limit]
+
+
+def resolve_name(name: str, index: TrigramIndex, label: str) -> str | None:
+    """
+    `name` if it is in `index`; else the closest name when it is a clear
+    winner (announced); else None, after printing suggestions.
+    """
+    if name in index:
+        return name
+    matches = index.candidates(name)
+    if matches:
+        best, score = matches[0]
+        runner_up = matches[1][1] if len(matches) > 1 else 0.0
+        if score >= AUTOCORRECT_SCORE and score - runner_up >= AUTOCORRECT_LEAD:
+            print(f"ℹ️ No {label} named '{name}'; using '{best}'.")
+            return best
+    print(f"❌ No {label} named '{name}'.")
+    if matches:
+        print("   Did you mean: " + ", ".join(candidate for candidate, _ in matches) + "?")
+    return None
+
+
+# types -> (connection, database state, index), for the last connection
+# asked. The state changes whenever this connection or another one writes,
+# which rebuilds the index.
+_trackable_indexes: Dict[Tuple[str, ...], Tuple[sqlite3.Connection, Tuple[int, int], TrigramIndex]] = {}
+
+
+def trackable_index(db: sqlite3.Connection, types: Iterable[str]) -> TrigramIndex:
+    types = tuple(sorted(types))
+    state = (db.execute("PRAGMA data_version").fetchone()[0], db.total_changes)
+    cached = _trackable_indexes.get(types)
+    if cached and cached[0] is db and cached[1] == state:
+        return cached[2]
+    rows = db.execute(
+        f"SELECT name FROM trackables WHERE type IN ({', '.join('?' for _ in types)})",
+        types,
+    )
+    index = TrigramIndex(row[0] for row in rows)
+    _trackable_indexes[types] = (db, state, index)
+    return index
+
+
+def resolve_trackable(db: sqlite3.Connection, name: str, types: Iterable[str], label: str) -> str | None:
+    types = tuple(types)
+    # The common case is an exact name: one indexed lookup, no index build.
+    exact = db.execute(
+        f"SELECT 1 FROM trackables WHERE name = ? AND type IN ({', '.join('?' for _ in types)})",
+        (name, *types),
+    ).fetchone()
+    if exact:
+        return name
+    return resolve_name(name, trackable_index(db, types), label)
@@ -0,0 +1,108 @@
+"""
+Streaming query output for the listing commands.
+
+Rows are pulled from the cursor in fetchmany batches and each batch is
+written to stdout in one write, so the first rows show up as soon as
+SQLite produces them and memory stays flat however large the table is.
+"""
+import json
+import os
+import shlex
+import sqlite3
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, List, Sequence, Tuple
+
+# Rows per fetchmany, and so per write to stdout.
+FETCH_SIZE = 500
+FORMATS = ("text", "json", "tsv")
+
+
+@dataclass
+class Page:
+    """
+    --limit / --offset / --after. `after` is the key of the last row already
+    seen; queries turn it into a keyset condition on their sort order, which
+    unlike a large offset does not scan the rows it skips.
+    """
+
+    limit: int | None = None
+    offset: int = 0
+    after: str | None = None
+
+    def clause(self) -> Tuple[str, List[int]]:
+        if self.limit is None and not self.offset:
+            return "", []
+        return " LIMIT ? OFFSET ?", [-1 if self.limit is None else self.limit, self.offset]
+
+    def full(self, count: int) -> bool:
+        return self.limit is not None and count >= self.limit
+
+
+def _tsv_field(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def _silence_stdout() -> None:
+    # The reader (head, less) went away. Point stdout at /dev/null so the
+    # interpreter's final flush does not raise again.
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+
+
+def write_rows(
+    cursor: sqlite3.Cursor,
+    columns: Sequence[str],
+    fmt: str = "text",
+    render: Callable[[int, tuple], str] | None = None,
+    size: int | None = None,
+) -> Tuple[int, tuple | None]:
+    """
+    Stream `cursor` to stdout. `text` uses `render(n, row)` (n counts from 1),
+    `json` writes one object per line keyed by `columns`, and `tsv` writes a
+    header and tab-separated rows with tabs, newlines and backslashes escaped.
+    Returns the number of rows written and the last row, for paging.
+    """
+    out = sys.stdout
+    count, last = 0, None
+    try:
+        if fmt == "tsv":
+            out.write("\t".join(columns) + "\n")
+        while True:
+            rows = cursor.fetchmany(size or FETCH_SIZE)
+            if not rows:
+                break
+            chunk = []
+            for row in rows:
+                count += 1
+                if fmt == "json":
+                    chunk.append(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n")
+                elif fmt == "tsv":
+                    chunk.append("\t".join(_tsv_field(v) for v in row) + "\n")
+                else:
+                    chunk.append(render(count, row) + "\n")
+            out.write("".join(chunk))
+            out.flush()
+            last = rows[-1]
+    except BrokenPipeError:
+        _silence_stdout()
+    return count, last
+
+
+def print_next_page(page: Page, count: int, fmt: str, after: str) -> None:
+    """
+    In text output, tell the reader how to fetch the next page when this one
+    was full, in the paging mode they used: the next --offset when they paged
+    by offset, else the key to pass to --after. Machine formats carry the key
+    in their last row instead.
+    """
+    if fmt != "text" or not page.full(count):
+        return
+    if page.offset and page.after is None:
+        print(f"ℹ️ More rows: repeat with --offset {page.offset + page.limit}")
+    elif page.offset:
+        print(f"ℹ️ More rows: repeat with --after {shlex.quote(after)} --offset 0")
+    else:
+        print(f"ℹ️ More rows: repeat with --after {shlex.quote(after)}")
@@ -0,0 +1,68 @@
+import sqlite3
+import sys
+
+from ..db import get_connection
+
+# Results shown per search.
+SEARCH_LIMIT = 20
+# bm25 column weights for (name, description, code): a hit in a concept's
+# name says more than one in a line of code.
+RANK_WEIGHTS = (10.0, 2.0, 1.0)
+SNIPPET_TOKENS = 16
+
+
+def _fts_quote(query: str) -> str:
+    """
+    The query as plain terms, for input that is not valid FTS5 syntax
+    (stray quotes, operators, `foo-bar`).
+    """
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+def search(query: str, language: str | None = None, limit: int = SEARCH_LIMIT) -> None:
+    """
+    Full-text search over example code and explanations and over concept and
+    kata names and descriptions, best matches first. FTS5 query syntax
+    (prefix*, "phrases", AND/OR/NOT, name:closures) is accepted; anything it
+    cannot parse is searched as plain words. `language` keeps only examples
+    in that language.
+    """
+    if sys.stdout.isatty():
+        start, end = "\033[1m", "\033[0m"
+    else:
+        start, end = "[", "]"
+
+    sql = f"""
+        SELECT
+            kind,
+            name,
+            language,
+            snippet(search_index, 1, :start, :end, '…', {SNIPPET_TOKENS}),
+            snippet(search_index, 2, :start, :end, '…', {SNIPPET_TOKENS})
+        FROM search_index
+        WHERE search_index MATCH :query
+          {"AND language = :language" if language else ""}
+        ORDER BY bm25(search_index, {", ".join(map(str, RANK_WEIGHTS))})
+        LIMIT :limit
+    """
+    params = {"start": start, "end": end, "query": query, "language": language, "limit": limit}
+
+    with get_connection() as db:
+        try:
+            rows = db.execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            params["query"] = _fts_quote(query)
+            rows = db.execute(sql, params).fetchall() if params["query"] else []
+
+    if not rows:
+        print(f"No matches for '{query}'{f' in {language}' if language else ''}.")
+        return
+
+    for i, (kind, name, lang, description, code) in enumerate(rows, start=1):
+        heading = f"{name} in {lang}" if kind == "example" else f"{name} ({kind})"
+        print(f"\n=== [{i}] {heading} ===")
+        if description:
+            print(description)
+        if code:
+            print("-------- CODE --------")
+            print(code)
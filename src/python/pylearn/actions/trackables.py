@@ -1,33 +1,52 @@
+import csv
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
 from ..db import get_connection
+from .name_resolver import resolve_trackable
+from .output import Page, print_next_page, write_rows
+
+VALID_STATUSES = ("not started", "in progress", "mastered", "abandoned")
+PROGRESS_FIELDS = ("name", "type", "status", "notes")
+# Print individual problem rows up to this many; beyond it only the count.
+REPORT_LIMIT = 20
+
+def list_items(item_type: str, page: Page = Page(), fmt: str = "text") -> None:
+    """
+    Trackables of one type by name, streamed. `page.after` is the last name
+    already seen.
+    """
+    query = "SELECT id, name FROM trackables WHERE type = ?"
+    params: list = [item_type]
+    if page.after is not None:
+        query += " AND name > ?"
+        params.append(page.after)
+    limit, limit_params = page.clause()
+    query += " ORDER BY name" + limit
 
-def list_items(item_type: str) -> None:
     with get_connection() as db:
-        cursor = db.execute(
-            "SELECT id, name FROM trackables WHERE type = ? ORDER BY name",
-            (item_type,),
-        )
-        rows = cursor.fetchall()
-    if not rows:
+        cursor = db.execute(query, (*params, *limit_params))
+        count, last = write_rows(cursor, ("id", "name"), fmt, lambda _, row: f"{row[0]}: {row[1]}")
+    if not count and fmt == "text":
         print(f"No trackables of type '{item_type}' found.")
         return
-    for row in rows:
-        print(f"{row[0]}: {row[1]}")
+    if last:
+        print_next_page(page, count, fmt, last[1])
 
 def update_progress(name: str, item_type: str, status: str, notes: str | None = None):
-    if status not in ("not started", "in progress", "mastered", "abandoned"):
+    if status not in VALID_STATUSES:
         print(f"❌ Invalid status: {status}")
         return
 
     with get_connection() as db:
+        name = resolve_trackable(db, name, (item_type,), item_type)
+        if name is None:
+            return
         row = db.execute(
             "SELECT id FROM trackables WHERE name = ? AND type = ?",
             (name, item_type),
         ).fetchone()
 
-        if not row:
-            print(f"❌ No trackable found with name '{name}' and type '{item_type}'.")
-            return
-
         trackable_id = row[0]
         db.execute(
             """
@@ -41,24 +60,150 @@ def update_progress(name: str, item_type: str, status: str, notes: str | None =
         )
     print(f"✅ Updated {item_type} '{name}' to status '{status}'.")
 
-def show_status(item_type: str | None = None):
+def show_status(item_type: str | None = None, page: Page = Page(), fmt: str = "text"):
+    """
+    Progress of every trackable (or those of `item_type`) in (type, name)
+    order, streamed. `page.after` is the last name already seen, written
+    type:name when no type is given.
+    """
     query = """
         SELECT t.type, t.name, COALESCE(p.status, 'not started') AS status
         FROM trackables t
         LEFT JOIN trackable_progress p ON p.trackable_id = t.id
     """
-    params: list[str] = []
+    conditions: list[str] = []
+    params: list = []
     if item_type:
-        query += " WHERE t.type = ?"
+        conditions.append("t.type = ?")
         params.append(item_type)
-    query += " ORDER BY t.type, t.name"
+    if page.after is not None:
+        if item_type:
+            conditions.append("t.name > ?")
+            params.append(page.after)
+        else:
+            after_type, sep, after_name = page.after.partition(":")
+            if not sep:
+                print("❌ --after takes type:name unless --type is given.")
+                return
+            conditions.append("(t.type, t.name) > (?, ?)")
+            params += [after_type, after_name]
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    limit, limit_params = page.clause()
+    query += " ORDER BY t.type, t.name" + limit
 
     with get_connection() as db:
-        rows = db.execute(query, tuple(params)).fetchall()
+        cursor = db.execute(query, (*params, *limit_params))
+        count, last = write_rows(
+            cursor, ("type", "name", "status"), fmt, lambda _, row: f"[{row[0]}] {row[1]}: {row[2]}"
+        )
 
-    if not rows:
+    if not count and fmt == "text":
         print("No trackables found.")
         return
+    if last:
+        print_next_page(page, count, fmt, last[1] if item_type else f"{last[0]}:{last[1]}")
+
+
+def _report(header: str, lines: List[str]) -> None:
+    print(f"{header} ({len(lines)}):")
+    for line in lines[:REPORT_LIMIT]:
+        print(f"  - {line}")
+    if len(lines) > REPORT_LIMIT:
+        print(f"  ... and {len(lines) - REPORT_LIMIT} more.")
+
+
+def read_progress_file(path: str) -> List[Dict[str, Any]] | None:
+    """
+    Progress rows from a CSV file with a name,type,status,notes header, or
+    from a YAML list of mappings with those keys (.yaml/.yml). Only `name`
+    is required per row; the rest can come from --type and --status.
+    """
+    file = Path(path)
+    if not file.is_file():
+        print(f"❌ Progress file not found: {file}")
+        return None
+    if file.suffix in (".yaml", ".yml"):
+        import yaml
+
+        with file.open(encoding="utf-8") as f:
+            rows = yaml.safe_load(f) or []
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            print(f"❌ {file}: expected a list of mappings with name, type, status and notes.")
+            return None
+        return rows
+    with file.open(newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def update_progress_many(
+    rows: Iterable[Dict[str, Any]],
+    item_type: str | None = None,
+    status: str | None = None,
+) -> None:
+    """
+    Apply many progress updates in one transaction. Each row has a `name`
+    and optionally `type`, `status` and `notes`; `item_type` and `status`
+    fill in what a row leaves out. Names are resolved with one join against
+    a temp table and the rows are written with a single executemany upsert;
+    unknown names and invalid rows are reported together at the end. Names
+    are matched exactly: a bulk update does not autocorrect.
+    """
+    updates, invalid = [], []
+    for i, row in enumerate(rows, 1):
+        update = {key: (row.get(key) or None) for key in PROGRESS_FIELDS}
+        update["type"] = update["type"] or item_type
+        update["status"] = update["status"] or status
+        if not (update["name"] and update["type"] and update["status"]):
+            invalid.append(f"row {i}: needs a name, a type and a status")
+        elif update["status"] not in VALID_STATUSES:
+            invalid.append(f"row {i}: invalid status '{update['status']}' for '{update['name']}'")
+        else:
+            update["seq"] = i
+            updates.append(update)
+
+    with get_connection() as db:
+        db.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS progress_updates (
+                seq INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                notes TEXT
+            )
+            """
+        )
+        db.execute("DELETE FROM progress_updates")
+        db.executemany(
+            "INSERT INTO progress_updates VALUES (:seq, :name, :type, :status, :notes)",
+            updates,
+        )
+        resolved = db.execute(
+            """
+            SELECT t.id, u.status, u.notes, u.type, u.name
+            FROM progress_updates u
+            LEFT JOIN trackables t ON t.name = u.name AND t.type = u.type
+            ORDER BY u.seq
+            """
+        ).fetchall()
+        # Rows are applied in file order, so a later row for the same name wins.
+        db.executemany(
+            """
+            INSERT INTO trackable_progress (trackable_id, status, notes)
+            VALUES (?, ?, ?)
+            ON CONFLICT(trackable_id)
+            DO UPDATE SET status = excluded.status,
+                          notes  = COALESCE(excluded.notes, trackable_progress.notes)
+            """,
+            ((tid, st, notes) for tid, st, notes, _, _ in resolved if tid is not None),
+        )
+        db.execute("DELETE FROM progress_updates")
 
-    for ttype, name, status in rows:
-        print(f"[{ttype}] {name}: {status}")
+    unknown = [f"{ttype} '{name}'" for tid, _, _, ttype, name in resolved if tid is None]
+    applied = len(resolved) - len(unknown)
+    print(f"✅ Updated progress for {applied} trackable{'s' if applied != 1 else ''}.")
+    if unknown:
+        _report("⚠️ Unknown trackables, skipped", unknown)
+    if invalid:
+        _report("❌ Invalid rows, skipped", invalid)
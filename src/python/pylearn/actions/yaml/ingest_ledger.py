@@ -0,0 +1,159 @@
+"""
+Content hashes of what the last ingest applied, per YAML file and per record.
+
+`ingest_files` holds a digest of each file's bytes so an unchanged file is
+skipped without parsing it. `ingest_ledger` holds a digest per record key so
+a changed file only applies the records that are new, changed or gone.
+"""
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Set
+
+from .yaml_helpers import digest_bytes
+
+
+def record_digest(record: Dict[str, Any]) -> str:
+    return digest_bytes(json.dumps(record, sort_keys=True, default=str).encode())
+
+
+def trackable_key(trackable_type: str, name: str) -> str:
+    return json.dumps([trackable_type, name])
+
+
+def relationship_key(r: Dict[str, Any]) -> str:
+    return json.dumps([r["source_name"], r["relation"], r["target_name"]])
+
+
+def example_key(example: Dict[str, Any]) -> str:
+    """
+    An example's id, or its (language, concept, code_snippet) when it has none.
+    """
+    if example.get("id") is not None:
+        return json.dumps(example["id"])
+    return json.dumps([example["language"], example["concept"], example["code_snippet"]])
+
+
+def parse_key(record_key: str) -> tuple:
+    return tuple(json.loads(record_key))
+
+
+@dataclass
+class RecordDiff:
+    """
+    Records of one file that differ from the ledger. `digests` covers every
+    current record; `changed` and `deleted` are what needs applying.
+    """
+
+    source: str
+    changed: List[Dict[str, Any]] = field(default_factory=list)
+    changed_keys: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    digests: Dict[str, str] = field(default_factory=dict)
+
+    def changed_digests(self) -> Dict[str, str]:
+        return {k: self.digests[k] for k in self.changed_keys if k in self.digests}
+
+
+def file_digest(cur: sqlite3.Cursor, source: str) -> str | None:
+    row = cur.execute("SELECT digest FROM ingest_files WHERE source = ?", (source,)).fetchone()
+    return row[0] if row else None
+
+
+def set_file_digest(cur: sqlite3.Cursor, source: str, digest: str | None) -> None:
+    """
+    Record `digest` for `source`, or forget it (None) so the next ingest
+    re-reads the file.
+    """
+    if digest is None:
+        cur.execute("DELETE FROM ingest_files WHERE source = ?", (source,))
+        return
+    cur.execute(
+        """
+        INSERT INTO ingest_files (source, digest) VALUES (?, ?)
+        ON CONFLICT(source) DO UPDATE SET digest = excluded.digest, ingested_at = CURRENT_TIMESTAMP
+        """,
+        (source, digest),
+    )
+
+
+def diff_records(
+    cur: sqlite3.Cursor,
+    source: str,
+    records: Iterable[Dict[str, Any]],
+    key: Callable[[Dict[str, Any]], str],
+    full: bool = False,
+) -> RecordDiff:
+    """
+    Compare `records` with the ledger for `source`. With `full`, every current
+    record counts as changed; deletions are still computed from the ledger.
+    Later duplicates of a key win, matching how the upserts apply them.
+    """
+    known = dict(
+        cur.execute("SELECT record_key, digest FROM ingest_ledger WHERE source = ?", (source,)).fetchall()
+    )
+    current: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        current[key(record)] = record
+
+    diff = RecordDiff(source)
+    for record_key, record in current.items():
+        digest = record_digest(record)
+        diff.digests[record_key] = digest
+        if full or known.get(record_key) != digest:
+            diff.changed.append(record)
+            diff.changed_keys.append(record_key)
+    diff.deleted = [k for k in known if k not in current]
+    return diff
+
+
+def write_ledger(cur: sqlite3.Cursor, source: str, digests: Dict[str, str], deleted: Iterable[str]) -> None:
+    cur.executemany(
+        """
+        INSERT INTO ingest_ledger (source, record_key, digest) VALUES (?, ?, ?)
+        ON CONFLICT(source, record_key) DO UPDATE SET digest = excluded.digest
+        """,
+        ((source, k, d) for k, d in digests.items()),
+    )
+    cur.executemany(
+        "DELETE FROM ingest_ledger WHERE source = ? AND record_key = ?",
+        ((source, k) for k in deleted),
+    )
+
+
+def ledger_keys(cur: sqlite3.Cursor, source: str) -> List[str]:
+    return [row[0] for row in cur.execute("SELECT record_key FROM ingest_ledger WHERE source = ?", (source,))]
+
+
+def trackables_outside(cur: sqlite3.Cursor, sources: Iterable[str]) -> List[tuple]:
+    """
+    (type, name) of every trackable in the database that did not come from
+    one of `sources` per the ledger: the ones a re-read of those files
+    cannot remove.
+    """
+    return cur.execute(
+        """
+        SELECT type, name FROM trackables
+        EXCEPT
+        SELECT json_extract(record_key, '$[0]'), json_extract(record_key, '$[1]')
+        FROM ingest_ledger
+        WHERE source IN (SELECT value FROM json_each(?))
+        """,
+        (json.dumps(sorted(sources)),),
+    ).fetchall()
+
+
+def forget_relationships_of(cur: sqlite3.Cursor, source: str, names: Set[str]) -> None:
+    """
+    Drop ledger entries of relationships that touch `names`, so they are
+    re-applied (or reported unresolved) the next time `source` is diffed.
+    """
+    cur.execute(
+        """
+        DELETE FROM ingest_ledger
+        WHERE source = ?
+          AND (json_extract(record_key, '$[0]') IN (SELECT value FROM json_each(?))
+               OR json_extract(record_key, '$[2]') IN (SELECT value FROM json_each(?)))
+        """,
+        (source, json.dumps(sorted(names)), json.dumps(sorted(names))),
+    )
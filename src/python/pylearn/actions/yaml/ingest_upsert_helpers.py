@@ -1,228 +1,359 @@
+"""
+Set-based upserts for YAML ingest.
+
+Each YAML file is staged into TEMP tables with executemany, then applied with
+a handful of INSERT ... SELECT ... ON CONFLICT statements that resolve names
+to ids with joins. The caller owns the transaction.
+"""
 import sqlite3
-from typing import Any, Dict, List, Iterable, Optional
+from typing import Any, Dict, Iterable, List, Set, Tuple
 
+from .tag_registry import TagRegistry
 
-def upsert_trackable(
-    cur: sqlite3.Cursor,
-    *,
-    name: str,
-    trackable_type: str,
-    description: str | None = None,
-) -> Optional[int]:
+STAGING_TABLES = [
     """
-    Create or update a trackable and return its id.
+    CREATE TEMP TABLE IF NOT EXISTS stage_trackables (
+        name TEXT NOT NULL,
+        type TEXT NOT NULL,
+        description TEXT,
+        version TEXT,
+        documentation_url TEXT,
+        status TEXT,
+        notes TEXT
+    )
+    """,
     """
-    cur.execute(
-        "SELECT id FROM trackables WHERE name = ? AND type = ?",
-        (name, trackable_type),
+    CREATE TEMP TABLE IF NOT EXISTS stage_trackable_tags (
+        name TEXT NOT NULL,
+        type TEXT NOT NULL,
+        tag TEXT NOT NULL
     )
-    row = cur.fetchone()
-    trackable_id = row[0] if row else None
+    """,
+    """
+    CREATE TEMP TABLE IF NOT EXISTS stage_relationships (
+        source_name TEXT NOT NULL,
+        target_name TEXT NOT NULL,
+        relation TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TEMP TABLE IF NOT EXISTS stage_trackable_deletes (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        type TEXT NOT NULL
+    )
+    """,
+]
 
-    if trackable_id is None:
-        cur.execute(
-            """
-            INSERT INTO trackables (name, type, description)
-            VALUES (?, ?, ?)
-            """,
-            (name, trackable_type, description),
-        )
-        trackable_id = cur.lastrowid
-    else:
-        cur.execute(
-            """
-            UPDATE trackables
-            SET name = ?, description = ?
-            WHERE id = ? AND type = ?
-            """,
-            (name, description, trackable_id, trackable_type),
-        )
 
-    return trackable_id
+def create_staging_tables(cur: sqlite3.Cursor) -> None:
+    for statement in STAGING_TABLES:
+        cur.execute(statement)
+    cur.execute("DELETE FROM stage_trackables")
+    cur.execute("DELETE FROM stage_trackable_tags")
+    cur.execute("DELETE FROM stage_relationships")
+    cur.execute("DELETE FROM stage_trackable_deletes")
 
 
-def upsert_trackable_tags(
+def stage_trackables(
     cur: sqlite3.Cursor,
-    trackable_id: int,
-    tags: Iterable[str] | None,
+    items: Iterable[Dict[str, Any]],
+    default_type: str,
 ) -> None:
-    if not tags:
-        return
-
-    for tag in tags:
-        cur.execute("INSERT OR IGNORE INTO tags (name) VALUES (?)", (tag,))
-        cur.execute("SELECT id FROM tags WHERE name = ?", (tag,))
-        tag_id = cur.fetchone()[0]
-        cur.execute(
-            """
-            INSERT OR IGNORE INTO trackable_tags (trackable_id, tag_id)
-            VALUES (?, ?)
-            """,
-            (trackable_id, tag_id),
+    """
+    Stage languages, concepts or katas. A concept may override its type with
+    a `type` key ("concept" or "kata").
+    """
+    rows: List[Tuple[Any, ...]] = []
+    tag_rows: List[Tuple[str, str, str]] = []
+    for item in items:
+        name = item["name"]
+        trackable_type = item.get("type", default_type)
+        rows.append(
+            (
+                name,
+                trackable_type,
+                item.get("description"),
+                item.get("version"),
+                item.get("documentation_url"),
+                item.get("status"),
+                item.get("notes"),
+            )
         )
+        tag_rows.extend((name, trackable_type, tag) for tag in item.get("tags") or [])
 
+    cur.executemany("INSERT INTO stage_trackables VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    cur.executemany("INSERT INTO stage_trackable_tags VALUES (?, ?, ?)", tag_rows)
 
-def upsert_trackable_progress(
-    cur: sqlite3.Cursor,
-    trackable_id: int,
-    status: str | None,
-    notes: str | None,
-) -> None:
-    if status is None and notes is None:
-        return
 
-    cur.execute(
-        """
-        INSERT OR REPLACE INTO trackable_progress (trackable_id, status, notes)
-        VALUES (?, ?, ?)
-        """,
-        (trackable_id, status or "not started", notes),
+def stage_relationships(cur: sqlite3.Cursor, relationships: Iterable[Dict[str, Any]]) -> None:
+    cur.executemany(
+        "INSERT INTO stage_relationships VALUES (?, ?, ?)",
+        ((r["source_name"], r["target_name"], r["relation"]) for r in relationships),
     )
 
-def upsert_language(cur: sqlite3.Cursor, lang: Dict[str, Any]) -> None:
-    name = lang["name"]
 
-    trackable_id = upsert_trackable(
-        cur,
-        name=name,
-        trackable_type="language",
-        description=lang.get("description"),
+def apply_trackables(cur: sqlite3.Cursor) -> None:
+    """
+    Upsert staged trackables with their language_info and progress rows.
+    """
+    # `WHERE true` keeps the parser from reading ON CONFLICT as a join clause.
+    cur.execute(
+        """
+        INSERT INTO trackables (name, type, description)
+        SELECT name, type, description FROM stage_trackables WHERE true
+        ON CONFLICT(name, type) DO UPDATE SET description = excluded.description
+        """
     )
+    cur.execute(
+        """
+        INSERT INTO language_info (trackable_id, version, documentation_url)
+        SELECT t.id, s.version, s.documentation_url
+        FROM stage_trackables s
+        JOIN trackables t ON t.name = s.name AND t.type = s.type
+        WHERE s.type = 'language'
+        ON CONFLICT(trackable_id) DO UPDATE SET
+            version = excluded.version,
+            documentation_url = excluded.documentation_url
+        """
+    )
+    cur.execute(
+        """
+        INSERT INTO trackable_progress (trackable_id, status, notes)
+        SELECT t.id, COALESCE(s.status, 'not started'), s.notes
+        FROM stage_trackables s
+        JOIN trackables t ON t.name = s.name AND t.type = s.type
+        WHERE s.status IS NOT NULL OR s.notes IS NOT NULL
+        ON CONFLICT(trackable_id) DO UPDATE SET
+            status = excluded.status,
+            notes = excluded.notes
+        """
+    )
+
 
-    # language_info
+def apply_trackable_tags(cur: sqlite3.Cursor, tags: TagRegistry) -> List[str]:
+    """
+    Create missing tags and make each staged trackable's tag links match its
+    `tags` list. Returns the names of the tags that were created.
+    """
     cur.execute(
         """
-        INSERT OR REPLACE INTO language_info (trackable_id, version, documentation_url)
-        VALUES (?, ?, ?)
-        """,
-        (
-            trackable_id,
-            lang.get("version"),
-            lang.get("documentation_url"),
-        ),
-    )
-    if trackable_id:
-        upsert_trackable_tags(cur, trackable_id, lang.get("tags"))
-        upsert_trackable_progress(cur, trackable_id, lang.get("status"), lang.get("notes"))
-
-def upsert_concept(cur: sqlite3.Cursor, concept: Dict[str, Any]) -> None:
-    name = concept["name"]
-    trackable_type = concept.get("type", "concept")  # "concept" or "kata"
-
-    trackable_id = upsert_trackable(
-        cur,
-        name=name,
-        trackable_type=trackable_type,
-        description=concept.get("description"),
-    )
-
-    if trackable_id:
-        upsert_trackable_tags(cur, trackable_id, concept.get("tags"))
-        upsert_trackable_progress(
-            cur,
-            trackable_id,
-            concept.get("status"),
-            concept.get("notes"),
+        DELETE FROM trackable_tags
+        WHERE trackable_id IN (
+            SELECT t.id FROM stage_trackables s
+            JOIN trackables t ON t.name = s.name AND t.type = s.type
         )
+        """
+    )
+    links = cur.execute(
+        """
+        SELECT t.id, s.tag
+        FROM stage_trackable_tags s
+        JOIN trackables t ON t.name = s.name AND t.type = s.type
+        """
+    ).fetchall()
+    added = tags.ensure(tag for _, tag in links)
+    cur.executemany(
+        "INSERT OR IGNORE INTO trackable_tags (trackable_id, tag_id) VALUES (?, ?)",
+        ((trackable_id, tags[tag]) for trackable_id, tag in links),
+    )
+    return added
+
 
-def upsert_kata(cur: sqlite3.Cursor, kata: Dict[str, Any]) -> None:
-    trackable_id = upsert_trackable(
-        cur,
-        name=kata["name"],
-        trackable_type="kata",
-        description=kata.get("description"),
-    )
-
-    if trackable_id:
-        upsert_trackable_tags(cur, trackable_id, kata.get("tags"))
-        upsert_trackable_progress(
-            cur,
-            trackable_id,
-            kata.get("status"),
-            kata.get("notes"),
+def apply_relationships(cur: sqlite3.Cursor) -> List[Tuple[str, str, str]]:
+    """
+    Link staged relationships by trackable name (the lowest id wins when a
+    name exists under several types). Returns the (source, target, relation)
+    rows skipped because a name did not resolve.
+    """
+    cur.execute(
+        """
+        INSERT OR IGNORE INTO trackable_relationships (source_id, target_id, relation)
+        SELECT source_id, target_id, relation
+        FROM (
+            SELECT
+                (SELECT MIN(id) FROM trackables WHERE name = r.source_name) AS source_id,
+                (SELECT MIN(id) FROM trackables WHERE name = r.target_name) AS target_id,
+                r.relation
+            FROM stage_relationships r
         )
+        WHERE source_id IS NOT NULL AND target_id IS NOT NULL
+        """
+    )
+    return cur.execute(
+        """
+        SELECT r.source_name, r.target_name, r.relation
+        FROM stage_relationships r
+        WHERE NOT EXISTS (SELECT 1 FROM trackables WHERE name = r.source_name)
+           OR NOT EXISTS (SELECT 1 FROM trackables WHERE name = r.target_name)
+        """
+    ).fetchall()
 
-def upsert_example(cur: sqlite3.Cursor, example: Dict[str, Any]) -> None:
-    language_name = example["language"]
-    concept_name = example["concept"]
 
-    cur.execute(
+def delete_trackables(cur: sqlite3.Cursor, keys: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """
+    Delete trackables given as (type, name) with their tags, progress,
+    language info and relationships. Trackables that examples or kata
+    attempts still point at are kept and returned as (type, name).
+    """
+    cur.executemany(
         """
-        SELECT id FROM trackables
-        WHERE name = ? AND type = 'language'
+        INSERT OR IGNORE INTO stage_trackable_deletes (id, name, type)
+        SELECT id, name, type FROM trackables WHERE type = ? AND name = ?
         """,
-        (language_name,),
+        keys,
     )
-    lang_row = cur.fetchone()
-    if not lang_row:
-        print(f"⚠️ Language trackable not found: {language_name}")
-        return
-    language_trackable_id = lang_row[0]
+    kept = cur.execute(
+        """
+        DELETE FROM stage_trackable_deletes
+        WHERE id IN (SELECT language_trackable_id FROM examples)
+           OR id IN (SELECT concept_trackable_id FROM examples)
+           OR id IN (SELECT kata_trackable_id FROM solution_attempts)
+           OR id IN (SELECT kata_trackable_id FROM kata_benchmarks)
+        RETURNING type, name
+        """
+    ).fetchall()
 
+    doomed = "SELECT id FROM stage_trackable_deletes"
+    cur.execute(f"DELETE FROM trackable_tags WHERE trackable_id IN ({doomed})")
+    cur.execute(f"DELETE FROM trackable_progress WHERE trackable_id IN ({doomed})")
+    cur.execute(f"DELETE FROM language_info WHERE trackable_id IN ({doomed})")
     cur.execute(
+        f"DELETE FROM trackable_relationships WHERE source_id IN ({doomed}) OR target_id IN ({doomed})"
+    )
+    cur.execute(f"DELETE FROM trackables WHERE id IN ({doomed})")
+    return sorted(kept)
+
+
+def deleted_trackable_names(cur: sqlite3.Cursor) -> Set[str]:
+    return {row[0] for row in cur.execute("SELECT name FROM stage_trackable_deletes")}
+
+
+def delete_relationships(cur: sqlite3.Cursor, relationships: Iterable[Tuple[str, str, str]]) -> None:
+    """
+    Delete relationships given as (source name, relation, target name).
+    """
+    cur.executemany(
         """
-        SELECT id FROM trackables
-        WHERE name = ? AND type IN ('concept', 'kata')
+        DELETE FROM trackable_relationships
+        WHERE source_id = (SELECT MIN(id) FROM trackables WHERE name = ?)
+          AND relation = ?
+          AND target_id = (SELECT MIN(id) FROM trackables WHERE name = ?)
         """,
-        (concept_name,),
+        relationships,
     )
-    concept_row = cur.fetchone()
-    if not concept_row:
-        print(f"⚠️ Concept/kata trackable not found: {concept_name}")
-        return
-    concept_trackable_id = concept_row[0]
 
-    cur.execute(
-        """
-        INSERT OR REPLACE INTO examples (
-            id,
-            language_trackable_id,
-            concept_trackable_id,
-            code_snippet,
-            explanation
+
+def _trackable_ids(cur: sqlite3.Cursor) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    name -> id for languages, and for concepts and katas together. The lowest
+    id wins when a name exists under several types.
+    """
+    languages: Dict[str, int] = {}
+    concepts: Dict[str, int] = {}
+    rows = cur.execute(
+        "SELECT id, name, type FROM trackables WHERE type IN ('language', 'concept', 'kata') ORDER BY id DESC"
+    )
+    for trackable_id, name, trackable_type in rows:
+        (languages if trackable_type == "language" else concepts)[name] = trackable_id
+    return languages, concepts
+
+
+def apply_examples(cur: sqlite3.Cursor, examples: Iterable[Dict[str, Any]], tags: TagRegistry) -> List[str]:
+    """
+    Upsert examples and make their tag links match their `tags` lists.
+    Examples with an `id` are upserted on it; one without is matched on
+    (language, concept, code_snippet) so re-ingesting it does not add a copy.
+    Names must already resolve (validation checks that). Returns the names
+    of the tags that were created.
+    """
+    languages, concepts = _trackable_ids(cur)
+    keyed: List[Tuple[Any, ...]] = []
+    unkeyed: List[Tuple[Tuple[Any, ...], List[str]]] = []
+    example_tags: List[Tuple[Any, List[str]]] = []
+    for example in examples:
+        row = (
+            languages[example["language"]],
+            concepts[example["concept"]],
+            example["code_snippet"],
+            example.get("explanation"),
         )
+        if example.get("id") is not None:
+            keyed.append((example["id"], *row))
+            example_tags.append((example["id"], example.get("tags") or []))
+        else:
+            unkeyed.append((row, example.get("tags") or []))
+
+    # Explicit ids first: an id-less insert takes the next free id, which
+    # must not be one an example in the file is about to claim.
+    cur.executemany(
+        """
+        INSERT INTO examples (id, language_trackable_id, concept_trackable_id, code_snippet, explanation)
         VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            language_trackable_id = excluded.language_trackable_id,
+            concept_trackable_id = excluded.concept_trackable_id,
+            code_snippet = excluded.code_snippet,
+            explanation = excluded.explanation
         """,
-        (
-            example.get("id"),
-            language_trackable_id,
-            concept_trackable_id,
-            example["code_snippet"],
-            example.get("explanation"),
-        ),
+        keyed,
     )
-
-    example_id = example.get("id")
-    if not example_id:
-        cur.execute("SELECT last_insert_rowid()")
-        example_id = cur.fetchone()[0]
-
-    for tag in example.get("tags", []):
-        cur.execute("INSERT OR IGNORE INTO tags (name) VALUES (?)", (tag,))
-        cur.execute("SELECT id FROM tags WHERE name = ?", (tag,))
-        tag_id = cur.fetchone()[0]
-        cur.execute(
+    for row, names in unkeyed:
+        found = cur.execute(
             """
-            INSERT OR IGNORE INTO example_tags (example_id, tag_id)
-            VALUES (?, ?)
+            SELECT id FROM examples
+            WHERE language_trackable_id = ? AND concept_trackable_id = ? AND code_snippet = ?
             """,
-            (example_id, tag_id),
-        )
+            row[:3],
+        ).fetchone()
+        if found:
+            example_id = found[0]
+            cur.execute("UPDATE examples SET explanation = ? WHERE id = ?", (row[3], example_id))
+        else:
+            cur.execute(
+                """
+                INSERT INTO examples (language_trackable_id, concept_trackable_id, code_snippet, explanation)
+                VALUES (?, ?, ?, ?)
+                """,
+                row,
+            )
+            example_id = cur.lastrowid
+        example_tags.append((example_id, names))
 
-def upsert_relationships(cur: sqlite3.Cursor, relationships: List[Dict[str, Any]]) -> None:
-    for r in relationships:
-        cur.execute("SELECT id FROM trackables WHERE name = ?", (r["source_name"],))
-        source = cur.fetchone()
-        cur.execute("SELECT id FROM trackables WHERE name = ?", (r["target_name"],))
-        target = cur.fetchone()
+    cur.executemany("DELETE FROM example_tags WHERE example_id = ?", ((i,) for i, _ in example_tags))
 
-        if source and target:
-            cur.execute(
+    added = tags.ensure(tag for _, names in example_tags for tag in names)
+    cur.executemany(
+        "INSERT OR IGNORE INTO example_tags (example_id, tag_id) VALUES (?, ?)",
+        ((example_id, tags[tag]) for example_id, names in example_tags for tag in names),
+    )
+    return added
+
+
+def delete_examples(cur: sqlite3.Cursor, keys: Iterable[Any]) -> None:
+    """
+    Delete examples given by id, or by [language, concept, code_snippet] for
+    ones that had no id in the YAML, with their tag links.
+    """
+    ids: List[int] = []
+    for key in keys:
+        if isinstance(key, int):
+            ids.append(key)
+            continue
+        language, concept, code_snippet = key
+        ids.extend(
+            row[0]
+            for row in cur.execute(
                 """
-                INSERT OR IGNORE INTO trackable_relationships (source_id, target_id, relation)
-                VALUES (?, ?, ?)
+                SELECT e.id FROM examples e
+                JOIN trackables l ON l.id = e.language_trackable_id
+                JOIN trackables c ON c.id = e.concept_trackable_id
+                WHERE l.name = ? AND l.type = 'language'
+                  AND c.name = ? AND c.type IN ('concept', 'kata')
+                  AND e.code_snippet = ?
                 """,
-                (source[0], target[0], r["relation"]),
+                (language, concept, code_snippet),
             )
-        else:
-            print(f"⚠️ Relationship skipped (missing trackable): {r}")
+        )
+    cur.executemany("DELETE FROM example_tags WHERE example_id = ?", ((i,) for i in ids))
+    cur.executemany("DELETE FROM examples WHERE id = ?", ((i,) for i in ids))
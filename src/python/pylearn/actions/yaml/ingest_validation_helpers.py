@@ -1,5 +1,14 @@
-from typing import Any, Dict, List
-from .yaml_helpers import load_yaml
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+import yaml
+
+from ...config import VALIDATION_WORKERS
+from . import yaml_helpers
+from .yaml_helpers import YamlFile, prime_yaml_cache, read_yaml_file
 
 VALID_STATUSES = {"not started", "in progress", "mastered", "abandoned"}
 VALID_RELATIONS = {"uses", "includes", "depends_on", "implements"}
@@ -8,16 +17,17 @@ def validate_example(example: Dict[str, Any]) -> str | None:
     """
     Validate example shape only (required fields, tag types).
 
-    We do NOT hit the DB here anymore because:
-    - legacy `languages` / `concepts` tables are gone
-    - trackable existence is enforced later by upsert_example
+    Whether the language and concept exist is checked across files by
+    reference_errors, against a NameIndex.
     """
     missing = []
-    for field in ["language", "concept", "code_snippet"]:
-        if field not in example:
-            missing.append(field)
+    for name in ["language", "concept", "code_snippet"]:
+        if name not in example:
+            missing.append(name)
     if missing:
         return f"Missing fields in example: {', '.join(missing)}"
+    if "id" in example and not isinstance(example["id"], int):
+        return f"'id' must be an integer in example: {example['id']!r}"
 
     # tags validation (type only)
     if "tags" in example:
@@ -83,7 +93,7 @@ VALIDATOR_MAP = {
     },
     "kata": {
         "func": validate_kata,
-        "path": "kata.yaml",
+        "path": "katas.yaml",
     },
     "relationship": {
         "func": validate_relationship,
@@ -91,6 +101,120 @@ VALIDATOR_MAP = {
     },
 }
 
+TRACKABLE_VALIDATORS = ["language", "concept", "kata"]
+EXAMPLE_CONCEPT_TYPES = {"concept", "kata"}
+
+
+class NameIndex:
+    """
+    Trackable name -> the types it exists under, for checking references
+    without a database round trip per row.
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[str, str]] = ()):
+        self._types: Dict[str, Set[str]] = defaultdict(set)
+        for trackable_type, name in pairs:
+            self._types[name].add(trackable_type)
+
+    def add_items(self, items: Iterable[Dict[str, Any]], default_type: str) -> None:
+        for item in items:
+            self._types[item["name"]].add(item.get("type", default_type))
+
+    def has(self, name: str, types: Set[str] | None = None) -> bool:
+        found = self._types.get(name)
+        return bool(found) and (types is None or not found.isdisjoint(types))
+
+
+def reference_errors(
+    filename: str,
+    items: List[Dict[str, Any]],
+    lines: List[int] | None,
+    index: NameIndex,
+    fail_fast: bool = False,
+) -> List[str]:
+    """
+    Examples whose language or concept, and relationships whose source or
+    target, are not in `index`. Other files have no references to check.
+    """
+    if filename == VALIDATOR_MAP["example"]["path"]:
+        def missing(item):
+            if not index.has(item["language"], {"language"}):
+                return f"Unknown language '{item['language']}' in example"
+            if not index.has(item["concept"], EXAMPLE_CONCEPT_TYPES):
+                return f"Unknown concept or kata '{item['concept']}' in example"
+            return None
+    elif filename == VALIDATOR_MAP["relationship"]["path"]:
+        def missing(item):
+            for end in ("source_name", "target_name"):
+                if not index.has(item[end]):
+                    return (
+                        f"Unknown trackable '{item[end]}' in relationship "
+                        f"{item['source_name']} -{item['relation']}-> {item['target_name']}"
+                    )
+            return None
+    else:
+        return []
+
+    errors: List[str] = []
+    lines = lines or []
+    for i, item in enumerate(items):
+        err = missing(item)
+        if err:
+            errors.append(f"{filename}:{lines[i]}: {err}" if i < len(lines) else f"{filename}: {err}")
+            if fail_fast:
+                break
+    return errors
+
+
+# Below this many bytes in total the files are validated in-process: starting
+# a pool costs more than parsing them.
+PARALLEL_MIN_BYTES = 1 << 20
+ORDER = ["language", "concept", "kata", "example", "relationship"]
+
+
+@dataclass
+class FileReport:
+    filename: str
+    errors: List[str] = field(default_factory=list)
+    entry: YamlFile | None = None
+
+
+def _path(filename: str) -> Path:
+    return yaml_helpers.YAML_DIR / filename
+
+
+def validate_file(filename: str, path: Path, fail_fast: bool = False) -> FileReport:
+    """
+    Parse and validate one YAML file. Errors read "file:line: message"; with
+    `fail_fast` only the first is collected. Runs in worker processes, so it
+    takes the full path rather than relying on YAML_DIR.
+    """
+    report = FileReport(filename)
+    try:
+        report.entry = read_yaml_file(path)
+    except yaml.YAMLError as exc:
+        mark = getattr(exc, "problem_mark", None)
+        where = f"{filename}:{mark.line + 1}" if mark else filename
+        report.errors.append(f"{where}: {getattr(exc, 'problem', None) or exc}")
+        return report
+
+    items = report.entry.data or []
+    if not isinstance(items, list):
+        report.errors.append(f"{filename}: expected a list of items, got {type(items).__name__}")
+        return report
+
+    validator = next(cfg["func"] for cfg in VALIDATOR_MAP.values() if cfg["path"] == filename)
+    lines = report.entry.lines or []
+    for i, item in enumerate(items):
+        err = validator(item) if isinstance(item, dict) else f"expected a mapping, got {item!r}"
+        if err:
+            where = f"{filename}:{lines[i]}" if i < len(lines) else filename
+            report.errors.append(f"{where}: {err}")
+            if fail_fast:
+                break
+    return report
+
+
 def validate_one(validator_name: str) -> List[str]:
     """
     Validate a single YAML file type (example, language, concept, relationship).
@@ -99,32 +223,80 @@ def validate_one(validator_name: str) -> List[str]:
     if validator_name not in VALIDATOR_MAP:
         raise ValueError(f"Unknown validator: {validator_name}")
 
-    cfg = VALIDATOR_MAP[validator_name]
-    items = load_yaml(cfg["path"]) or []
-    errors: List[str] = []
+    filename = VALIDATOR_MAP[validator_name]["path"]
+    return validate_file(filename, _path(filename)).errors
 
-    for item in items:
-        err = cfg["func"](item)  # type: ignore[arg-type]
-        if err:
-            errors.append(err)
 
-    return errors
+def _validate_in_pool(files: List[str], fail_fast: bool, workers: int) -> Dict[str, FileReport]:
+    reports: Dict[str, FileReport] = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+        futures = [pool.submit(validate_file, f, _path(f), fail_fast) for f in files]
+        for future in as_completed(futures):
+            report = future.result()
+            reports[report.filename] = report
+            if fail_fast and report.errors:
+                # Files that have not started are dropped; those already
+                # being parsed finish, since killing a worker mid-task can
+                # leave the pool's queues locked.
+                pool.shutdown(cancel_futures=True)
+                break
+    return reports
 
-def validate_all() -> List[str]:
+
+def validate_all(
+    files: Iterable[str] | None = None,
+    fail_fast: bool = False,
+    workers: int = VALIDATION_WORKERS,
+    index: NameIndex | None = None,
+) -> List[str]:
     """
-    Validate all YAML files defined in VALIDATOR_MAP.
-    Returns a combined list of error strings.
+    Parse and validate the YAML files in VALIDATOR_MAP, or only those named
+    in `files`. Large inputs are spread over a process pool, one file per
+    worker; the parsed data is handed back so later load_yaml calls do not
+    parse again. With `fail_fast` validation stops at the first error.
+
+    Once every file is well-formed, examples and relationships are checked
+    against the trackables of the validated files plus whatever `index`
+    already holds (names that exist outside them); `index` is extended in
+    place. Returns the errors in file order.
     """
-    errors: List[str] = []
+    wanted = set(files) if files is not None else None
+    ordered = [
+        VALIDATOR_MAP[name]["path"]
+        for name in ORDER
+        if (wanted is None or VALIDATOR_MAP[name]["path"] in wanted)
+        and _path(VALIDATOR_MAP[name]["path"]).exists()
+    ]
 
-    order = ["language", "concept", "kata", "example", "relationship"]
+    size = sum(_path(f).stat().st_size for f in ordered)
+    if workers > 1 and len(ordered) > 1 and size >= PARALLEL_MIN_BYTES:
+        reports = _validate_in_pool(ordered, fail_fast, workers)
+    else:
+        reports = {}
+        for filename in ordered:
+            reports[filename] = validate_file(filename, _path(filename), fail_fast)
+            if fail_fast and reports[filename].errors:
+                break
 
-    for name in order:
-        cfg = VALIDATOR_MAP[name]
-        items = load_yaml(cfg["path"]) or []
-        for item in items:
-            err = cfg["func"](item)
-            if err:
-                errors.append(err)
+    errors: List[str] = []
+    for filename in ordered:
+        report = reports.get(filename)
+        if report is None:
+            continue
+        if report.entry is not None:
+            prime_yaml_cache(_path(filename), report.entry)
+        errors.extend(report.errors)
+    if errors or len(reports) < len(ordered):
+        return errors[:1] if fail_fast else errors
 
+    index = index if index is not None else NameIndex()
+    for name in TRACKABLE_VALIDATORS:
+        filename = VALIDATOR_MAP[name]["path"]
+        if filename in reports:
+            index.add_items(reports[filename].entry.data or [], name)
+    for filename in ordered:
+        entry = reports[filename].entry
+        errors.extend(reference_errors(filename, entry.data or [], entry.lines, index, fail_fast))
+        if fail_fast and errors:
+            return errors[:1]
     return errors
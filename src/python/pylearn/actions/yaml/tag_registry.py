@@ -0,0 +1,49 @@
+"""
+Tag name -> id for one ingest or CLI session.
+
+The whole `tags` table is read once; after that every lookup is a dict hit,
+and names not seen before are created in bulk.
+"""
+import sqlite3
+from typing import Dict, Iterable, List
+
+# Rows per multi-row INSERT, well under SQLite's bound-parameter limit.
+INSERT_CHUNK = 500
+
+
+class TagRegistry:
+    def __init__(self, cur: sqlite3.Cursor):
+        self._cur = cur
+        self._ids: Dict[str, int] = dict(cur.execute("SELECT name, id FROM tags"))
+        self.created: List[str] = []
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def __getitem__(self, name: str) -> int:
+        return self._ids[name]
+
+    def ensure(self, names: Iterable[str]) -> List[str]:
+        """
+        Make sure every name in `names` has a tag row. Returns the names that
+        were created, sorted.
+        """
+        missing = sorted({name for name in names if name not in self._ids})
+        for start in range(0, len(missing), INSERT_CHUNK):
+            chunk = missing[start:start + INSERT_CHUNK]
+            rows = self._cur.execute(
+                f"""
+                INSERT INTO tags (name) VALUES {", ".join("(?)" for _ in chunk)}
+                ON CONFLICT(name) DO NOTHING
+                RETURNING name, id
+                """,
+                chunk,
+            ).fetchall()
+            self._ids.update(rows)
+        # Rows another connection added since we loaded the table.
+        raced = [name for name in missing if name not in self._ids]
+        for name in raced:
+            self._ids[name] = self._cur.execute("SELECT id FROM tags WHERE name = ?", (name,)).fetchone()[0]
+        created = [name for name in missing if name not in raced]
+        self.created.extend(created)
+        return created
@@ -1,11 +1,8 @@
-import sqlite3
-from ...config import DB_PATH
+from ...db import get_connection
+from .tag_registry import TagRegistry
 from .yaml_helpers import load_yaml
 
 def add_missing_tags_from_concepts() -> None:
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-
     concepts = load_yaml("concepts.yaml") or []
     tag_set = set()
 
@@ -13,20 +10,15 @@ def add_missing_tags_from_concepts() -> None:
         tags = concept.get("tags") or []
         tag_set.update(tags)
 
-    cur.execute("SELECT name FROM tags")
-    existing = {row[0] for row in cur.fetchall()}
-
-    missing = tag_set - existing
-    if not missing:
-        print("✅ All tags already exist in the database.")
-        conn.close()
-        return
+    with get_connection() as conn:
+        tags = TagRegistry(conn.cursor())
+        missing = [tag for tag in tag_set if tag not in tags]
+        if not missing:
+            print("✅ All tags already exist in the database.")
+            return
 
-    print(f"🔍 Found {len(missing)} missing tags...")
-    for tag in sorted(missing):
-        cur.execute("INSERT OR IGNORE INTO tags (name) VALUES (?)", (tag,))
-        print(f"✅ Inserted tag: {tag}")
+        print(f"🔍 Found {len(missing)} missing tags...")
+        for tag in tags.ensure(missing):
+            print(f"✅ Inserted tag: {tag}")
 
-    conn.commit()
-    conn.close()
     print("✅ Tag insertion complete.")
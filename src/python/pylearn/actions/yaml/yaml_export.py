@@ -1,9 +1,10 @@
-import sqlite3
+import json
 import zipfile
 from datetime import date
 
-from ...config import DB_PATH, YAML_DIR
-from .yaml_helpers import write_yaml
+from ...config import YAML_DIR
+from ...db import get_connection
+from .yaml_helpers import iter_rows, write_yaml_stream
 
 
 def export_languages(cur):
@@ -12,11 +13,11 @@ def export_languages(cur):
             t.id, t.name, t.description,
             li.version, li.documentation_url
         FROM trackables t
-        JOIN language_info li ON t.id = li.trackable_id
+        LEFT JOIN language_info li ON t.id = li.trackable_id
         WHERE t.type = 'language'
+        ORDER BY t.id
     """)
-    rows = cur.fetchall()
-    languages = [
+    languages = (
         {
             "id": row[0],
             "name": row[1],
@@ -24,106 +25,83 @@ def export_languages(cur):
             "version": row[3],
             "documentation_url": row[4],
         }
-        for row in rows
-    ]
-    write_yaml("languages.yaml", languages)
+        for row in iter_rows(cur)
+    )
+    write_yaml_stream("languages.yaml", languages)
+
+
+# Tag names of the row aliased `t`, as a JSON array in link order.
+TRACKABLE_TAGS = """
+    (SELECT json_group_array(name) FROM (
+        SELECT g.name FROM trackable_tags tt
+        JOIN tags g ON g.id = tt.tag_id
+        WHERE tt.trackable_id = t.id
+        ORDER BY tt.tag_id
+    ))
+"""
+
+
+def _trackables_with_tags_and_progress(cur, trackable_type: str, extra: str = ""):
+    """
+    One pass over trackables of `trackable_type` with their tags and progress
+    (plus any `extra` select columns), ordered by id.
+    """
+    cur.execute(
+        f"""
+        SELECT
+            t.id, t.name, t.description,
+            {TRACKABLE_TAGS},
+            CASE WHEN p.trackable_id IS NULL THEN 'not started' ELSE p.status END,
+            p.notes
+            {extra}
+        FROM trackables t
+        LEFT JOIN trackable_progress p ON p.trackable_id = t.id
+        WHERE t.type = ?
+        ORDER BY t.id
+        """,
+        (trackable_type,),
+    )
+    return iter_rows(cur)
 
 
 def export_concepts(cur):
-    cur.execute("""
-        SELECT id, name, description
-        FROM trackables
-        WHERE type = 'concept'
-    """)
-    concepts = []
-    for trackable_id, name, description in cur.fetchall():
-        cur.execute(
-            """
-            SELECT tags.name
-            FROM trackable_tags
-            JOIN tags ON tags.id = trackable_tags.tag_id
-            WHERE trackable_tags.trackable_id = ?
-        """,
-            (trackable_id,),
-        )
-        tags = [row[0] for row in cur.fetchall()]
-
-        cur.execute(
-            """
-            SELECT status, notes
-            FROM trackable_progress
-            WHERE trackable_id = ?
-        """,
-            (trackable_id,),
-        )
-        progress = cur.fetchone() or ("not started", None)
-
-        concepts.append(
-            {
-                "id": trackable_id,
-                "name": name,
-                "description": description,
-                "tags": tags or None,
-                "status": progress[0],
-                "notes": progress[1],
-            }
-        )
-    write_yaml("concepts.yaml", concepts)
+    concepts = (
+        {
+            "id": trackable_id,
+            "name": name,
+            "description": description,
+            "tags": json.loads(tags) or None,
+            "status": status,
+            "notes": notes,
+        }
+        for trackable_id, name, description, tags, status, notes
+        in _trackables_with_tags_and_progress(cur, "concept")
+    )
+    write_yaml_stream("concepts.yaml", concepts)
 
 def export_katas(cur):
-    cur.execute("""
-        SELECT id, name, description
-        FROM trackables
-        WHERE type = 'kata'
-    """)
-    katas = []
-    for trackable_id, name, description in cur.fetchall():
-        # tags
-        cur.execute(
-            """
-            SELECT tags.name
-            FROM trackable_tags
-            JOIN tags ON tags.id = trackable_tags.tag_id
-            WHERE trackable_tags.trackable_id = ?
-            """,
-            (trackable_id,),
-        )
-        tags = [row[0] for row in cur.fetchall()]
-
-        cur.execute(
-            """
-            SELECT status, notes
-            FROM trackable_progress
-            WHERE trackable_id = ?
-            """,
-            (trackable_id,),
-        )
-        status, notes = cur.fetchone() or ("not started", None)
-
-        cur.execute(
-            """
-            SELECT tgt.name
-            FROM trackable_relationships r
-            JOIN trackables tgt ON r.target_id = tgt.id
-            WHERE r.source_id = ? AND r.relation = 'implements'
-            """,
-            (trackable_id,),
-        )
-        concepts = [row[0] for row in cur.fetchall()]
-
-        katas.append(
-            {
-                "id": trackable_id,
-                "name": name,
-                "description": description,
-                "concepts": concepts or None,
-                "tags": tags or None,
-                "status": status,
-                "notes": notes,
-            }
-        )
-
-    write_yaml("katas.yaml", katas)
+    implements = """,
+        (SELECT json_group_array(name) FROM (
+            SELECT tgt.name FROM trackable_relationships r
+            JOIN trackables tgt ON tgt.id = r.target_id
+            WHERE r.source_id = t.id AND r.relation = 'implements'
+            ORDER BY r.target_id
+        ))
+    """
+    katas = (
+        {
+            "id": trackable_id,
+            "name": name,
+            "description": description,
+            "concepts": json.loads(concepts) or None,
+            "tags": json.loads(tags) or None,
+            "status": status,
+            "notes": notes,
+        }
+        for trackable_id, name, description, tags, status, notes, concepts
+        in _trackables_with_tags_and_progress(cur, "kata", implements)
+    )
+    write_yaml_stream("katas.yaml", katas)
 
 def export_examples(cur):
     cur.execute("""
@@ -132,7 +110,13 @@ def export_examples(cur):
             lang_t.name AS language,
             concept_t.name AS concept,
             e.code_snippet,
-            e.explanation
+            e.explanation,
+            (SELECT json_group_array(name) FROM (
+                SELECT tags.name FROM example_tags
+                JOIN tags ON example_tags.tag_id = tags.id
+                WHERE example_tags.example_id = e.id
+                ORDER BY example_tags.tag_id
+            )) AS tags
         FROM examples e
         JOIN trackables AS lang_t
           ON e.language_trackable_id = lang_t.id
@@ -141,36 +125,24 @@ def export_examples(cur):
         -- optional safety filters:
         -- WHERE lang_t.type = 'language'
         --   AND concept_t.type IN ('concept', 'kata')
+        ORDER BY e.id
     """)
-    examples = []
-    rows = cur.fetchall()
-    for row in rows:
-        example_id, language, concept, code_snippet, explanation = row
-
-        cur.execute(
-            """
-            SELECT tags.name
-            FROM example_tags
-            JOIN tags ON example_tags.tag_id = tags.id
-            WHERE example_tags.example_id = ?
-            """,
-            (example_id,),
-        )
-        tags = [r[0] for r in cur.fetchall()]
-
-        example = {
-            "id": example_id,
-            "language": language,
-            "concept": concept,
-            "code_snippet": code_snippet,
-            "explanation": explanation,
-        }
-        if tags:
-            example["tags"] = tags
+    write_yaml_stream("examples.yaml", (_example_item(*row) for row in iter_rows(cur)))
+
 
-        examples.append(example)
+def _example_item(example_id, language, concept, code_snippet, explanation, tags):
+    example = {
+        "id": example_id,
+        "language": language,
+        "concept": concept,
+        "code_snippet": code_snippet,
+        "explanation": explanation,
+    }
+    tags = json.loads(tags)
+    if tags:
+        example["tags"] = tags
+    return example
 
-    write_yaml("examples.yaml", examples)
 
 def export_trackable_relationships(cur):
     cur.execute("""
@@ -180,7 +152,7 @@ def export_trackable_relationships(cur):
         JOIN trackables src ON r.source_id = src.id
         JOIN trackables tgt ON r.target_id = tgt.id
     """)
-    relationships = [
+    relationships = (
         {
             "source_id": row[0],
             "source_name": row[1],
@@ -188,31 +160,31 @@ def export_trackable_relationships(cur):
             "target_name": row[3],
             "relation": row[4],
         }
-        for row in cur.fetchall()
-    ]
-    write_yaml("trackable_relationships.yaml", relationships)
+        for row in iter_rows(cur)
+    )
+    write_yaml_stream("trackable_relationships.yaml", relationships)
 
 
 def export_tags(cur):
     cur.execute("SELECT id, name FROM tags ORDER BY id")
-    tags = [{"id": row[0], "name": row[1]} for row in cur.fetchall()]
-    write_yaml("tags.yaml", tags)
+    tags = ({"id": row[0], "name": row[1]} for row in iter_rows(cur))
+    write_yaml_stream("tags.yaml", tags)
 
 
 def export_all(zip_after: bool = False):
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-
     YAML_DIR.mkdir(parents=True, exist_ok=True)
 
-    export_languages(cur)
-    export_concepts(cur)
-    export_katas(cur)
-    export_tags(cur)
-    export_examples(cur)
-    export_trackable_relationships(cur)
+    with get_connection() as conn:
+        cur = conn.cursor()
+        # One read transaction: every file sees the same snapshot.
+        cur.execute("BEGIN")
+        export_languages(cur)
+        export_concepts(cur)
+        export_katas(cur)
+        export_tags(cur)
+        export_examples(cur)
+        export_trackable_relationships(cur)
 
-    conn.close()
     print(f"✅ Export complete. Files saved to '{YAML_DIR}' directory.")
 
     if zip_after:
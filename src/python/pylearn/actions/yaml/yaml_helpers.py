@@ -1,16 +1,160 @@
+import hashlib
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
 import yaml
 
 from ...config import YAML_DIR
 
+# LibYAML's C parser and emitter when PyYAML was built with it; the pure-Python
+# ones otherwise. Both accept and produce the same documents.
+try:
+    from yaml import CSafeDumper as YamlDumper, CSafeLoader as YamlLoader
+except ImportError:  # PyYAML without LibYAML
+    from yaml import SafeDumper as YamlDumper, SafeLoader as YamlLoader
+
+# Rows fetched from a cursor, and list items handed to yaml.dump, at a time.
+STREAM_BATCH_SIZE = 500
+
+
+def digest_bytes(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@dataclass
+class YamlFile:
+    """
+    One YAML file as read from disk. `lines` holds the 1-based line of each
+    item when the document is a top-level list, for error messages.
+    """
+
+    stat: Tuple[int, int]  # (mtime_ns, size) the entry was read at
+    digest: str
+    data: Any = None
+    lines: List[int] | None = None
+    parsed: bool = False
+
+
+# Per-process cache so validation, ingest and friends parse each file once per
+# command. Entries are dropped when the file's mtime or size changes.
+_cache: Dict[Path, YamlFile] = {}
+
+
+def _stat_key(path: Path) -> Tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _parse(raw: bytes) -> Tuple[Any, List[int] | None]:
+    """
+    Same result as yaml.load, plus the line of each top-level list item; the
+    node tree is built either way, so the lines come for free.
+    """
+    loader = YamlLoader(raw)
+    try:
+        node = loader.get_single_node()
+        if node is None:
+            return None, None
+        lines = [item.start_mark.line + 1 for item in node.value] if isinstance(node, yaml.SequenceNode) else None
+        return loader.construct_document(node), lines
+    finally:
+        loader.dispose()
+
+
+def _cached(path: Path, parse: bool) -> YamlFile:
+    stat = _stat_key(path)
+    entry = _cache.get(path)
+    if entry is None or entry.stat != stat:
+        raw = path.read_bytes()
+        entry = YamlFile(stat, digest_bytes(raw))
+        if parse:
+            entry.data, entry.lines = _parse(raw)
+            entry.parsed = True
+        _cache[path] = entry
+    elif parse and not entry.parsed:
+        entry.data, entry.lines = _parse(path.read_bytes())
+        entry.parsed = True
+    return entry
+
+
+def read_yaml_file(path: Path) -> YamlFile:
+    """
+    Parsed entry for `path`, through the cache. Raises yaml.YAMLError on
+    malformed input.
+    """
+    return _cached(path, parse=True)
+
+
+def prime_yaml_cache(path: Path, entry: YamlFile) -> None:
+    """
+    Adopt an entry parsed elsewhere (e.g. in a worker process) if the file
+    has not changed since.
+    """
+    if entry.parsed and path.exists() and _stat_key(path) == entry.stat:
+        _cache[path] = entry
+
 
 def load_yaml(filename: str):
+    """
+    Parsed contents of YAML_DIR / filename. Repeated calls within a command
+    return the same object, so treat it as read-only.
+    """
+    return _cached(YAML_DIR / filename, parse=True).data
+
+
+def yaml_digest(filename: str) -> str | None:
+    """
+    Content hash of YAML_DIR / filename without parsing it, or None if the
+    file does not exist.
+    """
     path = YAML_DIR / filename
-    with path.open("r") as f:
-        return yaml.safe_load(f)
+    if not path.exists():
+        return None
+    return _cached(path, parse=False).digest
+
+
+def _forget(path: Path) -> None:
+    _cache.pop(path, None)
 
 
 def write_yaml(filename: str, data):
     path = YAML_DIR / filename
     YAML_DIR.mkdir(parents=True, exist_ok=True)
     with path.open("w") as f:
-        yaml.dump(data, f, sort_keys=False, allow_unicode=True)
+        yaml.dump(data, f, Dumper=YamlDumper, sort_keys=False, allow_unicode=True)
+    _forget(path)
+
+
+def iter_rows(cur, size: int = STREAM_BATCH_SIZE) -> Iterator[tuple]:
+    """
+    Rows of an executed cursor, fetched `size` at a time.
+    """
+    while rows := cur.fetchmany(size):
+        yield from rows
+
+
+def write_yaml_stream(filename: str, items: Iterable[Any]) -> int:
+    """
+    Write `items` as a top-level YAML list without holding them all in memory.
+
+    Each batch is dumped as its own list; block-style list items do not depend
+    on their neighbours, so the file matches write_yaml(filename, list(items)).
+    The file is written next to the target and renamed into place. Returns the
+    number of items written.
+    """
+    path = YAML_DIR / filename
+    YAML_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    items = iter(items)
+    count = 0
+    with tmp_path.open("w") as f:
+        while batch := list(islice(items, STREAM_BATCH_SIZE)):
+            yaml.dump(batch, f, Dumper=YamlDumper, sort_keys=False, allow_unicode=True)
+            count += len(batch)
+        if count == 0:
+            yaml.dump([], f, Dumper=YamlDumper, sort_keys=False, allow_unicode=True)
+    tmp_path.replace(path)
+    _forget(path)
+    return count
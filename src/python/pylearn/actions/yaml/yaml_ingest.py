@@ -1,63 +1,208 @@
-import sqlite3
+import json
+from functools import partial
 
-from ...config import DB_PATH
+from ...db import get_connection
+from .ingest_ledger import (
+    diff_records,
+    example_key,
+    file_digest,
+    forget_relationships_of,
+    ledger_keys,
+    parse_key,
+    relationship_key,
+    set_file_digest,
+    trackable_key,
+    trackables_outside,
+    write_ledger,
+)
 from .ingest_upsert_helpers import (
-    upsert_concept,
-    upsert_language,
-    upsert_relationships,
-    upsert_kata
+    apply_examples,
+    apply_relationships,
+    apply_trackable_tags,
+    apply_trackables,
+    create_staging_tables,
+    delete_examples,
+    delete_relationships,
+    delete_trackables,
+    deleted_trackable_names,
+    stage_relationships,
+    stage_trackables,
 )
-from .ingest_validation_helpers import validate_all
-from .yaml_helpers import load_yaml
+from .ingest_validation_helpers import NameIndex, validate_all
+from .tag_registry import TagRegistry
+from .yaml_helpers import load_yaml, yaml_digest
+
+# YAML file -> trackable type of its records (a concept may override it).
+TRACKABLE_FILES = {
+    "languages.yaml": "language",
+    "concepts.yaml": "concept",
+    "katas.yaml": "kata",
+}
+EXAMPLES_FILE = "examples.yaml"
+RELATIONSHIPS_FILE = "trackable_relationships.yaml"
+# Suffix on a file digest whose records did not all resolve; such a file is
+# re-read whenever trackables change, since they may now resolve.
+PENDING = ":pending"
+
+# Print individual names up to this many; beyond it only the count.
+REPORT_LIMIT = 20
+
+
+def _report(lines: list[str], more: str) -> None:
+    for line in lines[:REPORT_LIMIT]:
+        print(line)
+    if len(lines) > REPORT_LIMIT:
+        print(more.format(len(lines) - REPORT_LIMIT))
+
+
+def _trackable_item_key(default_type: str, item: dict) -> str:
+    return trackable_key(item.get("type", default_type), item["name"])
+
+
+def _changed_files(cur, full: bool) -> dict:
+    """
+    The ingest files whose bytes differ from the last ingest (all of them
+    with `full`), as filename -> digest. Nothing is parsed yet.
+    """
+    digests = {}
+    for filename in [*TRACKABLE_FILES, EXAMPLES_FILE, RELATIONSHIPS_FILE]:
+        digest = yaml_digest(filename)
+        if digest is None:
+            print(f"⚠️ {filename} not found; leaving its records untouched.")
+            continue
+        stored = file_digest(cur, filename)
+        retry = stored == digest + PENDING and any(f in TRACKABLE_FILES for f in digests)
+        if not full and stored in (digest, digest + PENDING) and not retry:
+            continue
+        digests[filename] = digest
+    return digests
+
+
+def _validate(cur, files: list[str], fail_fast: bool) -> list[str]:
+    """
+    Check the changed files, including that every example and relationship
+    points at a trackable that will exist once they are applied. Nothing is
+    written before this passes.
+    """
+    changed_trackable_files = [f for f in files if f in TRACKABLE_FILES]
+    index = NameIndex(trackables_outside(cur, changed_trackable_files))
+    errors = validate_all(files, fail_fast=fail_fast, index=index)
+    if errors or not changed_trackable_files or RELATIONSHIPS_FILE in files:
+        return errors
 
+    # The relationships file is unchanged, but a trackable it links may be gone.
+    for record_key in ledger_keys(cur, RELATIONSHIPS_FILE):
+        source, relation, target = parse_key(record_key)
+        for name in (source, target):
+            if not index.has(name):
+                errors.append(
+                    f"{RELATIONSHIPS_FILE}: {source} -{relation}-> {target} still uses "
+                    f"'{name}', which is no longer in the trackable files"
+                )
+                break
+        if fail_fast and errors:
+            break
+    return errors
 
-def insert_missing_tags(cur, concepts):
-    tag_set = set()
-    for concept in concepts:
-        for tag in concept.get("tags") or []:
-            tag_set.add(tag)
 
-    if not tag_set:
-        return
+def ingest_all(full: bool = False, fail_fast: bool = False):
+    """
+    Sync the YAML files into the database.
 
-    cur.execute("SELECT name FROM tags")
-    existing = {row[0] for row in cur.fetchall()}
-    missing = tag_set - existing
+    Files whose content hash matches the last ingest are skipped unparsed, and
+    in a changed file only new, changed or removed records are applied; the
+    ingest ledger tables hold the hashes. `full` re-applies every record.
+    `fail_fast` stops validation at the first error.
+    """
+    with get_connection() as conn:
+        cur = conn.cursor()
+        digests = _changed_files(cur, full)
+        if not digests:
+            print("✅ Nothing to ingest: YAML files unchanged since the last ingest.")
+            return
 
-    for tag in sorted(missing):
-        cur.execute("INSERT INTO tags (name) VALUES (?)", (tag,))
-        print(f"✅ Added missing tag: {tag}")
+        print(f"🔍 Validating {', '.join(digests)}...")
+        errors = _validate(cur, list(digests), fail_fast)
+        if errors:
+            print("❌ Validation failed. Fix the following issues:")
+            for err in errors:
+                print(f"  - {err}")
+            return
+        print("✅ Validation passed. Proceeding with ingestion...\n")
+        # Validation parsed the files; these are cache hits.
+        loaded = {filename: load_yaml(filename) or [] for filename in digests}
 
+        create_staging_tables(cur)
 
-def ingest_all():
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
+        # Trackables: stage what changed, then drop what disappeared. A record
+        # that moved between files is in some file's current keys, so keep it.
+        diffs = []
+        current_keys = set()
+        for filename, default_type in TRACKABLE_FILES.items():
+            if filename not in loaded:
+                continue
+            key = partial(_trackable_item_key, default_type)
+            diff = diff_records(cur, filename, loaded[filename], key, full)
+            stage_trackables(cur, diff.changed, default_type)
+            current_keys.update(diff.digests)
+            diffs.append(diff)
+            print(f"📄 {filename}: {len(diff.changed)} new or changed, {len(diff.deleted)} removed.")
 
-    print("🔍 Validating data...")
-    errors = validate_all()
-    if errors:
-        print("❌ Validation failed. Fix the following issues:")
-        for err in errors:
-            print(f"  - {err}")
-        conn.close()
-        return
-    print("✅ Validation passed. Proceeding with ingestion...\n")
+        apply_trackables(cur)
+        tags = TagRegistry(cur)
+        apply_trackable_tags(cur, tags)
 
-    for lang in load_yaml("languages.yaml"):
-        upsert_language(cur, lang)
+        # Examples before trackable deletes, so removing an example frees the
+        # concept it pointed at in the same run.
+        if EXAMPLES_FILE in loaded:
+            diff = diff_records(cur, EXAMPLES_FILE, loaded[EXAMPLES_FILE], example_key, full)
+            delete_examples(cur, [json.loads(k) for k in diff.deleted])
+            apply_examples(cur, diff.changed, tags)
+            write_ledger(cur, EXAMPLES_FILE, diff.changed_digests(), diff.deleted)
+            print(f"📄 {EXAMPLES_FILE}: {len(diff.changed)} new or changed, {len(diff.deleted)} removed.")
 
-    concepts = load_yaml("concepts.yaml") or []
-    katas = load_yaml("katas.yaml") or []
-    insert_missing_tags(cur, (concepts + katas))
+        doomed = sorted({k for d in diffs for k in d.deleted if k not in current_keys})
+        kept = delete_trackables(cur, [parse_key(k) for k in doomed])
+        removed_names = deleted_trackable_names(cur)
+        # Kept trackables stay in the ledger, so they are reported again next time.
+        still_known = {trackable_key(t, n) for t, n in kept}
+        for diff in diffs:
+            write_ledger(cur, diff.source, diff.changed_digests(), [k for k in diff.deleted if k not in still_known])
 
-    for concept in concepts:
-        upsert_concept(cur, concept)
+        # Relationships pointing at removed trackables were deleted with them;
+        # forget them in the ledger so a later ingest can restore them.
+        if removed_names:
+            forget_relationships_of(cur, RELATIONSHIPS_FILE, removed_names)
+            set_file_digest(cur, RELATIONSHIPS_FILE, None)
 
-    for kata in katas:
-        upsert_kata(cur, kata)
+        skipped = []
+        if RELATIONSHIPS_FILE in loaded:
+            diff = diff_records(cur, RELATIONSHIPS_FILE, loaded[RELATIONSHIPS_FILE], relationship_key, full)
+            delete_relationships(cur, [parse_key(k) for k in diff.deleted])
+            stage_relationships(cur, diff.changed)
+            skipped = apply_relationships(cur)
+            # Unresolved relationships stay out of the ledger so they are retried.
+            for source, target, relation in skipped:
+                unresolved = {"source_name": source, "target_name": target, "relation": relation}
+                diff.digests.pop(relationship_key(unresolved), None)
+            write_ledger(cur, RELATIONSHIPS_FILE, diff.changed_digests(), diff.deleted)
+            print(
+                f"📄 {RELATIONSHIPS_FILE}: {len(diff.changed)} new or changed, "
+                f"{len(diff.deleted)} removed."
+            )
+            if skipped:
+                digests[RELATIONSHIPS_FILE] += PENDING
 
-    upsert_relationships(cur, load_yaml("trackable_relationships.yaml"))
+        for filename, digest in digests.items():
+            set_file_digest(cur, filename, digest)
 
-    conn.commit()
-    conn.close()
-    print("✅ Ingest complete.")
+    _report([f"✅ Added missing tag: {tag}" for tag in sorted(tags.created)], "✅ ... and {} more tags.")
+    _report(
+        [f"⚠️ Kept {t} '{n}': examples or kata attempts still use it." for t, n in kept],
+        "⚠️ ... and {} more kept.",
+    )
+    _report(
+        [f"⚠️ Relationship skipped (missing trackable): {s} -{r}-> {t}" for s, t, r in skipped],
+        "⚠️ ... and {} more relationships skipped.",
+    )
+    print(f"✅ Ingest complete{' (full)' if full else ''}.")
@@ -1,19 +1,20 @@
 import argparse
 
-from .actions.trackables import list_items, show_status, update_progress
-from .actions.kata.handle_kata import handle_kata
-from .actions.kata.enter_dojo import enter_dojo
-from .actions.concepts import show_concept
-from .actions.yaml.yaml_ingest import ingest_all
-from .actions.yaml.yaml_export import export_all
+from .config import KATA_CPU_LIMIT, KATA_MEMORY_LIMIT_MB, KATA_TIMEOUT, REGRESSION_MARGIN
+from .migrations import MigrationError
+
+# Handlers are imported inside their `case` so a command only loads what it
+# runs: `pylearn list` should not pay for PyYAML, the test runner or the
+# benchmark harness.
 
 def build_parser() -> argparse.ArgumentParser:
-    valid_choices = ["list", "show", "run", "status", "progress", "kata", "yaml-ingest", "yaml-export"]
+    valid_choices = ["list", "show", "run", "status", "progress", "kata", "yaml-ingest", "yaml-export", "worker", "db", "search", "shell", "batch"]
     parser = argparse.ArgumentParser(prog="pylearn")
     parser.add_argument("command", choices=valid_choices, help="Command to execute")
+    parser.add_argument("target", nargs="?", help="db action (migrate, snapshot, restore), search query, or batch file ('-' for stdin)")
 
     parser.add_argument("--type")      # for list/status/progress
-    parser.add_argument("--name")      # concept/kata/project name
+    parser.add_argument("--name", action="append", dest="names")  # concept/kata/project name; progress takes several
     parser.add_argument("--language")  # optional language filter
     parser.add_argument("--update")    # progress update target name (or use --name)
     parser.add_argument("--status")    # new status for progress
@@ -21,58 +22,140 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--answer", action="store_true")
     parser.add_argument("--edit", action="store_true")
     parser.add_argument("--dojo", action="store_true")
+    parser.add_argument("--verify-all", action="store_true")  # kata: re-test every stored solution
+    parser.add_argument("--bench", action="store_true")  # kata: scaling benchmark (all specs without --name)
+    parser.add_argument("--timeout", type=float, default=KATA_TIMEOUT)  # kata: wall-clock seconds
+    parser.add_argument("--cpu-limit", type=int, default=KATA_CPU_LIMIT)  # kata: CPU seconds
+    parser.add_argument("--memory-limit", type=int, default=KATA_MEMORY_LIMIT_MB)  # kata: MiB of address space
+    parser.add_argument("--full", action="store_true")  # yaml-ingest: re-apply every record
+    parser.add_argument("--fail-fast", action="store_true")  # yaml-ingest: stop validating at the first error
+    parser.add_argument("--perf", action="store_true")  # status: fastest attempt per kata
+    parser.add_argument("--margin", type=float, default=REGRESSION_MARGIN)  # status --perf: allowed slowdown (0.2 = 20%)
+    parser.add_argument("--limit", type=int)  # list/status/show: rows per page
+    parser.add_argument("--offset", type=int, default=0)  # list/status/show: rows to skip
+    parser.add_argument("--after")  # list/status: last name of the previous page (type:name for status without --type)
+    parser.add_argument("--format", choices=["text", "json", "tsv"], default="text")  # list/status/show: json is one object per line
+    parser.add_argument("--path")  # db snapshot/restore: snapshot file; progress: CSV/YAML of name,type,status,notes
 
     return parser
 
-def main():
+def main(argv: list[str] | None = None):
     parser = build_parser()
-    args = parser.parse_args()
+    try:
+        dispatch(parser.parse_args(argv))
+    except MigrationError as exc:
+        # Every command opens the database, so a migration that cannot apply
+        # would otherwise end each one in a traceback.
+        print(f"❌ Could not bring the database up to date: {exc}")
+        print("ℹ️ The failed step was rolled back; the database is still at its previous version.")
+        raise SystemExit(1)
+
+
+def dispatch(args: argparse.Namespace) -> None:
+    # Every command but progress takes one --name; the last one given wins.
+    args.name = args.names[-1] if args.names else None
 
     match args.command:
         case "list":
             if not args.type:
                 print("❌ --type is required for 'list' (language|concept|kata|project).")
             else:
-                list_items(args.type)
+                from .actions.output import Page
+                from .actions.trackables import list_items
+                list_items(args.type, Page(args.limit, args.offset, args.after), args.format)
 
         case "show":
             if not args.name:
                 print("❌ --name (concept name) is required for 'show'.")
+            elif args.after is not None:
+                print("❌ --after pages 'list' and 'status'; use --offset for 'show'.")
             else:
-                show_concept(args.name, args.language)
+                from .actions.concepts import show_concept
+                from .actions.output import Page
+                show_concept(args.name, args.language, Page(args.limit, args.offset), args.format)
 
         case "run":
             # hook for future "run script/project"
             print("not implemented")
 
         case "status":
-            show_status(args.type)
+            if args.perf:
+                from .actions.kata.attempts import show_perf_status
+                show_perf_status(args.margin)
+            else:
+                from .actions.output import Page
+                from .actions.trackables import show_status
+                show_status(args.type, Page(args.limit, args.offset, args.after), args.format)
 
         case "progress":
-            target_name = args.update or args.name
-            if not (target_name and args.type and args.status):
-                print("❌ progress requires --type, --status, and --update or --name.")
+            names = ([args.update] if args.update else []) + (args.names or [])
+            if args.path:
+                from .actions.trackables import read_progress_file, update_progress_many
+                rows = read_progress_file(args.path)
+                if rows is not None:
+                    update_progress_many(rows + [{"name": n} for n in names], args.type, args.status)
+            elif not (names and args.type and args.status):
+                print("❌ progress requires --type, --status, and --update or --name (or --path with a CSV/YAML file).")
+            elif len(names) > 1:
+                from .actions.trackables import update_progress_many
+                update_progress_many([{"name": n} for n in names], args.type, args.status)
             else:
-                update_progress(target_name, args.type, args.status)
+                from .actions.trackables import update_progress
+                update_progress(names[0], args.type, args.status)
 
         case "kata":
-            if not (args.name and args.language) and not args.dojo:
+            from .actions.kata.limits import ResourceLimits
+            limits = ResourceLimits(
+                wall_seconds=args.timeout,
+                cpu_seconds=args.cpu_limit,
+                memory_mb=args.memory_limit,
+            )
+            if args.verify_all:
+                from .actions.kata.verify_all import verify_all
+                verify_all(limits)
+            elif args.bench:
+                from .actions.kata.handle_bench import handle_bench
+                handle_bench(args.name, args.language or "python", args.file, limits)
+            elif not (args.name and args.language) and not args.dojo:
                 print("❌ kata requires --name and --language.")
             else:
                 if args.dojo:
-                    enter_dojo()
+                    from .actions.kata.enter_dojo import enter_dojo
+                    enter_dojo(limits)
                 else:
+                    from .actions.kata.handle_kata import handle_kata
                     handle_kata(
                         args.name,
                         args.language,
                         args.file,
                         args.answer,
+                        limits,
                     )
 
         case "yaml-ingest":#️⃣
-            ingest_all()
+            from .actions.yaml.yaml_ingest import ingest_all
+            ingest_all(full=args.full, fail_fast=args.fail_fast)
         case "yaml-export":#️⃣
+            from .actions.yaml.yaml_export import export_all
             export_all(zip_after=False)
+        case "worker":
+            from .actions.kata.test_worker import serve
+            serve()
+        case "db":
+            from .actions.database import handle_db
+            handle_db(args.target, args.path)
+        case "search":
+            if not args.target:
+                print('❌ search requires a query, e.g. pylearn search "binary search".')
+            else:
+                from .actions.search import search
+                search(args.target, args.language)
+        case "shell":
+            from .actions.batch import shell
+            shell()
+        case "batch":
+            from .actions.batch import run_batch
+            run_batch(args.target or "-")
 
 if __name__ == "__main__":
     main()
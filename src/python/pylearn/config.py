@@ -1,15 +1,97 @@
+"""
+Paths and settings, resolved once at import.
+
+Each setting comes from, in order: its POLYGLOT_* environment variable, the
+TOML file named by POLYGLOT_CONFIG, then the default under the project root.
+
+The project root itself is found by walking up from the package to the
+first pyproject.toml. The answer is cached in a small state file keyed by
+where the package is installed, so later runs read one file instead of
+probing every parent directory.
+"""
 from pathlib import Path
+import json
 import os
 
-_THIS_FILE = Path(__file__).resolve()
+# Directory containing the `pylearn` package (src/python in a checkout); what
+# must be on PYTHONPATH for subprocesses to import pylearn.
+PACKAGE_ROOT = Path(os.path.abspath(__file__)).parent.parent
+
+STATE_FILE = Path(
+    os.environ.get(
+        "POLYGLOT_STATE_FILE",
+        Path(os.environ.get("XDG_STATE_HOME", "~/.local/state")) / "polyglot" / "layout.json",
+    )
+).expanduser()
+
+
+def _load_config_file() -> dict:
+    path = os.environ.get("POLYGLOT_CONFIG")
+    if not path:
+        return {}
+    import tomllib
+
+    with open(Path(path).expanduser(), "rb") as f:
+        return tomllib.load(f)
+
+
+def _discover_project_root() -> Path:
+    for parent in PACKAGE_ROOT.resolve().parents:
+        if (parent / "pyproject.toml").exists():
+            return parent
+    return PACKAGE_ROOT.parents[1]
+
+
+def _read_state() -> dict:
+    try:
+        return json.loads(STATE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _cached_project_root() -> Path:
+    """
+    The project root recorded for this install location, discovering and
+    recording it on first use. A state file that cannot be written only
+    costs the walk again next time.
+    """
+    key = str(PACKAGE_ROOT)
+    state = _read_state()
+    if key in state:
+        return Path(state[key])
+
+    root = _discover_project_root()
+    state[key] = str(root)
+    try:
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = STATE_FILE.with_name(f"{STATE_FILE.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(state, indent=2))
+        tmp.replace(STATE_FILE)
+    except OSError:
+        pass
+    return root
+
+
+_FILE = _load_config_file()
+
+
+def _setting(name: str, default):
+    """
+    POLYGLOT_<NAME> from the environment, else `name` from the config file,
+    else `default`.
+    """
+    env = os.environ.get(f"POLYGLOT_{name.upper()}")
+    if env is not None:
+        return env
+    return _FILE.get(name, default)
+
+
+def _path_setting(name: str, default) -> Path:
+    return Path(_setting(name, default)).expanduser()
+
 
-PROJECT_ROOT: Path | None = None
-for parent in _THIS_FILE.parents:
-    if (parent / "pyproject.toml").exists():
-        PROJECT_ROOT = parent
-        break
-if PROJECT_ROOT is None:
-    PROJECT_ROOT = _THIS_FILE.parents[3]
+_root = _setting("project_root", None)
+PROJECT_ROOT: Path = Path(_root).expanduser() if _root else _cached_project_root()
 
 # Dev defaults
 DEV_DB_DEFAULT         = PROJECT_ROOT / "src" / "shared" / "db" / "polyglot.db"
@@ -17,10 +99,17 @@ DEV_YAML_DIR_DEFAULT   = PROJECT_ROOT / "src" / "shared" / "yaml"
 DEV_LANGUAGES_ROOT     = PROJECT_ROOT / "src" / "languages"      # adjust if needed
 DEV_KATAS_DIR_DEFAULT  = PROJECT_ROOT / "src" / "python" / "katas"
 
-DB_PATH        = Path(os.environ.get("POLYGLOT_DB_PATH", DEV_DB_DEFAULT)).expanduser()
-YAML_DIR       = Path(os.environ.get("POLYGLOT_YAML_DIR", DEV_YAML_DIR_DEFAULT)).expanduser()
-LANGUAGES_ROOT = Path(os.environ.get("POLYGLOT_LANGUAGES_ROOT", DEV_LANGUAGES_ROOT)).expanduser()
-KATAS_DIR      = PROJECT_ROOT / "README" / "katas"
+DB_PATH        = _path_setting("db_path", DEV_DB_DEFAULT)
+YAML_DIR       = _path_setting("yaml_dir", DEV_YAML_DIR_DEFAULT)
+LANGUAGES_ROOT = _path_setting("languages_root", DEV_LANGUAGES_ROOT)
+KATAS_DIR      = _path_setting("katas_dir", PROJECT_ROOT / "README" / "katas")
 TESTS_DIR = PROJECT_ROOT / "src" / "python" / "tests" / "katas"
-PYTHON_KATAS_DIR = PROJECT_ROOT / "src" / "python" / "katas"
-DEFAULT_EDITOR = os.environ.get("POLYGLOT_DEFAULT_EDITOR", "vim")
+PYTHON_KATAS_DIR = _path_setting("python_katas_dir", DEV_KATAS_DIR_DEFAULT)
+BENCH_DIR = PROJECT_ROOT / "src" / "python" / "tests" / "benchmarks"
+DEFAULT_EDITOR = _setting("default_editor", "vim")
+KATA_TIMEOUT   = float(_setting("kata_timeout", 10))
+KATA_CPU_LIMIT = int(_setting("kata_cpu_limit", 10))
+KATA_MEMORY_LIMIT_MB = int(_setting("kata_memory_limit_mb", 1024))
+REGRESSION_MARGIN = float(_setting("regression_margin", 0.2))
+WORKER_SOCKET  = _path_setting("worker_socket", PROJECT_ROOT / "build" / "pylearn-worker.sock")
+VALIDATION_WORKERS = int(_setting("validation_workers", os.cpu_count() or 1))
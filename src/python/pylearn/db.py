@@ -1,5 +1,128 @@
+import atexit
+import os
 import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
 from .config import DB_PATH
+from .migrations import migrate
+
+# Applied to every connection when it is opened. WAL lets readers (a second
+# pylearn, a dashboard) keep reading while a writer commits; NORMAL sync is
+# durable across application crashes in WAL mode and skips an fsync per commit.
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA cache_size = -65536",  # KiB, i.e. 64 MiB of page cache
+    "PRAGMA mmap_size = 268435456",  # 256 MiB
+    "PRAGMA temp_store = MEMORY",
+)
+STATEMENT_CACHE_SIZE = 256
+
+
+class Connection(sqlite3.Connection):
+    """
+    sqlite3.Connection whose `with` blocks become savepoints while grouped()
+    is active: a failing block still rolls back only its own writes, but
+    nothing is committed until the group ends.
+    """
+
+    grouped = False
+
+    def __enter__(self):
+        if self.grouped:
+            self.execute("SAVEPOINT pylearn_block")
+        return super().__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.grouped:
+            return super().__exit__(exc_type, exc, tb)
+        if exc_type is not None:
+            self.execute("ROLLBACK TO pylearn_block")
+        self.execute("RELEASE pylearn_block")
+        return False
+
+
+@contextmanager
+def grouped(conn: Connection) -> Iterator[Connection]:
+    """
+    Run many `with get_connection()` blocks as one transaction, committed
+    when the group ends (rolled back if it raises). Batch mode uses this to
+    pay for one commit per group instead of one per command.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN")
+    conn.grouped = True
+    try:
+        yield conn
+    except BaseException:
+        conn.grouped = False
+        conn.rollback()
+        raise
+    conn.grouped = False
+    conn.commit()
+
+
+_local = threading.local()
+_opened: list[tuple[int, sqlite3.Connection]] = []
+_opened_lock = threading.Lock()
+
+
+def _connect(path: Path) -> Connection:
+    conn = sqlite3.connect(path, cached_statements=STATEMENT_CACHE_SIZE, factory=Connection)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    for version, description in migrate(conn):
+        # stderr, so a migration does not end up inside --format json/tsv output.
+        print(f"🛠️  Migrated database to version {version}: {description}", file=sys.stderr)
+    return conn
+
+
+def get_connection(path: Path | None = None) -> Connection:
+    """
+    The shared connection to `path` (default DB_PATH) for this process and
+    thread, opened, configured and migrated to the latest schema on first use.
+
+    Use it as `with get_connection() as db:` — the block commits on success
+    and rolls back on error, and the connection stays open for the next call.
+    Forked children (test workers, benchmarks) get their own connection
+    instead of reusing the parent's.
+    """
+    path = Path(path or DB_PATH)
+    pid = os.getpid()
+    if getattr(_local, "pid", None) != pid:
+        _local.pid = pid
+        _local.connections = {}
+
+    conn = _local.connections.get(path)
+    if conn is None:
+        conn = _connect(path)
+        _local.connections[path] = conn
+        with _opened_lock:
+            _opened.append((pid, conn))
+    return conn
+
+
+def close_connections() -> None:
+    """
+    Close every connection this process opened, checkpointing the WAL.
+    Connections inherited across a fork are left to their owner.
+    """
+    pid = os.getpid()
+    with _opened_lock:
+        connections = [conn for owner, conn in _opened if owner == pid]
+        _opened[:] = [(owner, conn) for owner, conn in _opened if owner != pid]
+    for conn in connections:
+        try:
+            conn.close()
+        except sqlite3.ProgrammingError:
+            pass  # owned by another thread that is still running
+    _local.__dict__.clear()
+
 
-def get_connection() -> sqlite3.Connection:
-    return sqlite3.connect(DB_PATH)
+atexit.register(close_connections)
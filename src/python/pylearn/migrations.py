@@ -0,0 +1,468 @@
+"""
+Versioned schema for the polyglot database.
+
+MIGRATIONS[i] brings a database from `PRAGMA user_version` i to i + 1. The
+first one creates the whole schema with IF NOT EXISTS, so a database built
+before migrations existed (user_version 0, e.g. from the old schema.sql) is
+adopted and then gets the later steps. Append new steps; never edit one that
+has shipped. src/shared/db/schema.sql is generated from these (see
+`schema_sql`); regenerate it after adding a step.
+"""
+from __future__ import annotations
+
+import sqlite3
+import textwrap
+from typing import Callable, List, Tuple
+
+# A step is a SQL statement, or a function for what SQL alone cannot decide.
+Step = str | Callable[[sqlite3.Connection], None]
+Migration = Tuple[str, List[Step]]
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> set:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _adopt_legacy_examples(conn: sqlite3.Connection) -> None:
+    """
+    Databases built from the old schema.sql keep examples.language_id and
+    concept_id (NOT NULL, pointing at the old languages and concepts tables)
+    next to the trackable columns, so no insert that omits them succeeds.
+    Fill in the trackable ids from the old tables by name, creating the
+    trackables they lack, then rebuild the table without the old columns.
+    """
+    if "language_id" not in _table_columns(conn, "examples"):
+        return
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for legacy_table, column, trackable_types in (
+        ("languages", "language", ("language",)),
+        ("concepts", "concept", ("concept", "kata")),
+    ):
+        if legacy_table not in tables:
+            continue
+        types = ", ".join(f"'{t}'" for t in trackable_types)
+        conn.execute(
+            f"""
+            INSERT INTO trackables (name, type, description)
+            SELECT DISTINCT o.name, '{trackable_types[0]}', o.description
+            FROM {legacy_table} o
+            JOIN examples e ON e.{column}_id = o.id AND e.{column}_trackable_id IS NULL
+            WHERE NOT EXISTS (SELECT 1 FROM trackables t WHERE t.name = o.name AND t.type IN ({types}))
+            """
+        )
+        conn.execute(
+            f"""
+            UPDATE examples SET {column}_trackable_id = (
+                SELECT MIN(t.id) FROM {legacy_table} o
+                JOIN trackables t ON t.name = o.name AND t.type IN ({types})
+                WHERE o.id = examples.{column}_id
+            )
+            WHERE {column}_trackable_id IS NULL
+            """
+        )
+    conn.execute(EXAMPLES_TABLE.replace("IF NOT EXISTS examples", "examples_rebuilt"))
+    conn.execute(
+        """
+        INSERT INTO examples_rebuilt (id, language_trackable_id, concept_trackable_id, code_snippet, explanation)
+        SELECT id, language_trackable_id, concept_trackable_id, code_snippet, explanation FROM examples
+        """
+    )
+    conn.execute("DROP TABLE examples")
+    conn.execute("ALTER TABLE examples_rebuilt RENAME TO examples")
+
+
+EXAMPLES_TABLE = """
+            CREATE TABLE IF NOT EXISTS examples (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                language_trackable_id INTEGER NOT NULL,
+                concept_trackable_id INTEGER NOT NULL,
+                code_snippet TEXT NOT NULL,
+                explanation TEXT,
+                FOREIGN KEY (language_trackable_id) REFERENCES trackables(id),
+                FOREIGN KEY (concept_trackable_id) REFERENCES trackables(id)
+            )
+            """
+
+# Trackables sharing a (name, type) collapse into the lowest id; rows that
+# pointed at the others move to it, keeping the survivor's own row where
+# both have one.
+MERGE_DUPLICATE_TRACKABLES: List[Step] = [
+    """
+    CREATE TEMP TABLE trackable_merge AS
+    SELECT t.id AS old_id, k.keep_id AS new_id
+    FROM trackables t
+    JOIN (
+        SELECT name, type, MIN(id) AS keep_id FROM trackables
+        GROUP BY name, type HAVING COUNT(*) > 1
+    ) k ON k.name = t.name AND k.type = t.type AND t.id <> k.keep_id
+    """,
+    *(
+        f"""
+        INSERT OR IGNORE INTO {table} ({column}, {rest})
+        SELECT m.new_id, {rest} FROM {table} x JOIN temp.trackable_merge m ON m.old_id = x.{column}
+        """
+        for table, column, rest in (
+            ("trackable_progress", "trackable_id", "status, notes"),
+            ("language_info", "trackable_id", "version, documentation_url"),
+            ("trackable_tags", "trackable_id", "tag_id"),
+        )
+    ),
+    *(
+        f"DELETE FROM {table} WHERE trackable_id IN (SELECT old_id FROM temp.trackable_merge)"
+        for table in ("trackable_progress", "language_info", "trackable_tags")
+    ),
+    *(
+        f"""
+        UPDATE examples SET {column} = (SELECT new_id FROM temp.trackable_merge WHERE old_id = {column})
+        WHERE {column} IN (SELECT old_id FROM temp.trackable_merge)
+        """
+        for column in ("language_trackable_id", "concept_trackable_id")
+    ),
+    """
+    INSERT OR IGNORE INTO trackable_relationships (source_id, target_id, relation)
+    SELECT COALESCE(s.new_id, r.source_id), COALESCE(t.new_id, r.target_id), r.relation
+    FROM trackable_relationships r
+    LEFT JOIN temp.trackable_merge s ON s.old_id = r.source_id
+    LEFT JOIN temp.trackable_merge t ON t.old_id = r.target_id
+    WHERE s.old_id IS NOT NULL OR t.old_id IS NOT NULL
+    """,
+    """
+    DELETE FROM trackable_relationships
+    WHERE source_id IN (SELECT old_id FROM temp.trackable_merge)
+       OR target_id IN (SELECT old_id FROM temp.trackable_merge)
+    """,
+    "DELETE FROM trackables WHERE id IN (SELECT old_id FROM temp.trackable_merge)",
+    "DROP TABLE temp.trackable_merge",
+]
+
+MIGRATIONS: List[Migration] = [
+    (
+        "base schema",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS trackables (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                type TEXT NOT NULL CHECK (type IN ('language', 'concept', 'kata', 'project')),
+                description TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS language_info (
+                trackable_id INTEGER PRIMARY KEY,
+                version TEXT,
+                documentation_url TEXT,
+                FOREIGN KEY (trackable_id) REFERENCES trackables(id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS tags (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                description TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS trackable_tags (
+                trackable_id INTEGER NOT NULL,
+                tag_id INTEGER NOT NULL,
+                PRIMARY KEY (trackable_id, tag_id),
+                FOREIGN KEY (trackable_id) REFERENCES trackables(id),
+                FOREIGN KEY (tag_id) REFERENCES tags(id)
+            )
+            """,
+            EXAMPLES_TABLE,
+            _adopt_legacy_examples,
+            """
+            CREATE TABLE IF NOT EXISTS example_tags (
+                example_id INTEGER NOT NULL,
+                tag_id INTEGER NOT NULL,
+                PRIMARY KEY (example_id, tag_id),
+                FOREIGN KEY (example_id) REFERENCES examples(id),
+                FOREIGN KEY (tag_id) REFERENCES tags(id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS trackable_progress (
+                trackable_id INTEGER PRIMARY KEY,
+                status TEXT CHECK (status IN ('not started', 'in progress', 'mastered', 'abandoned'))
+                    DEFAULT 'not started',
+                notes TEXT,
+                FOREIGN KEY (trackable_id) REFERENCES trackables(id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS trackable_relationships (
+                source_id INTEGER NOT NULL,
+                target_id INTEGER NOT NULL,
+                relation TEXT NOT NULL CHECK (relation IN ('uses', 'includes', 'depends_on', 'implements')),
+                PRIMARY KEY (source_id, target_id, relation),
+                FOREIGN KEY (source_id) REFERENCES trackables(id),
+                FOREIGN KEY (target_id) REFERENCES trackables(id)
+            )
+            """,
+        ],
+    ),
+    (
+        "indexes for lookup paths",
+        [
+            # The unique index below needs (name, type) to be unique already.
+            *MERGE_DUPLICATE_TRACKABLES,
+            # Lookups by (name, type) and by name alone; also makes the pair unique.
+            "CREATE UNIQUE INDEX IF NOT EXISTS trackables_name_type ON trackables(name, type)",
+            # list/status: WHERE type = ? ORDER BY name, covering id.
+            "CREATE INDEX IF NOT EXISTS trackables_type_name ON trackables(type, name)",
+            # Solutions and examples per concept, optionally by language and explanation.
+            """
+            CREATE INDEX IF NOT EXISTS examples_concept_language
+            ON examples(concept_trackable_id, language_trackable_id, explanation)
+            """,
+            # trackable_tags / example_tags are already keyed by their owner;
+            # these serve the reverse direction (everything with a tag).
+            "CREATE INDEX IF NOT EXISTS trackable_tags_tag ON trackable_tags(tag_id, trackable_id)",
+            "CREATE INDEX IF NOT EXISTS example_tags_tag ON example_tags(tag_id, example_id)",
+            """
+            CREATE INDEX IF NOT EXISTS relationships_source_relation
+            ON trackable_relationships(source_id, relation, target_id)
+            """,
+            "CREATE INDEX IF NOT EXISTS relationships_target ON trackable_relationships(target_id)",
+        ],
+    ),
+    (
+        "kata benchmarks and solution attempts",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS kata_benchmarks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kata_trackable_id INTEGER NOT NULL,
+                language_trackable_id INTEGER NOT NULL,
+                code_hash TEXT NOT NULL,
+                expected TEXT,
+                exponent REAL,
+                flagged INTEGER NOT NULL DEFAULT 0,
+                profile TEXT NOT NULL,
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (kata_trackable_id) REFERENCES trackables(id),
+                FOREIGN KEY (language_trackable_id) REFERENCES trackables(id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS solution_attempts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kata_trackable_id INTEGER NOT NULL,
+                language_trackable_id INTEGER NOT NULL,
+                code_snippet TEXT NOT NULL,
+                runtime_seconds REAL,
+                test_seconds REAL,
+                cpu_seconds REAL,
+                peak_rss_kb INTEGER,
+                profile TEXT,
+                benchmark_id INTEGER,
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (kata_trackable_id) REFERENCES trackables(id),
+                FOREIGN KEY (language_trackable_id) REFERENCES trackables(id),
+                FOREIGN KEY (benchmark_id) REFERENCES kata_benchmarks(id)
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS kata_benchmarks_kata_language
+            ON kata_benchmarks(kata_trackable_id, language_trackable_id)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS solution_attempts_kata_language
+            ON solution_attempts(kata_trackable_id, language_trackable_id, runtime_seconds)
+            """,
+        ],
+    ),
+    (
+        "yaml ingest ledger",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS ingest_files (
+                source TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                ingested_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS ingest_ledger (
+                source TEXT NOT NULL,
+                record_key TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                PRIMARY KEY (source, record_key)
+            ) WITHOUT ROWID
+            """,
+        ],
+    ),
+    (
+        "full-text search index",
+        [
+            # One FTS5 row per example (rowid = 2 * example id) and per concept
+            # or kata (rowid = 2 * trackable id + 1). `name` is the concept's
+            # name, `description` its description or the example's explanation.
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+                name, description, code, kind UNINDEXED, language UNINDEXED
+            )
+            """,
+            """
+            INSERT INTO search_index (rowid, name, description, code, kind, language)
+            SELECT e.id * 2, c.name, e.explanation, e.code_snippet, 'example', l.name
+            FROM examples e
+            JOIN trackables c ON c.id = e.concept_trackable_id
+            JOIN trackables l ON l.id = e.language_trackable_id
+            """,
+            """
+            INSERT INTO search_index (rowid, name, description, kind)
+            SELECT id * 2 + 1, name, description, type
+            FROM trackables WHERE type IN ('concept', 'kata')
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS search_examples_insert AFTER INSERT ON examples
+            BEGIN
+                INSERT INTO search_index (rowid, name, description, code, kind, language)
+                VALUES (
+                    new.id * 2,
+                    (SELECT name FROM trackables WHERE id = new.concept_trackable_id),
+                    new.explanation,
+                    new.code_snippet,
+                    'example',
+                    (SELECT name FROM trackables WHERE id = new.language_trackable_id)
+                );
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS search_examples_update AFTER UPDATE ON examples
+            WHEN old.id IS NOT new.id
+              OR old.concept_trackable_id IS NOT new.concept_trackable_id
+              OR old.language_trackable_id IS NOT new.language_trackable_id
+              OR old.code_snippet IS NOT new.code_snippet
+              OR old.explanation IS NOT new.explanation
+            BEGIN
+                DELETE FROM search_index WHERE rowid = old.id * 2;
+                INSERT INTO search_index (rowid, name, description, code, kind, language)
+                VALUES (
+                    new.id * 2,
+                    (SELECT name FROM trackables WHERE id = new.concept_trackable_id),
+                    new.explanation,
+                    new.code_snippet,
+                    'example',
+                    (SELECT name FROM trackables WHERE id = new.language_trackable_id)
+                );
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS search_examples_delete AFTER DELETE ON examples
+            BEGIN
+                DELETE FROM search_index WHERE rowid = old.id * 2;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS search_trackables_insert AFTER INSERT ON trackables
+            WHEN new.type IN ('concept', 'kata')
+            BEGIN
+                INSERT INTO search_index (rowid, name, description, kind)
+                VALUES (new.id * 2 + 1, new.name, new.description, new.type);
+            END
+            """,
+            # Upserts rewrite every column, so only react to real changes. A
+            # rename also has to reach the examples that show the name.
+            """
+            CREATE TRIGGER IF NOT EXISTS search_trackables_update AFTER UPDATE ON trackables
+            WHEN old.name IS NOT new.name
+              OR old.type IS NOT new.type
+              OR old.description IS NOT new.description
+            BEGIN
+                DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+                INSERT INTO search_index (rowid, name, description, kind)
+                SELECT new.id * 2 + 1, new.name, new.description, new.type
+                WHERE new.type IN ('concept', 'kata');
+                UPDATE search_index SET name = new.name
+                WHERE old.name IS NOT new.name
+                  AND rowid IN (SELECT id * 2 FROM examples WHERE concept_trackable_id = new.id);
+                UPDATE search_index SET language = new.name
+                WHERE old.name IS NOT new.name
+                  AND rowid IN (SELECT id * 2 FROM examples WHERE language_trackable_id = new.id);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS search_trackables_delete AFTER DELETE ON trackables
+            BEGIN
+                DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+            END
+            """,
+        ],
+    ),
+]
+
+LATEST_VERSION = len(MIGRATIONS)
+
+
+class MigrationError(Exception):
+    pass
+
+
+def _dedent_sql(sql: str) -> str:
+    # sqlite_master keeps the text as written, indented to fit this file.
+    first, _, rest = sql.partition("\n")
+    return f"{first}\n{textwrap.dedent(rest)}" if rest else first
+
+
+def schema_sql() -> str:
+    """
+    The SQL of a fully migrated database, as checked in at
+    src/shared/db/schema.sql. A database built from it starts at
+    LATEST_VERSION, so opening it applies nothing.
+    """
+    conn = sqlite3.connect(":memory:")
+    migrate(conn)
+    # FTS5 keeps its data in shadow tables that its CREATE VIRTUAL TABLE makes.
+    shadow = {row[1] for row in conn.execute("PRAGMA table_list") if row[2] == "shadow"}
+    statements = [
+        _dedent_sql(sql)
+        for name, sql in conn.execute("SELECT name, sql FROM sqlite_master WHERE sql IS NOT NULL ORDER BY rowid")
+        if name not in shadow and not name.startswith("sqlite_")
+    ]
+    conn.close()
+    header = "-- Generated from src/python/pylearn/migrations.py by schema_sql(); do not edit.\n"
+    return header + "".join(f"{sql};\n" for sql in statements) + f"PRAGMA user_version = {LATEST_VERSION};\n"
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, target: int = LATEST_VERSION) -> List[Tuple[int, str]]:
+    """
+    Apply pending migrations up to `target`, each in its own write
+    transaction. Returns the (version, description) pairs that were applied.
+
+    The version is re-read under the write lock, so two processes starting
+    at once apply each step only once.
+    """
+    if schema_version(conn) >= target:
+        return []
+
+    applied: List[Tuple[int, str]] = []
+    if conn.in_transaction:
+        conn.commit()
+    while True:
+        version, description = schema_version(conn), "?"
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = schema_version(conn)
+            if version >= target:
+                conn.rollback()
+                return applied
+            description, statements = MIGRATIONS[version]
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version + 1}")
+            conn.commit()
+        except sqlite3.Error as exc:
+            conn.rollback()
+            raise MigrationError(f"migration {version + 1} ({description}) failed: {exc}") from exc
+        applied.append((version + 1, description))
@@ -0,0 +1,8 @@
+ENTRY_POINT = "binary_search"
+EXPECTED = "O(log n)"
+SIZES = [2**k for k in range(8, 19, 2)]
+
+
+def make_args(n):
+    # Miss just past the end: the search has to walk the full depth.
+    return (n, list(range(n)))
@@ -0,0 +1,14 @@
+import random
+
+ENTRY_POINT = "is_word_present"
+EXPECTED = "O(n)"
+# n is the number of cells on a square board.
+SIZES = [k * k for k in (8, 12, 16, 24, 32, 48, 64, 96, 128)]
+
+
+def make_args(n):
+    side = int(n ** 0.5)
+    rng = random.Random(side)
+    board = [[rng.choice("abcde") for _ in range(side)] for _ in range(side)]
+    # Letters that exist on the board but never spell the word.
+    return (board, "abcdeabcz")
@@ -0,0 +1,8 @@
+ENTRY_POINT = "find_in_string"
+EXPECTED = "O(n)"
+SIZES = [2**k for k in range(8, 19)]
+
+
+def make_args(n):
+    # Near-miss prefix at every offset, match only at the very end.
+    return ("a" * n + "b", "aaaaaaab")
@@ -0,0 +1,13 @@
+import random
+
+ENTRY_POINT = "merge_sorted_array"
+EXPECTED = "O(n)"
+SIZES = [2**k for k in range(8, 19)]
+
+
+def make_args(n):
+    rng = random.Random(n)
+    m = n // 2
+    left = sorted(rng.randrange(n) for _ in range(m))
+    right = sorted(rng.randrange(n) for _ in range(n - m))
+    return (left + [0] * (n - m), m, right, n - m)
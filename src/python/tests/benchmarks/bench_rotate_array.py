@@ -0,0 +1,7 @@
+ENTRY_POINT = "rotate"
+EXPECTED = "O(n)"
+SIZES = [2**k for k in range(10, 21)]
+
+
+def make_args(n):
+    return (list(range(n)), n // 3)
@@ -0,0 +1,34 @@
+import os
+import tempfile
+from pathlib import Path
+
+# pylearn.config records the project root in a state file under the user's
+# home on first import; keep this run's (and its subprocesses') out of it.
+os.environ["POLYGLOT_STATE_FILE"] = str(Path(tempfile.mkdtemp(prefix="pylearn-state-")) / "layout.json")
+
+import pytest  # noqa: E402
+import pylearn.db  # noqa: E402
+from pylearn.db import get_connection  # noqa: E402
+
+
+@pytest.fixture
+def seed():
+    """
+    Rows for the `db` fixture to insert, as (statement, rows) pairs for
+    executemany. Override this in a module, or parametrize it, to seed data.
+    """
+    return []
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch, seed):
+    """
+    A fresh, migrated database that get_connection() hands out for the
+    duration of the test, seeded from `seed`.
+    """
+    monkeypatch.setattr(pylearn.db, "DB_PATH", tmp_path / "test.db")
+    with get_connection() as conn:
+        for statement, rows in seed:
+            conn.executemany(statement, rows)
+    yield conn
+    pylearn.db.close_connections()
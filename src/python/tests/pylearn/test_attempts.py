@@ -0,0 +1,74 @@
+import sqlite3
+
+import pytest
+from pylearn.actions.kata.attempts import best_attempt, is_regression, show_perf_status
+from pylearn.migrations import migrate
+
+
+def _db_with_attempts(*costs):
+    db = sqlite3.connect(":memory:")
+    migrate(db)
+    for runtime, cpu in costs:
+        db.execute(
+            """
+            INSERT INTO solution_attempts
+                (kata_trackable_id, language_trackable_id, code_snippet, runtime_seconds, cpu_seconds)
+            VALUES (1, 2, '', ?, ?)
+            """,
+            (runtime, cpu),
+        )
+    return db
+
+
+def test_best_attempt_only_compares_like_measurements():
+    db = _db_with_attempts((0.5, 0.01), (None, 0.001), (0.2, 0.3))
+    assert best_attempt(db, 1, 2, "runtime_seconds")[:2] == (3, 0.2)
+    assert best_attempt(db, 1, 2, "cpu_seconds")[:2] == (2, 0.001)
+
+
+def test_best_attempt_before_excludes_newer_attempts():
+    db = _db_with_attempts((0.5, None), (0.2, None), (0.9, None))
+    assert best_attempt(db, 1, 2, "runtime_seconds", before_id=2)[:2] == (1, 0.5)
+
+
+def test_is_regression_respects_margin():
+    assert not is_regression(1.19, 1.0, margin=0.2)
+    assert is_regression(1.21, 1.0, margin=0.2)
+
+
+@pytest.fixture
+def seed():
+    return [
+        (
+            "INSERT INTO trackables (id, name, type) VALUES (?, ?, ?)",
+            [(1, "python", "language"), (10, "two_sum", "kata"), (11, "fizz", "kata"), (12, "boggle", "kata")],
+        ),
+        (
+            "INSERT INTO solution_attempts "
+            "(kata_trackable_id, language_trackable_id, code_snippet, runtime_seconds, cpu_seconds, created_at) "
+            "VALUES (?, 1, '', ?, ?, ?)",
+            [
+                (10, 0.5, 0.01, "2026-01-01"),
+                (11, None, 0.004, "2026-01-02"),
+                (10, 0.2, 0.3, "2026-01-03"),
+                (12, None, None, "2026-01-04"),
+                (11, None, 0.0041, "2026-01-05"),
+                (10, 0.9, 0.001, "2026-01-06"),
+            ],
+        ),
+    ]
+
+
+def test_perf_status_reads_every_kata_in_one_query(db, capsys):
+    statements = []
+    db.set_trace_callback(statements.append)
+    show_perf_status(margin=0.2)
+    db.set_trace_callback(None)
+
+    assert len(statements) == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "[kata] boggle (python): 1 attempt, no measurements",
+        "[kata] fizz (python): 2 attempts, best #2 4.00 ms cpu (2026-01-02)",
+        "[kata] two_sum (python): 3 attempts, best #3 200.00 ms bench (2026-01-03)",
+        "   ⚠️ latest #6 900.00 ms bench is 350% slower",
+    ]
@@ -0,0 +1,43 @@
+import pytest
+from pylearn.actions.batch import run_commands
+from pylearn.db import grouped
+
+
+@pytest.fixture
+def seed():
+    return [("INSERT INTO trackables (name, type) VALUES (?, 'concept')", [(f"concept{i}",) for i in range(30)])]
+
+
+def _statuses(db):
+    return dict(
+        db.execute(
+            "SELECT t.name, p.status FROM trackable_progress p JOIN trackables t ON t.id = p.trackable_id"
+        ).fetchall()
+    )
+
+
+def test_failed_block_in_a_group_rolls_back_alone(db):
+    with grouped(db):
+        with db:
+            db.execute("INSERT INTO tags (name) VALUES ('kept')")
+        with pytest.raises(RuntimeError):
+            with db:
+                db.execute("INSERT INTO tags (name) VALUES ('dropped')")
+                raise RuntimeError
+        assert db.in_transaction
+    assert not db.in_transaction
+    assert db.execute("SELECT name FROM tags").fetchall() == [("kept",)]
+
+
+def test_batch_runs_every_line_across_groups(db, capsys):
+    lines = [f"progress --type concept --name concept{i} --status mastered" for i in range(30)]
+    lines[5:5] = ["", "# a comment", "pylearn status --type concept", "progress --bogus", "batch -"]
+    ran, failed = run_commands(lines, group_size=7)
+
+    assert (ran, failed) == (31, 2)
+    assert _statuses(db) == {f"concept{i}": "mastered" for i in range(30)}
+    out = capsys.readouterr().out
+    assert "❌ line 9: unrecognized arguments: --bogus" in out
+    assert "❌ line 10: 'batch' cannot run inside a shell or batch" in out
+    assert "[concept] concept0: mastered" in out
+    assert not db.in_transaction
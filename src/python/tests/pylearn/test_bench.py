@@ -0,0 +1,26 @@
+import math
+
+import pytest
+from pylearn.actions.kata.bench import fit_exponent
+
+
+@pytest.mark.parametrize(
+    "growth,expected",
+    [
+        (lambda n: 1e-6, 0.0),
+        (lambda n: 1e-8 * n, 1.0),
+        (lambda n: 1e-9 * n * n, 2.0),
+    ],
+)
+def test_fit_exponent_recovers_power_law(growth, expected):
+    points = [[n, growth(n)] for n in (2**k for k in range(6, 14))]
+    assert fit_exponent(points) == pytest.approx(expected, abs=1e-9)
+
+
+def test_fit_exponent_of_log_curve_is_small():
+    points = [[n, 1e-6 * math.log(n)] for n in (2**k for k in range(6, 20))]
+    assert fit_exponent(points) < 0.5
+
+
+def test_fit_exponent_needs_three_sizes():
+    assert fit_exponent([[10, 1.0], [100, 2.0]]) is None
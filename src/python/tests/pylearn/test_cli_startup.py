@@ -0,0 +1,34 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pylearn
+
+# `pylearn list` imports: the CLI module plus the one handler it dispatches to.
+LIST_IMPORTS = "import pylearn.cli, pylearn.actions.trackables"
+# Modules only some commands need; none of them may load for `list`.
+HEAVY = ["yaml", "zipfile", "lzma", "multiprocessing", "pylearn.actions.kata.test_runner", "pylearn.actions.kata.bench"]
+# Cumulative import time budget in microseconds, with headroom over the
+# ~35 ms this takes on a slow machine.
+BUDGET_US = 150_000
+
+
+def _importtime(code, state_file):
+    src = str(Path(pylearn.__file__).resolve().parents[1])
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": src, "PATH": "", "POLYGLOT_STATE_FILE": str(state_file)},
+    )
+    rows = re.findall(r"import time:\s+\d+ \|\s+(\d+) \| +(\S+)", result.stderr)
+    return {name: int(cumulative) for cumulative, name in rows}
+
+
+def test_list_startup_stays_lean(tmp_path):
+    imported = _importtime(LIST_IMPORTS, tmp_path / "layout.json")
+    assert not [name for name in HEAVY if name in imported]
+    top_level = imported["pylearn.cli"] + imported["pylearn.actions.trackables"]
+    assert top_level < BUDGET_US
@@ -0,0 +1,42 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pylearn
+
+SRC = Path(pylearn.__file__).resolve().parents[1]
+
+
+def _config(tmp_path, **env):
+    code = "import json, pylearn.config as c; print(json.dumps({k: str(getattr(c, k)) for k in ('PROJECT_ROOT', 'DB_PATH', 'KATA_TIMEOUT')}))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": str(SRC), "POLYGLOT_STATE_FILE": str(tmp_path / "layout.json"), **env},
+    )
+    return json.loads(result.stdout)
+
+
+def test_project_root_is_discovered_once_then_read_from_the_state_file(tmp_path):
+    first = _config(tmp_path)
+    assert (Path(first["PROJECT_ROOT"]) / "pyproject.toml").exists()
+    assert json.loads((tmp_path / "layout.json").read_text()) == {str(SRC): first["PROJECT_ROOT"]}
+
+    # A cached answer is trusted without probing the filesystem again.
+    (tmp_path / "layout.json").write_text(json.dumps({str(SRC): str(tmp_path)}))
+    assert _config(tmp_path)["PROJECT_ROOT"] == str(tmp_path)
+
+
+def test_environment_beats_config_file_beats_defaults(tmp_path):
+    config = tmp_path / "polyglot.toml"
+    config.write_text(f'project_root = "{tmp_path}"\ndb_path = "/data/from-file.db"\nkata_timeout = 3\n')
+
+    resolved = _config(tmp_path, POLYGLOT_CONFIG=str(config))
+    assert resolved == {"PROJECT_ROOT": str(tmp_path), "DB_PATH": "/data/from-file.db", "KATA_TIMEOUT": "3.0"}
+    assert not (tmp_path / "layout.json").exists()
+
+    resolved = _config(tmp_path, POLYGLOT_CONFIG=str(config), POLYGLOT_DB_PATH="/data/from-env.db")
+    assert resolved["DB_PATH"] == "/data/from-env.db"
@@ -0,0 +1,38 @@
+import sqlite3
+import threading
+
+import pytest
+from pylearn.db import close_connections, get_connection
+
+
+def test_one_configured_connection_per_path(db, tmp_path):
+    assert get_connection() is db
+    assert get_connection(tmp_path / "test.db") is db
+
+    other = get_connection(tmp_path / "other.db")
+    assert other is not db
+    assert get_connection(tmp_path / "other.db") is other
+
+    assert db.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    assert db.execute("PRAGMA synchronous").fetchone() == (1,)  # NORMAL
+    assert db.execute("PRAGMA busy_timeout").fetchone() == (5000,)
+    assert db.execute("PRAGMA temp_store").fetchone() == (2,)  # MEMORY
+
+
+def test_threads_get_their_own_connection(db):
+    seen = []
+
+    def in_thread():
+        conn = get_connection()
+        seen.append(conn)
+        conn.close()
+
+    thread = threading.Thread(target=in_thread)
+    thread.start()
+    thread.join()
+    assert seen[0] is not db
+
+    close_connections()
+    with pytest.raises(sqlite3.ProgrammingError):
+        db.execute("SELECT 1")
+    assert get_connection() is not db
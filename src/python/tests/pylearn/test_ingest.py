@@ -0,0 +1,224 @@
+import sqlite3
+
+import pytest
+import yaml
+from pylearn.actions.yaml.ingest_upsert_helpers import (
+    apply_relationships,
+    apply_trackable_tags,
+    apply_trackables,
+    create_staging_tables,
+    stage_relationships,
+    stage_trackables,
+)
+from pylearn.actions.yaml.tag_registry import TagRegistry
+from pylearn.migrations import migrate
+
+LANGUAGES = [{"name": "python", "version": "3.11", "documentation_url": "https://docs.python.org"}]
+CONCEPTS = [
+    {"name": "closures", "description": "functions with state", "tags": ["functions", "scope"], "status": "in progress"},
+    {"name": "binary_search", "type": "kata", "tags": ["search"]},
+]
+RELATIONSHIPS = [
+    {"source_name": "binary_search", "target_name": "closures", "relation": "uses"},
+    {"source_name": "missing", "target_name": "closures", "relation": "uses"},
+]
+
+
+def _ingest(db, languages, concepts, relationships):
+    cur = db.cursor()
+    create_staging_tables(cur)
+    stage_trackables(cur, languages, "language")
+    stage_trackables(cur, concepts, "concept")
+    stage_relationships(cur, relationships)
+    apply_trackables(cur)
+    added = apply_trackable_tags(cur, TagRegistry(cur))
+    skipped = apply_relationships(cur)
+    db.commit()
+    return added, skipped
+
+
+def test_bulk_ingest_resolves_names_and_reports_misses():
+    db = sqlite3.connect(":memory:")
+    migrate(db)
+    added, skipped = _ingest(db, LANGUAGES, CONCEPTS, RELATIONSHIPS)
+
+    assert added == ["functions", "scope", "search"]
+    assert skipped == [("missing", "closures", "uses")]
+    assert db.execute("SELECT name, type FROM trackables ORDER BY id").fetchall() == [
+        ("python", "language"),
+        ("closures", "concept"),
+        ("binary_search", "kata"),
+    ]
+    assert db.execute("SELECT version FROM language_info").fetchone() == ("3.11",)
+    assert db.execute("SELECT status FROM trackable_progress").fetchall() == [("in progress",)]
+    assert db.execute("SELECT COUNT(*) FROM trackable_tags").fetchone() == (3,)
+    assert db.execute("SELECT source_id, target_id FROM trackable_relationships").fetchall() == [(3, 2)]
+
+
+def test_bulk_ingest_is_idempotent_and_updates_in_place():
+    db = sqlite3.connect(":memory:")
+    migrate(db)
+    _ingest(db, LANGUAGES, CONCEPTS, RELATIONSHIPS)
+    changed = [dict(CONCEPTS[0], description="updated", status="mastered"), CONCEPTS[1]]
+    added, _ = _ingest(db, LANGUAGES, changed, RELATIONSHIPS)
+
+    assert added == []
+    assert db.execute("SELECT COUNT(*) FROM trackables").fetchone() == (3,)
+    assert db.execute("SELECT description FROM trackables WHERE name = 'closures'").fetchone() == ("updated",)
+    assert db.execute("SELECT status FROM trackable_progress").fetchall() == [("mastered",)]
+    assert db.execute("SELECT COUNT(*) FROM trackable_tags").fetchone() == (3,)
+
+
+@pytest.fixture
+def yaml_env(tmp_path, monkeypatch):
+    import pylearn.db
+    from pylearn.actions.yaml import yaml_helpers
+
+    monkeypatch.setattr(yaml_helpers, "YAML_DIR", tmp_path)
+    monkeypatch.setattr(pylearn.db, "DB_PATH", tmp_path / "test.db")
+    yield tmp_path
+    pylearn.db.close_connections()
+
+
+def _write(directory, **files):
+    for name, items in files.items():
+        (directory / f"{name}.yaml").write_text(yaml.safe_dump(items))
+
+
+def test_incremental_ingest_applies_only_the_diff(yaml_env, capsys):
+    from pylearn.actions.yaml.yaml_ingest import ingest_all
+    from pylearn.db import get_connection
+
+    _write(
+        yaml_env,
+        languages=LANGUAGES,
+        concepts=CONCEPTS + [{"name": "recursion"}],
+        katas=[],
+        trackable_relationships=RELATIONSHIPS[:1]
+        + [{"source_name": "binary_search", "target_name": "recursion", "relation": "uses"}],
+    )
+    ingest_all()
+    ingest_all()
+    assert "Nothing to ingest" in capsys.readouterr().out
+
+    # Removing recursion while a relationship still uses it is rejected.
+    _write(yaml_env, concepts=[dict(CONCEPTS[0], tags=["scope"]), CONCEPTS[1]])
+    ingest_all()
+    out = capsys.readouterr().out
+    assert "binary_search -uses-> recursion still uses 'recursion'" in out
+    assert get_connection().execute("SELECT COUNT(*) FROM trackables WHERE name = 'recursion'").fetchone() == (1,)
+
+    _write(yaml_env, trackable_relationships=RELATIONSHIPS[:1])
+    ingest_all()
+    out = capsys.readouterr().out
+    assert "concepts.yaml: 1 new or changed, 1 removed." in out
+    assert "languages.yaml" not in out
+
+    db = get_connection()
+    names = {row[0] for row in db.execute("SELECT name FROM trackables")}
+    assert names == {"python", "closures", "binary_search"}
+    tags = db.execute(
+        """
+        SELECT g.name FROM trackable_tags tt
+        JOIN tags g ON g.id = tt.tag_id
+        JOIN trackables t ON t.id = tt.trackable_id
+        WHERE t.name = 'closures'
+        """
+    ).fetchall()
+    assert tags == [("scope",)]
+    assert db.execute("SELECT COUNT(*) FROM trackable_relationships").fetchone() == (1,)
+
+    ingest_all(full=True)
+    assert "concepts.yaml: 2 new or changed, 0 removed." in capsys.readouterr().out
+
+
+def test_ingest_rejects_dangling_references_before_writing(yaml_env, capsys):
+    from pylearn.actions.yaml.yaml_ingest import ingest_all
+    from pylearn.db import get_connection
+
+    _write(
+        yaml_env,
+        languages=LANGUAGES,
+        concepts=CONCEPTS,
+        katas=[],
+        trackable_relationships=RELATIONSHIPS,
+    )
+    ingest_all()
+    out = capsys.readouterr().out
+    assert "trackable_relationships.yaml:4: Unknown trackable 'missing'" in out
+    assert get_connection().execute("SELECT COUNT(*) FROM trackables").fetchone() == (0,)
+
+    # A name that only exists in the database (not from these files) resolves.
+    with get_connection() as db:
+        db.execute("INSERT INTO trackables (name, type) VALUES ('missing', 'project')")
+    ingest_all()
+    assert "Ingest complete" in capsys.readouterr().out
+    assert get_connection().execute("SELECT COUNT(*) FROM trackable_relationships").fetchone() == (2,)
+
+
+def test_examples_ingest_is_idempotent_and_round_trips_the_export(yaml_env, monkeypatch, capsys):
+    import pylearn.db
+    from pylearn.actions.yaml import yaml_export
+    from pylearn.actions.yaml.yaml_ingest import ingest_all
+    from pylearn.db import get_connection
+
+    monkeypatch.setattr(yaml_export, "YAML_DIR", yaml_env)
+    examples = [
+        {"id": 7, "language": "python", "concept": "closures", "code_snippet": "def f(): pass\n", "tags": ["scope"]},
+        {"language": "python", "concept": "binary_search", "code_snippet": "bisect()", "explanation": "stdlib"},
+    ]
+    _write(yaml_env, languages=LANGUAGES, concepts=CONCEPTS, katas=[], examples=examples, trackable_relationships=[])
+    ingest_all()
+    ingest_all(full=True)
+    assert "examples.yaml: 2 new or changed, 0 removed." in capsys.readouterr().out
+    db = get_connection()
+    assert db.execute("SELECT COUNT(*) FROM examples").fetchone() == (2,)
+    assert db.execute("SELECT COUNT(*) FROM example_tags").fetchone() == (1,)
+
+    # The export gives the second example an id (and spells out null
+    # explanations); re-ingesting that swaps the id-less ledger entry for the
+    # id without duplicating the row.
+    yaml_export.export_all()
+    exported = (yaml_env / "examples.yaml").read_bytes()
+    ingest_all()
+    assert "examples.yaml: 2 new or changed, 1 removed." in capsys.readouterr().out
+    assert db.execute("SELECT COUNT(*) FROM examples").fetchone() == (2,)
+
+    pylearn.db.close_connections()
+    monkeypatch.setattr(pylearn.db, "DB_PATH", yaml_env / "fresh.db")
+    ingest_all()
+    yaml_export.export_all()
+    assert (yaml_env / "examples.yaml").read_bytes() == exported
+
+
+def test_tag_registry_creates_misses_in_bulk_and_answers_from_memory():
+    db = sqlite3.connect(":memory:")
+    migrate(db)
+    db.execute("INSERT INTO tags (name) VALUES ('scope')")
+    cur = db.cursor()
+    tags = TagRegistry(cur)
+
+    statements = []
+    db.set_trace_callback(statements.append)
+    assert tags.ensure(["search", "scope", "functions", "search"]) == ["functions", "search"]
+    assert tags.ensure(["scope", "search"]) == []
+    assert tags["search"] == db.execute("SELECT id FROM tags WHERE name = 'search'").fetchone()[0]
+    db.set_trace_callback(None)
+
+    assert len([s for s in statements if "INSERT" in s]) == 1
+    assert tags.created == ["functions", "search"]
+
+
+def test_id_less_examples_do_not_take_an_explicit_id(yaml_env, capsys):
+    from pylearn.actions.yaml.yaml_ingest import ingest_all
+    from pylearn.db import get_connection
+
+    examples = [
+        {"id": 1, "language": "python", "concept": "closures", "code_snippet": "def f(): pass\n"},
+        {"language": "python", "concept": "binary_search", "code_snippet": "bisect()"},
+    ]
+    _write(yaml_env, languages=LANGUAGES, concepts=CONCEPTS, katas=[], examples=examples, trackable_relationships=[])
+    ingest_all()
+    assert "examples.yaml: 2 new or changed, 0 removed." in capsys.readouterr().out
+    rows = get_connection().execute("SELECT id, code_snippet FROM examples ORDER BY id").fetchall()
+    assert rows == [(1, "def f(): pass\n"), (2, "bisect()")]
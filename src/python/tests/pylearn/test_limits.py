@@ -0,0 +1,103 @@
+import json
+import os
+import select
+import signal
+import socket
+import threading
+import time
+
+import pytest
+from pylearn.actions.kata.limits import ResourceLimits
+from pylearn.actions.kata.pytest_session import run_pytest_in_process
+from pylearn.actions.kata.results import KataResult
+from pylearn.actions.kata.test_runner import _run_pytest_subprocess
+from pylearn.actions.kata.test_worker import request_run
+
+WALL = 1.0
+# Slack for interpreter and pytest startup on a slow machine; still well
+# under the parent's kill grace, which is what used to end these runs.
+SLACK = 3.0
+# The first test swallows the timeout as an expected failure; the second
+# would then run forever if the wall limit only fired once.
+LOOPING_TESTS = """
+import pytest
+
+@pytest.mark.xfail(reason="swallows the first alarm")
+def test_slow_xfail():
+    while True:
+        pass
+
+def test_forever():
+    while True:
+        pass
+"""
+
+
+@pytest.fixture
+def looping_tests(tmp_path):
+    path = tmp_path / "test_looping.py"
+    path.write_text(LOOPING_TESTS)
+    return path
+
+
+def _in_fork(fn):
+    """
+    Run `fn` in a forked child (rlimits and timers cannot be undone) and
+    return the KataResult it produced.
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            with os.fdopen(write_fd, "w") as out:
+                json.dump(fn().to_dict(), out)
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    ready, _, _ = select.select([read_fd], [], [], WALL + 2 * SLACK)
+    if not ready:
+        os.kill(pid, signal.SIGKILL)
+    os.waitpid(pid, 0)
+    with os.fdopen(read_fd) as pipe:
+        payload = pipe.read()
+    if not payload:
+        pytest.fail("the run outlived its wall limit")
+    return KataResult.from_dict(json.loads(payload))
+
+
+def test_wall_limit_outlives_a_swallowed_timeout_in_process(looping_tests):
+    limits = ResourceLimits(wall_seconds=WALL, cpu_seconds=None, memory_mb=None)
+    result = _in_fork(lambda: run_pytest_in_process("limits_probe", "X = 1\n", looping_tests, limits))
+    assert result.reason == "timed out"
+    assert result.outcomes == {"xfailed": 1}
+    assert result.duration < WALL + SLACK
+
+
+def test_wall_limit_outlives_a_swallowed_timeout_in_a_subprocess(looping_tests):
+    limits = ResourceLimits(wall_seconds=WALL, cpu_seconds=30, memory_mb=None)
+    result = _run_pytest_subprocess("limits_probe", "X = 1\n", looping_tests, True, limits)
+    assert result.reason == "timed out"
+    assert result.duration < WALL + SLACK
+
+
+def test_worker_request_reports_the_time_it_waited(tmp_path):
+    socket_path = tmp_path / "worker.sock"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen(1)
+
+    def die_without_answering():
+        conn, _ = server.accept()
+        conn.recv(1 << 16)
+        time.sleep(0.3)
+        conn.close()
+
+    thread = threading.Thread(target=die_without_answering)
+    thread.start()
+    result = request_run("limits_probe", "X = 1\n", tmp_path / "test_x.py", socket_path=socket_path)
+    thread.join()
+    server.close()
+
+    assert result.reason == "killed"
+    assert result.duration >= 0.3
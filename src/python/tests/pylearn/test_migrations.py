@@ -0,0 +1,169 @@
+import sqlite3
+from pathlib import Path
+
+import pylearn
+import pytest
+from pylearn import migrations
+from pylearn.cli import main
+from pylearn.migrations import LATEST_VERSION, MigrationError, migrate, schema_sql, schema_version
+
+SCHEMA_FILE = Path(pylearn.__file__).resolve().parents[2] / "shared" / "db" / "schema.sql"
+# examples as the pre-migration schema.sql built it: ids into the old
+# languages/concepts tables, with the trackable columns added alongside.
+LEGACY_SCHEMA = """
+CREATE TABLE languages (id INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL, name VARCHAR NOT NULL, version VARCHAR,
+                        documentation_url VARCHAR, description VARCHAR);
+CREATE TABLE concepts (id INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL, name VARCHAR NOT NULL, description VARCHAR);
+CREATE TABLE examples (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    language_id INTEGER NOT NULL,
+    concept_id INTEGER NOT NULL,
+    code_snippet TEXT NOT NULL,
+    explanation TEXT, language_trackable_id INTEGER, concept_trackable_id INTEGER,
+    FOREIGN KEY (language_id) REFERENCES languages (id),
+    FOREIGN KEY (concept_id) REFERENCES concepts (id)
+);
+CREATE TABLE trackables (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL CHECK (type IN ('language', 'concept', 'kata', 'project')),
+    description TEXT
+);
+"""
+
+
+def _plan(db, query, params=()):
+    return " ".join(row[-1] for row in db.execute(f"EXPLAIN QUERY PLAN {query}", params))
+
+
+def _break_migration_2(monkeypatch, statements):
+    patched = list(migrations.MIGRATIONS)
+    patched[1] = ("broken", statements)
+    monkeypatch.setattr(migrations, "MIGRATIONS", patched)
+
+
+def test_migrate_builds_schema_from_scratch_and_is_idempotent():
+    db = sqlite3.connect(":memory:")
+    applied = migrate(db)
+    assert [version for version, _ in applied] == list(range(1, LATEST_VERSION + 1))
+    assert schema_version(db) == LATEST_VERSION
+    assert migrate(db) == []
+
+
+def test_migrate_adopts_unversioned_database():
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE trackables (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, type TEXT NOT NULL, description TEXT)")
+    db.execute("INSERT INTO trackables (name, type) VALUES ('python', 'language')")
+    db.commit()
+    migrate(db)
+    assert db.execute("SELECT name FROM trackables").fetchall() == [("python",)]
+
+
+def test_failed_migration_rolls_back_and_keeps_version(monkeypatch):
+    db = sqlite3.connect(":memory:")
+    migrate(db, target=1)
+    _break_migration_2(monkeypatch, ["CREATE TABLE half_done (x)", "SELECT * FROM no_such_table"])
+    with pytest.raises(MigrationError, match="migration 2"):
+        migrate(db)
+    assert schema_version(db) == 1
+    assert "half_done" not in {row[0] for row in db.execute("SELECT name FROM sqlite_master")}
+
+
+def test_duplicate_trackables_merge_before_the_unique_index():
+    db = sqlite3.connect(":memory:")
+    migrate(db, target=1)
+    db.executemany(
+        "INSERT INTO trackables (id, name, type) VALUES (?, ?, ?)",
+        [(1, "python", "language"), (2, "dup", "kata"), (3, "dup", "kata"), (4, "other", "concept")],
+    )
+    db.executemany("INSERT INTO trackable_progress (trackable_id, status) VALUES (?, ?)", [(2, "mastered"), (3, "abandoned")])
+    db.execute("INSERT INTO tags (id, name) VALUES (1, 'search')")
+    db.execute("INSERT INTO trackable_tags VALUES (3, 1)")
+    db.execute("INSERT INTO examples (language_trackable_id, concept_trackable_id, code_snippet) VALUES (1, 3, 'x')")
+    db.executemany(
+        "INSERT INTO trackable_relationships VALUES (?, ?, 'uses')", [(2, 4), (3, 4), (4, 3)]
+    )
+    db.commit()
+    migrate(db)
+
+    assert db.execute("SELECT id FROM trackables WHERE name = 'dup'").fetchall() == [(2,)]
+    assert db.execute("SELECT trackable_id, status FROM trackable_progress").fetchall() == [(2, "mastered")]
+    assert db.execute("SELECT trackable_id FROM trackable_tags").fetchall() == [(2,)]
+    assert db.execute("SELECT concept_trackable_id FROM examples").fetchall() == [(2,)]
+    assert sorted(db.execute("SELECT source_id, target_id FROM trackable_relationships")) == [(2, 4), (4, 2)]
+
+
+def test_database_built_from_the_old_schema_sql_is_adopted():
+    db = sqlite3.connect(":memory:")
+    db.executescript(LEGACY_SCHEMA)
+    db.execute("INSERT INTO languages (id, name) VALUES (1, 'python')")
+    db.execute("INSERT INTO concepts (id, name, description) VALUES (5, 'closures', 'state')")
+    db.execute("INSERT INTO trackables (id, name, type) VALUES (9, 'python', 'language')")
+    db.execute("INSERT INTO examples (language_id, concept_id, code_snippet) VALUES (1, 5, 'def f(): pass')")
+    db.commit()
+    migrate(db)
+
+    assert "language_id" not in {row[1] for row in db.execute("PRAGMA table_info(examples)")}
+    assert db.execute(
+        "SELECT l.name, c.name, c.description FROM examples e "
+        "JOIN trackables l ON l.id = e.language_trackable_id JOIN trackables c ON c.id = e.concept_trackable_id"
+    ).fetchall() == [("python", "closures", "state")]
+    db.execute("INSERT INTO examples (language_trackable_id, concept_trackable_id, code_snippet) VALUES (9, 9, 'y')")
+
+
+def test_schema_sql_is_generated_from_the_migrations():
+    assert SCHEMA_FILE.read_text() == schema_sql(), (
+        "regenerate with: python -c 'from pylearn.migrations import schema_sql; print(schema_sql(), end=\"\")'"
+        " > src/shared/db/schema.sql"
+    )
+    db = sqlite3.connect(":memory:")
+    db.executescript(SCHEMA_FILE.read_text())
+    assert migrate(db) == []
+
+
+def test_cli_reports_a_migration_it_cannot_apply(tmp_path, monkeypatch, capsys):
+    import pylearn.db
+
+    path = tmp_path / "broken.db"
+    db = sqlite3.connect(path)
+    migrate(db, target=1)
+    db.close()
+    monkeypatch.setattr(pylearn.db, "DB_PATH", path)
+    _break_migration_2(monkeypatch, ["SELECT * FROM no_such_table"])
+    with pytest.raises(SystemExit):
+        main(["list", "--type", "concept"])
+    assert "❌ Could not bring the database up to date: migration 2 (broken) failed" in capsys.readouterr().out
+    pylearn.db.close_connections()
+
+
+@pytest.mark.parametrize(
+    "query,index",
+    [
+        ("SELECT id FROM trackables WHERE name = ? AND type = ?", "trackables_name_type"),
+        ("SELECT id, name FROM trackables WHERE type = ? ORDER BY name", "trackables_type_name"),
+        (
+            "SELECT id FROM examples WHERE concept_trackable_id = ? AND language_trackable_id = ? AND explanation = ?",
+            "examples_concept_language",
+        ),
+        (
+            "SELECT target_id FROM trackable_relationships WHERE source_id = ? AND relation = ?",
+            "relationships_source_relation",
+        ),
+    ],
+)
+def test_hot_lookups_use_indexes(query, index):
+    db = sqlite3.connect(":memory:")
+    migrate(db)
+    plan = _plan(db, query, (1,) * query.count("?"))
+    assert "SCAN" not in plan
+    assert index in plan
+
+
+def test_migration_notices_stay_out_of_stdout(tmp_path, capsys):
+    import pylearn.db
+
+    pylearn.db.get_connection(tmp_path / "fresh.db")
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Migrated database to version 1" in captured.err
+    pylearn.db.close_connections()
@@ -0,0 +1,62 @@
+import sqlite3
+
+import pytest
+from pylearn.actions.name_resolver import TrigramIndex, resolve_name, trackable_index
+from pylearn.migrations import migrate
+
+NAMES = ["binary_search", "bubble_sort", "two_sum", "closures", "recursion", "linked_list"]
+
+
+@pytest.mark.parametrize(
+    "query,best",
+    [("bianry_search", "binary_search"), ("binary search", "binary_search"), ("closure", "closures"), ("recurson", "recursion")],
+)
+def test_candidates_rank_the_intended_name_first(query, best):
+    matches = TrigramIndex(NAMES).candidates(query)
+    assert matches[0][0] == best
+    assert all(0 < score <= 1 for _, score in matches)
+    assert [s for _, s in matches] == sorted((s for _, s in matches), reverse=True)
+
+
+def test_resolve_autocorrects_clear_winners_and_suggests_otherwise(capsys):
+    index = TrigramIndex(NAMES + ["binary_tree"])
+    assert resolve_name("closures", index, "concept") == "closures"
+    assert resolve_name("recurson", index, "concept") == "recursion"
+    assert "using 'recursion'" in capsys.readouterr().out
+
+    assert resolve_name("binary", index, "concept") is None
+    out = capsys.readouterr().out
+    assert "No concept named 'binary'" in out and "binary_search" in out and "binary_tree" in out
+
+    assert resolve_name("zzz", index, "concept") is None
+    assert "Did you mean" not in capsys.readouterr().out
+
+
+def test_trackable_index_follows_writes():
+    db = sqlite3.connect(":memory:")
+    migrate(db)
+    db.execute("INSERT INTO trackables (name, type) VALUES ('closures', 'concept')")
+    first = trackable_index(db, ["concept"])
+    assert trackable_index(db, ["concept"]) is first
+    db.execute("INSERT INTO trackables (name, type) VALUES ('recursion', 'concept')")
+    assert "recursion" in trackable_index(db, ["concept"])
+    assert "closures" not in trackable_index(db, ["kata"])
+
+
+def test_kata_with_a_test_file_is_not_corrected_to_its_instructions(db, tmp_path, monkeypatch, capsys):
+    from pylearn.actions.kata import common
+
+    for name in ("instructions", "tests", "modules"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "instructions" / "binarySearch.md").write_text("")
+    (tmp_path / "instructions" / "MergeSortedArray.md").write_text("")
+    (tmp_path / "tests" / "test_binary_search.py").write_text("")
+    (tmp_path / "modules" / "merge_sorted_array.py").write_text("")
+    monkeypatch.setattr(common, "KATAS_DIR", tmp_path / "instructions")
+    monkeypatch.setattr(common, "TESTS_DIR", tmp_path / "tests")
+    monkeypatch.setattr(common, "PYTHON_KATAS_DIR", tmp_path / "modules")
+
+    assert common.resolve_kata("binary_search") == "binary_search"
+    assert common.resolve_kata("merge_sorted_array") == "merge_sorted_array"
+    assert common.resolve_kata("binarySearch") == "binarySearch"
+    assert "using" not in capsys.readouterr().out
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from pylearn.actions.concepts import show_concept
+from pylearn.actions.output import Page
+from pylearn.actions.trackables import list_items, show_status
+
+
+@pytest.fixture
+def seed():
+    return [
+        (
+            "INSERT INTO trackables (id, name, type) VALUES (?, ?, ?)",
+            [(i, f"concept{i:02}", "concept") for i in range(1, 13)]
+            + [(20, "python", "language"), (21, "go", "language"), (22, "two_sum", "kata")],
+        ),
+        (
+            "INSERT INTO examples (language_trackable_id, concept_trackable_id, code_snippet, explanation) "
+            "VALUES (?, 1, ?, ?)",
+            [(20, "x = 1\ty", "tab\tand\nnewline"), (21, "x := 1", None), (20, "y = 2", "second")],
+        ),
+    ]
+
+
+def test_keyset_pages_cover_every_row_once(db, monkeypatch, capsys):
+    monkeypatch.setattr("pylearn.actions.output.FETCH_SIZE", 2)
+    seen, after = [], None
+    while True:
+        show_status(page=Page(limit=5, after=after), fmt="json")
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        if not rows:
+            break
+        seen += [(r["type"], r["name"]) for r in rows]
+        after = f"{rows[-1]['type']}:{rows[-1]['name']}"
+    assert seen == sorted(seen) and len(seen) == 15
+
+    list_items("concept", Page(limit=3, offset=0, after="concept05"))
+    assert capsys.readouterr().out.splitlines() == [
+        "6: concept06",
+        "7: concept07",
+        "8: concept08",
+        "ℹ️ More rows: repeat with --after concept08",
+    ]
+
+    # Offset paging is continued by offset, so the two modes do not mix.
+    list_items("concept", Page(limit=3, offset=3))
+    assert capsys.readouterr().out.splitlines()[-1] == "ℹ️ More rows: repeat with --offset 6"
+    list_items("concept", Page(limit=3, offset=6))
+    assert capsys.readouterr().out.splitlines()[0] == "7: concept07"
+    list_items("concept", Page(limit=2, offset=1, after="concept05"))
+    assert capsys.readouterr().out.splitlines() == [
+        "7: concept07",
+        "8: concept08",
+        "ℹ️ More rows: repeat with --after concept08 --offset 0",
+    ]
+
+
+def test_tsv_and_json_escape_and_show_pages(db, capsys):
+    show_concept("concept01", page=Page(limit=2), fmt="tsv")
+    assert capsys.readouterr().out.splitlines() == [
+        "language\tconcept\tcode\texplanation",
+        "go\tconcept01\tx := 1\t",
+        "python\tconcept01\tx = 1\\ty\ttab\\tand\\nnewline",
+    ]
+
+    show_concept("concept01", page=Page(offset=2))
+    out = capsys.readouterr().out
+    assert "=== [3] concept01 in python ===" in out and "second" in out
+
+    list_items("project", fmt="json")
+    assert capsys.readouterr().out == ""
+    list_items("project")
+    assert "No trackables of type 'project' found." in capsys.readouterr().out
@@ -0,0 +1,60 @@
+import pytest
+from pylearn.actions.trackables import read_progress_file, update_progress_many
+from pylearn.cli import main
+
+
+@pytest.fixture
+def seed():
+    return [
+        (
+            "INSERT INTO trackables (name, type) VALUES (?, ?)",
+            [("closures", "concept"), ("recursion", "concept"), ("two_sum", "kata"), ("python", "language")],
+        )
+    ]
+
+
+def _progress(db):
+    return {
+        (ttype, name): (status, notes)
+        for ttype, name, status, notes in db.execute(
+            "SELECT t.type, t.name, p.status, p.notes FROM trackable_progress p JOIN trackables t ON t.id = p.trackable_id"
+        )
+    }
+
+
+def test_csv_and_yaml_files_apply_in_one_go(db, tmp_path, capsys):
+    csv_file = tmp_path / "progress.csv"
+    csv_file.write_text(
+        "name,type,status,notes\n"
+        "closures,concept,mastered,done twice\n"
+        "two_sum,kata,in progress,\n"
+        "ghost,concept,mastered,\n"
+        "recursion,,finished,\n"
+        "closures,concept,in progress,\n"
+    )
+    update_progress_many(read_progress_file(str(csv_file)), status="not started")
+    assert _progress(db) == {
+        ("concept", "closures"): ("in progress", "done twice"),
+        ("kata", "two_sum"): ("in progress", None),
+    }
+    out = capsys.readouterr().out
+    assert "Updated progress for 3 trackables" in out
+    assert "concept 'ghost'" in out
+    assert "row 4: needs a name, a type and a status" in out
+
+    yaml_file = tmp_path / "progress.yaml"
+    yaml_file.write_text("- {name: recursion, status: mastered}\n- {name: python, type: language}\n")
+    update_progress_many(read_progress_file(str(yaml_file)), item_type="concept", status="abandoned")
+    assert _progress(db)[("concept", "recursion")] == ("mastered", None)
+    assert "row 2" not in capsys.readouterr().out
+    assert _progress(db)[("language", "python")] == ("abandoned", None)
+
+
+def test_repeated_names_on_the_command_line(db, capsys):
+    main(["progress", "--type", "concept", "--status", "mastered", "--name", "closures", "--name", "recursion"])
+    assert _progress(db) == {("concept", "closures"): ("mastered", None), ("concept", "recursion"): ("mastered", None)}
+
+    # One name still goes through the autocorrecting single update.
+    main(["progress", "--type", "concept", "--status", "in progress", "--name", "recurson"])
+    assert _progress(db)[("concept", "recursion")] == ("in progress", None)
+    assert "using 'recursion'" in capsys.readouterr().out
@@ -0,0 +1,75 @@
+import sqlite3
+
+import pytest
+from pylearn.actions.search import search
+from pylearn.migrations import migrate
+
+
+def _match(db, query):
+    return db.execute(
+        "SELECT rowid, name, language FROM search_index WHERE search_index MATCH ? ORDER BY rowid", (query,)
+    ).fetchall()
+
+
+def test_triggers_keep_the_index_in_sync():
+    db = sqlite3.connect(":memory:")
+    migrate(db)
+    db.executemany(
+        "INSERT INTO trackables (id, name, type, description) VALUES (?, ?, ?, ?)",
+        [(1, "python", "language", None), (2, "closures", "concept", "functions that capture scope")],
+    )
+    db.execute(
+        "INSERT INTO examples (id, language_trackable_id, concept_trackable_id, code_snippet, explanation) "
+        "VALUES (5, 1, 2, 'def outer(): return lambda: x', 'captures x')"
+    )
+    assert _match(db, "capture*") == [(2 * 2 + 1, "closures", None), (5 * 2, "closures", "python")]
+    assert _match(db, "lambda") == [(10, "closures", "python")]
+
+    db.execute("UPDATE trackables SET name = 'py3' WHERE id = 1")
+    db.execute("UPDATE trackables SET name = 'closure' WHERE id = 2")
+    assert _match(db, "closure") == [(5, "closure", None), (10, "closure", "py3")]
+
+    db.execute("UPDATE examples SET code_snippet = 'nonlocal x' WHERE id = 5")
+    assert _match(db, "lambda") == []
+    assert _match(db, "nonlocal") == [(10, "closure", "py3")]
+
+    db.execute("DELETE FROM examples")
+    db.execute("DELETE FROM trackables")
+    assert db.execute("SELECT COUNT(*) FROM search_index").fetchone() == (0,)
+
+
+@pytest.fixture
+def seed():
+    return [
+        (
+            "INSERT INTO trackables (id, name, type, description) VALUES (?, ?, ?, ?)",
+            [
+                (1, "python", "language", None),
+                (2, "rust", "language", None),
+                (3, "binary_search", "kata", "halve the range each step"),
+            ],
+        ),
+        (
+            "INSERT INTO examples (language_trackable_id, concept_trackable_id, code_snippet, explanation) "
+            "VALUES (?, 3, ?, ?)",
+            [(1, "bisect.bisect_left(xs, x)", "stdlib range search"), (2, "xs.binary_search(&x)", None)],
+        ),
+    ]
+
+
+def test_search_ranks_highlights_and_filters_by_language(db, capsys):
+    search("range")
+    out = capsys.readouterr().out
+    assert out.index("binary_search (kata)") < out.index("binary_search in python")
+    assert "halve the [range] each step" in out
+
+    search("binary_search", language="rust")
+    out = capsys.readouterr().out
+    assert "binary_search in rust" in out and "python" not in out
+
+
+def test_search_falls_back_to_plain_words_on_bad_syntax(db, capsys):
+    search('bisect_left(xs "')
+    assert "binary_search in python" in capsys.readouterr().out
+    search("nothing-like-this")
+    assert "No matches" in capsys.readouterr().out
@@ -0,0 +1,33 @@
+import pytest
+from pylearn.actions.database import restore_database, snapshot_database
+from pylearn.db import get_connection
+
+
+@pytest.fixture
+def seed():
+    return [("INSERT INTO trackables (name, type) VALUES (?, 'concept')", [("closures",)])]
+
+
+def _count(name):
+    return get_connection().execute("SELECT COUNT(*) FROM trackables WHERE name = ?", (name,)).fetchone()[0]
+
+
+def test_snapshot_round_trips_through_restore(db, tmp_path):
+    snapshot = snapshot_database(str(tmp_path / "snap.db.xz"))
+
+    with get_connection() as db:
+        db.execute("DELETE FROM trackables")
+        db.execute("INSERT INTO trackables (name, type) VALUES ('later', 'concept')")
+
+    restore_database(str(snapshot))
+    assert _count("closures") == 1
+    assert _count("later") == 0
+
+
+def test_restore_rejects_a_non_snapshot_without_touching_the_db(db, tmp_path, capsys):
+    bogus = tmp_path / "bogus.db.xz"
+    bogus.write_bytes(b"not a snapshot")
+
+    restore_database(str(bogus))
+    assert "not an xz snapshot" in capsys.readouterr().out
+    assert _count("closures") == 1
@@ -0,0 +1,29 @@
+import importlib
+import sys
+
+import pytest
+from pylearn.actions.kata.solution_loader import install_solution
+
+
+@pytest.fixture
+def cleanup_modules():
+    yield
+    sys.modules.pop("katas.loader_probe", None)
+
+
+def test_solution_is_served_from_memory(cleanup_modules):
+    install_solution("loader_probe", "def answer():\n    return 42\n")
+    module = importlib.import_module("katas.loader_probe")
+    assert module.answer() == 42
+
+
+def test_reinstall_replaces_previous_buffer(cleanup_modules):
+    install_solution("loader_probe", "VALUE = 1\n")
+    assert importlib.import_module("katas.loader_probe").VALUE == 1
+    install_solution("loader_probe", "VALUE = 2\n")
+    assert importlib.import_module("katas.loader_probe").VALUE == 2
+
+
+def test_syntax_error_is_raised_on_install():
+    with pytest.raises(SyntaxError):
+        install_solution("loader_probe", "def broken(:\n")
@@ -0,0 +1,111 @@
+import os
+import time
+
+import pytest
+from pylearn.actions.yaml import ingest_validation_helpers as validation
+from pylearn.actions.yaml import yaml_helpers
+
+CONCEPTS = """\
+- name: closures
+  status: in progress
+- description: no name here
+- name: recursion
+  status: sleeping
+"""
+RELATIONSHIPS = """\
+- source_name: recursion
+  target_name: closures
+  relation: befriends
+"""
+
+
+@pytest.fixture
+def yaml_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(yaml_helpers, "YAML_DIR", tmp_path)
+    (tmp_path / "languages.yaml").write_text("- name: python\n")
+    (tmp_path / "concepts.yaml").write_text(CONCEPTS)
+    (tmp_path / "trackable_relationships.yaml").write_text(RELATIONSHIPS)
+    return tmp_path
+
+
+def test_errors_carry_file_and_line(yaml_dir):
+    errors = validation.validate_all(workers=1)
+    assert [e.split(": ", 1)[0] for e in errors] == [
+        "concepts.yaml:3",
+        "concepts.yaml:4",
+        "trackable_relationships.yaml:1",
+    ]
+    assert "Invalid status 'sleeping'" in errors[1]
+
+
+def test_fail_fast_stops_at_the_first_error(yaml_dir):
+    assert validation.validate_all(fail_fast=True, workers=1) == [
+        "concepts.yaml:3: Missing 'name' in concept: {'description': 'no name here'}"
+    ]
+
+
+def test_parse_errors_are_reported_with_their_line(yaml_dir):
+    (yaml_dir / "languages.yaml").write_text("- name: python\n- name: [unclosed\n")
+    errors = validation.validate_all(["languages.yaml"], workers=1)
+    assert len(errors) == 1 and errors[0].startswith("languages.yaml:3: ")
+
+
+def test_pool_matches_inline_and_primes_the_cache(yaml_dir, monkeypatch):
+    inline = validation.validate_all(workers=1)
+    yaml_helpers._cache.clear()
+    monkeypatch.setattr(validation, "PARALLEL_MIN_BYTES", 0)
+    parent, real_parse, parsed_here = os.getpid(), yaml_helpers._parse, []
+    monkeypatch.setattr(
+        yaml_helpers, "_parse", lambda raw: (os.getpid() == parent and parsed_here.append(1)) or real_parse(raw)
+    )
+
+    assert validation.validate_all(workers=2) == inline
+    assert yaml_helpers.load_yaml("languages.yaml") == [{"name": "python"}]
+    assert parsed_here == []
+    assert len(validation.validate_all(workers=2, fail_fast=True)) == 1
+
+
+
+def test_fail_fast_cancels_files_that_have_not_started(yaml_dir, monkeypatch):
+    (yaml_dir / "languages.yaml").write_text("- description: no name\n")
+    (yaml_dir / "katas.yaml").write_text("- name: two_sum\n")
+    (yaml_dir / "examples.yaml").write_text("[]\n")
+    parsed, real_parse = yaml_dir / "parsed.log", yaml_helpers._parse
+
+    def slow_parse(raw):
+        # Runs in the workers; keeps the one worker busy after the first error.
+        with open(parsed, "a") as log:
+            log.write(raw.decode().splitlines()[0] + "\n")
+        if b"no name" not in raw:
+            time.sleep(0.5)
+        return real_parse(raw)
+
+    monkeypatch.setattr(yaml_helpers, "_parse", slow_parse)
+    files = [validation.VALIDATOR_MAP[name]["path"] for name in validation.ORDER]
+    reports = validation._validate_in_pool(files, fail_fast=True, workers=1)
+
+    assert reports["languages.yaml"].errors
+    assert "trackable_relationships.yaml" not in reports
+    assert "- source_name: recursion" not in parsed.read_text().splitlines()
+
+
+def test_examples_and_relationships_must_reference_known_trackables(yaml_dir):
+    (yaml_dir / "concepts.yaml").write_text("- name: closures\n- name: recursion\n")
+    (yaml_dir / "examples.yaml").write_text(
+        "- language: python\n  concept: closures\n  code_snippet: x\n"
+        "- language: rust\n  concept: closures\n  code_snippet: y\n"
+        "- language: python\n  concept: python\n  code_snippet: z\n"
+    )
+    (yaml_dir / "trackable_relationships.yaml").unlink()
+    errors = validation.validate_all(workers=1)
+    assert errors == [
+        "examples.yaml:4: Unknown language 'rust' in example",
+        "examples.yaml:7: Unknown concept or kata 'python' in example",
+    ]
+
+    index = validation.NameIndex([("language", "rust"), ("concept", "zig")])
+    assert validation.validate_all(["examples.yaml"], workers=1, index=index) == [
+        "examples.yaml:1: Unknown language 'python' in example",
+        "examples.yaml:4: Unknown concept or kata 'closures' in example",
+        "examples.yaml:7: Unknown language 'python' in example",
+    ]
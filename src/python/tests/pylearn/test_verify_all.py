@@ -0,0 +1,55 @@
+import pytest
+from pylearn.actions.kata import verify_all as verify_module
+from pylearn.actions.kata.results import KataResult
+from pylearn.actions.kata.verify_all import fetch_successful_solutions, verify_all
+
+
+@pytest.fixture
+def seed():
+    return [
+        (
+            "INSERT INTO trackables (id, name, type) VALUES (?, ?, ?)",
+            [(1, "python", "language"), (2, "go", "language"), (10, "two_sum", "kata"), (11, "fizz", "kata"),
+             (12, "orphan", "kata"), (13, "closures", "concept")],
+        ),
+        (
+            "INSERT INTO examples (language_trackable_id, concept_trackable_id, code_snippet, explanation) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (1, 10, "first", "success"),
+                (1, 10, "latest", "success"),
+                (1, 10, "broken", "failure"),
+                (2, 10, "go version", "success"),
+                (1, 11, "fizz", "success"),
+                (1, 12, "orphan", "success"),
+                (1, 13, "not a kata", "success"),
+            ],
+        ),
+    ]
+
+
+def test_latest_success_per_kata(db):
+    assert fetch_successful_solutions() == [("fizz", "fizz"), ("orphan", "orphan"), ("two_sum", "latest")]
+    assert fetch_successful_solutions("Go") == [("two_sum", "go version")]
+
+
+def test_every_kata_with_a_test_file_is_run_and_reported(db, tmp_path, monkeypatch, capsys):
+    for name in ("two_sum", "fizz"):
+        (tmp_path / f"test_{name}.py").write_text("")
+    ran = {}
+
+    def fake_run(kata_name, code, quiet, limits):
+        ran[kata_name] = code
+        passed = kata_name == "two_sum"
+        return KataResult(kata_name, passed=passed, outcomes={"passed" if passed else "failed": 1}, duration=0.5)
+
+    monkeypatch.setattr(verify_module, "TESTS_DIR", tmp_path)
+    monkeypatch.setattr(verify_module, "run_kata_tests", fake_run)
+
+    assert not verify_all(workers=4)
+    assert ran == {"two_sum": "latest", "fizz": "fizz"}
+    out = capsys.readouterr().out
+    assert "⚠️ Skipping 'orphan': no test file." in out
+    assert "Verifying 2 katas with 2 parallel runs" in out
+    assert "1/2 katas passed" in out
+    assert "serial total 1.00s" in out
@@ -0,0 +1,71 @@
+import threading
+from functools import partial
+
+import pytest
+from pylearn.actions.kata import test_runner
+from pylearn.actions.kata.limits import ResourceLimits
+from pylearn.actions.kata.test_worker import _RunHandler, _WorkerServer, request_run
+
+LIMITS = ResourceLimits(wall_seconds=30, cpu_seconds=None, memory_mb=None)
+# Imports a kata that only exists as the submitted buffer, so a pass proves
+# the solution was served from memory rather than read from disk.
+PROBE_TESTS = """
+from katas.worker_probe import add
+
+def test_adds():
+    assert add(2, 3) == 5
+
+def test_adds_negatives():
+    assert add(-2, -3) == -5
+"""
+
+
+@pytest.fixture
+def probe_tests(tmp_path):
+    path = tmp_path / "test_worker_probe.py"
+    path.write_text(PROBE_TESTS)
+    return path
+
+
+@pytest.fixture
+def worker(tmp_path):
+    socket_path = tmp_path / "worker.sock"
+    server = _WorkerServer(str(socket_path), _RunHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def test_worker_runs_the_submitted_solution(worker, probe_tests):
+    run = partial(request_run, "worker_probe", test_file=probe_tests, limits=LIMITS, socket_path=worker)
+
+    result = run("def add(a, b):\n    return a + b\n")
+    assert result.passed
+    assert result.outcomes == {"passed": 2}
+    assert result.reason is None
+
+    # Each request forks afresh, so the previous buffer does not linger.
+    result = run("def add(a, b):\n    return abs(a + b)\n")
+    assert not result.passed
+    assert result.outcomes == {"passed": 1, "failed": 1}
+    assert len(result.failures) == 1 and "test_adds_negatives" in result.failures[0]
+
+    result = run("def add(a, b:\n")
+    assert not result.passed
+    assert result.outcomes == {"error": 1}
+    assert result.failures[0].startswith("solution: SyntaxError")
+
+
+def test_without_a_worker_the_run_falls_back_to_pytest(tmp_path, probe_tests, monkeypatch):
+    socket_path = tmp_path / "missing.sock"
+    assert request_run("worker_probe", "", probe_tests, socket_path=socket_path) is None
+
+    monkeypatch.setattr(test_runner, "TESTS_DIR", tmp_path)
+    monkeypatch.setattr(test_runner, "request_run", partial(request_run, socket_path=socket_path))
+    result = test_runner.run_kata_tests("worker_probe", "def add(a, b):\n    return a + b\n", quiet=True, limits=LIMITS)
+    assert result.passed
+    assert result.outcomes == {"passed": 2}
+    assert "2 passed" in result.output
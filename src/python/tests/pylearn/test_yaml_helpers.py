@@ -0,0 +1,42 @@
+import pytest
+from pylearn.actions.yaml import yaml_helpers
+
+
+@pytest.fixture
+def yaml_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(yaml_helpers, "YAML_DIR", tmp_path)
+    monkeypatch.setattr(yaml_helpers, "STREAM_BATCH_SIZE", 3)
+    return tmp_path
+
+
+@pytest.mark.parametrize("count", [0, 1, 3, 7])
+def test_write_yaml_stream_matches_write_yaml(yaml_dir, count):
+    items = [
+        {"id": i, "code_snippet": f"def f():\n    return {i}\n", "tags": ["a", "ü"] if i % 2 else None}
+        for i in range(count)
+    ]
+    yaml_helpers.write_yaml("whole.yaml", items)
+    written = yaml_helpers.write_yaml_stream("streamed.yaml", iter(items))
+
+    assert written == count
+    assert (yaml_dir / "streamed.yaml").read_bytes() == (yaml_dir / "whole.yaml").read_bytes()
+    assert yaml_helpers.load_yaml("streamed.yaml") == items
+    assert not (yaml_dir / "streamed.yaml.tmp").exists()
+
+
+def test_load_yaml_parses_each_file_once_until_it_changes(yaml_dir, monkeypatch):
+    calls = []
+    real_parse = yaml_helpers._parse
+    monkeypatch.setattr(yaml_helpers, "_parse", lambda raw: calls.append(1) or real_parse(raw))
+
+    (yaml_dir / "concepts.yaml").write_text("- name: closures\n")
+    digest = yaml_helpers.yaml_digest("concepts.yaml")
+    first = yaml_helpers.load_yaml("concepts.yaml")
+    assert yaml_helpers.load_yaml("concepts.yaml") is first
+    assert len(calls) == 1
+
+    yaml_helpers.write_yaml("concepts.yaml", [{"name": "recursion"}])
+    assert yaml_helpers.load_yaml("concepts.yaml") == [{"name": "recursion"}]
+    assert yaml_helpers.yaml_digest("concepts.yaml") != digest
+    assert len(calls) == 2
+    assert yaml_helpers.yaml_digest("missing.yaml") is None
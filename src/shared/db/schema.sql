@@ -1,30 +1,10 @@
-CREATE TABLE sqlite_sequence(name,seq);
-CREATE TABLE IF NOT EXISTS examples (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        language_id INTEGER NOT NULL,
-        concept_id INTEGER NOT NULL,
-        code_snippet TEXT NOT NULL,
-        explanation TEXT, language_trackable_id INTEGER, concept_trackable_id INTEGER,
-        FOREIGN KEY (language_id) REFERENCES languages (id),
-        FOREIGN KEY (concept_id) REFERENCES concepts (id)
-    );
-CREATE TABLE IF NOT EXISTS "languages" ("id" integer PRIMARY KEY AUTOINCREMENT NOT NULL, "name" varchar NOT NULL, "version" varchar, "documentation_url" varchar, "description" varchar);
-CREATE TABLE IF NOT EXISTS "concepts" ("id" integer PRIMARY KEY AUTOINCREMENT NOT NULL, "name" varchar NOT NULL, "description" varchar);
-
+-- Generated from src/python/pylearn/migrations.py by schema_sql(); do not edit.
 CREATE TABLE trackables (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     name TEXT NOT NULL,
     type TEXT NOT NULL CHECK (type IN ('language', 'concept', 'kata', 'project')),
     description TEXT
 );
-CREATE TABLE trackable_relationships (
-    source_id INTEGER NOT NULL,
-    target_id INTEGER NOT NULL,
-    relation TEXT NOT NULL CHECK (relation IN ('uses', 'includes', 'depends_on', 'implements')),
-    PRIMARY KEY (source_id, target_id, relation),
-    FOREIGN KEY (source_id) REFERENCES trackables(id),
-    FOREIGN KEY (target_id) REFERENCES trackables(id)
-);
 CREATE TABLE language_info (
     trackable_id INTEGER PRIMARY KEY,
     version TEXT,
@@ -43,16 +23,156 @@ CREATE TABLE trackable_tags (
     FOREIGN KEY (trackable_id) REFERENCES trackables(id),
     FOREIGN KEY (tag_id) REFERENCES tags(id)
 );
+CREATE TABLE examples (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    language_trackable_id INTEGER NOT NULL,
+    concept_trackable_id INTEGER NOT NULL,
+    code_snippet TEXT NOT NULL,
+    explanation TEXT,
+    FOREIGN KEY (language_trackable_id) REFERENCES trackables(id),
+    FOREIGN KEY (concept_trackable_id) REFERENCES trackables(id)
+);
+CREATE TABLE example_tags (
+    example_id INTEGER NOT NULL,
+    tag_id INTEGER NOT NULL,
+    PRIMARY KEY (example_id, tag_id),
+    FOREIGN KEY (example_id) REFERENCES examples(id),
+    FOREIGN KEY (tag_id) REFERENCES tags(id)
+);
 CREATE TABLE trackable_progress (
     trackable_id INTEGER PRIMARY KEY,
-    status TEXT CHECK (status IN ('not started', 'in progress', 'mastered', 'abandoned')) DEFAULT 'not started',
+    status TEXT CHECK (status IN ('not started', 'in progress', 'mastered', 'abandoned'))
+        DEFAULT 'not started',
     notes TEXT,
     FOREIGN KEY (trackable_id) REFERENCES trackables(id)
 );
-CREATE TABLE IF NOT EXISTS example_tags(
-    example_Id INTEGER NOT NULL,
-    tag_id INTEGER NOT NULL,
-    Primary KEY (example_Id, tag_id),
-    FOREIGN KEY (example_Id) REFERENCES examples(id),
-    FOREIGN KEY (tag_id) REFERENCES tags(id)
+CREATE TABLE trackable_relationships (
+    source_id INTEGER NOT NULL,
+    target_id INTEGER NOT NULL,
+    relation TEXT NOT NULL CHECK (relation IN ('uses', 'includes', 'depends_on', 'implements')),
+    PRIMARY KEY (source_id, target_id, relation),
+    FOREIGN KEY (source_id) REFERENCES trackables(id),
+    FOREIGN KEY (target_id) REFERENCES trackables(id)
 );
+CREATE UNIQUE INDEX trackables_name_type ON trackables(name, type);
+CREATE INDEX trackables_type_name ON trackables(type, name);
+CREATE INDEX examples_concept_language
+ON examples(concept_trackable_id, language_trackable_id, explanation)
+;
+CREATE INDEX trackable_tags_tag ON trackable_tags(tag_id, trackable_id);
+CREATE INDEX example_tags_tag ON example_tags(tag_id, example_id);
+CREATE INDEX relationships_source_relation
+ON trackable_relationships(source_id, relation, target_id)
+;
+CREATE INDEX relationships_target ON trackable_relationships(target_id);
+CREATE TABLE kata_benchmarks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kata_trackable_id INTEGER NOT NULL,
+    language_trackable_id INTEGER NOT NULL,
+    code_hash TEXT NOT NULL,
+    expected TEXT,
+    exponent REAL,
+    flagged INTEGER NOT NULL DEFAULT 0,
+    profile TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (kata_trackable_id) REFERENCES trackables(id),
+    FOREIGN KEY (language_trackable_id) REFERENCES trackables(id)
+);
+CREATE TABLE solution_attempts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kata_trackable_id INTEGER NOT NULL,
+    language_trackable_id INTEGER NOT NULL,
+    code_snippet TEXT NOT NULL,
+    runtime_seconds REAL,
+    test_seconds REAL,
+    cpu_seconds REAL,
+    peak_rss_kb INTEGER,
+    profile TEXT,
+    benchmark_id INTEGER,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (kata_trackable_id) REFERENCES trackables(id),
+    FOREIGN KEY (language_trackable_id) REFERENCES trackables(id),
+    FOREIGN KEY (benchmark_id) REFERENCES kata_benchmarks(id)
+);
+CREATE INDEX kata_benchmarks_kata_language
+ON kata_benchmarks(kata_trackable_id, language_trackable_id)
+;
+CREATE INDEX solution_attempts_kata_language
+ON solution_attempts(kata_trackable_id, language_trackable_id, runtime_seconds)
+;
+CREATE TABLE ingest_files (
+    source TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    ingested_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE ingest_ledger (
+    source TEXT NOT NULL,
+    record_key TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (source, record_key)
+) WITHOUT ROWID
+;
+CREATE VIRTUAL TABLE search_index USING fts5(
+    name, description, code, kind UNINDEXED, language UNINDEXED
+);
+CREATE TRIGGER search_examples_insert AFTER INSERT ON examples
+BEGIN
+    INSERT INTO search_index (rowid, name, description, code, kind, language)
+    VALUES (
+        new.id * 2,
+        (SELECT name FROM trackables WHERE id = new.concept_trackable_id),
+        new.explanation,
+        new.code_snippet,
+        'example',
+        (SELECT name FROM trackables WHERE id = new.language_trackable_id)
+    );
+END;
+CREATE TRIGGER search_examples_update AFTER UPDATE ON examples
+WHEN old.id IS NOT new.id
+  OR old.concept_trackable_id IS NOT new.concept_trackable_id
+  OR old.language_trackable_id IS NOT new.language_trackable_id
+  OR old.code_snippet IS NOT new.code_snippet
+  OR old.explanation IS NOT new.explanation
+BEGIN
+    DELETE FROM search_index WHERE rowid = old.id * 2;
+    INSERT INTO search_index (rowid, name, description, code, kind, language)
+    VALUES (
+        new.id * 2,
+        (SELECT name FROM trackables WHERE id = new.concept_trackable_id),
+        new.explanation,
+        new.code_snippet,
+        'example',
+        (SELECT name FROM trackables WHERE id = new.language_trackable_id)
+    );
+END;
+CREATE TRIGGER search_examples_delete AFTER DELETE ON examples
+BEGIN
+    DELETE FROM search_index WHERE rowid = old.id * 2;
+END;
+CREATE TRIGGER search_trackables_insert AFTER INSERT ON trackables
+WHEN new.type IN ('concept', 'kata')
+BEGIN
+    INSERT INTO search_index (rowid, name, description, kind)
+    VALUES (new.id * 2 + 1, new.name, new.description, new.type);
+END;
+CREATE TRIGGER search_trackables_update AFTER UPDATE ON trackables
+WHEN old.name IS NOT new.name
+  OR old.type IS NOT new.type
+  OR old.description IS NOT new.description
+BEGIN
+    DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+    INSERT INTO search_index (rowid, name, description, kind)
+    SELECT new.id * 2 + 1, new.name, new.description, new.type
+    WHERE new.type IN ('concept', 'kata');
+    UPDATE search_index SET name = new.name
+    WHERE old.name IS NOT new.name
+      AND rowid IN (SELECT id * 2 FROM examples WHERE concept_trackable_id = new.id);
+    UPDATE search_index SET language = new.name
+    WHERE old.name IS NOT new.name
+      AND rowid IN (SELECT id * 2 FROM examples WHERE language_trackable_id = new.id);
+END;
+CREATE TRIGGER search_trackables_delete AFTER DELETE ON trackables
+BEGIN
+    DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+END;
+PRAGMA user_version = 5;